@@ -1,16 +1,55 @@
+import logging
+
 from django.contrib import admin
-from django.urls import reverse
+from django.core.exceptions import PermissionDenied
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
 from django.utils import timezone
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 
-from .models import Application
+from .claims import DEFAULT_CLAIM_COUNT, active_claims, claim_applications, release_claims
+from .exports import export_response
+from .forms import ApplicationAdminForm
+from .models import Application, ApplicationTransition, BackgroundTask
+from .pagination import EstimatedCountPaginator, KeysetChangeList
+from .reviews import bulk_review
+from .stats import review_dashboard
+from .transitions import transition
+
+logger = logging.getLogger(__name__)
+
+
+class ApplicationTransitionInline(admin.TabularInline):
+    """申請的狀態轉換歷程（唯讀）"""
+
+    model = ApplicationTransition
+    fields = ['created_at', 'from_status', 'to_status', 'actor', 'previous_status_duration', 'note']
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('actor')
 
 
 @admin.register(Application)
 class ApplicationAdmin(admin.ModelAdmin):
     """證券帳號申請的Admin管理介面"""
 
+    form = ApplicationAdminForm
+    inlines = [ApplicationTransitionInline]
+
     # 列表頁面顯示的欄位
     list_display = ['id', 'user', 'account_name', 'phone_number', 'colored_status', 'created_at', 'reviewed_at', 'reviewed_by']
 
@@ -46,6 +85,10 @@ class ApplicationAdmin(admin.ModelAdmin):
     # 列表頁面每頁顯示數量
     list_per_page = 25
 
+    # 以估計筆數分頁，並省略未篩選時的第二次 COUNT(*)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
     # 預設排序
     ordering = ['-created_at']
 
@@ -69,46 +112,135 @@ class ApplicationAdmin(admin.ModelAdmin):
     def save_model(self, request, obj, form, change):
         """覆寫save_model，自動設定審核人員"""
         if change:  # 如果是編輯現有物件
-            original = Application.objects.get(pk=obj.pk)
-            # 如果狀態有變更且不是PENDING，設定審核人員
-            if (original.status != obj.status and obj.status != 'PENDING' and not obj.reviewed_by):
-                obj.reviewed_by = request.user
+            # 狀態有變更時經由轉換引擎設定審核人員並記錄操作人員（以載入時記錄的值比對，不需再查詢原始資料）
+            if obj.has_field_changed('status'):
+                transition(obj, obj.status, actor=request.user, save=False)
 
         super().save_model(request, obj, form, change)
 
+    def get_urls(self):
+        """加入審核佇列儀表板頁面"""
+        urls = [
+            path('dashboard/', self.admin_site.admin_view(self.review_dashboard_view), name='applications_application_dashboard'),
+            path('claims/', self.admin_site.admin_view(self.claims_view), name='applications_application_claims'),
+        ]
+        return urls + super().get_urls()
+
+    def review_dashboard_view(self, request):
+        """審核佇列儀表板：讀取增量維護的統計表，不對申請資料表做 GROUP BY"""
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        context = {
+            **self.admin_site.each_context(request),
+            'title': '審核佇列統計',
+            'opts': self.model._meta,
+            **review_dashboard(),
+        }
+        return TemplateResponse(request, 'admin/applications/application/review_dashboard.html', context)
+
+    def claims_view(self, request):
+        """審核人員的工作佇列：認領等待最久的申請、檢視與釋放自己的認領"""
+        if not self.has_change_permission(request):
+            raise PermissionDenied
+        if request.method == 'POST':
+            if 'release' in request.POST:
+                released = release_claims(request.user)
+                self.message_user(request, f'已釋放 {released} 個認領的申請。')
+            else:
+                try:
+                    count = max(1, min(int(request.POST.get('count', DEFAULT_CLAIM_COUNT)), 100))
+                except ValueError:
+                    count = DEFAULT_CLAIM_COUNT
+                claimed = claim_applications(request.user, count)
+                self.message_user(request, f'已認領 {len(claimed)} 個申請。' if claimed else '目前沒有可認領的申請。')
+            return redirect('admin:applications_application_claims')
+
+        context = {
+            **self.admin_site.each_context(request),
+            'title': '我的審核佇列',
+            'opts': self.model._meta,
+            'claims': active_claims(request.user),
+            'default_count': DEFAULT_CLAIM_COUNT,
+        }
+        return TemplateResponse(request, 'admin/applications/application/claims.html', context)
+
+    def get_form(self, request, obj=None, **kwargs):
+        """讓表單知道目前的審核人員，以檢查認領狀態"""
+        form = super().get_form(request, obj, **kwargs)
+        form.reviewer = request.user
+        return form
+
+    def get_changelist(self, request, **kwargs):
+        """使用以 (created_at, id) 游標分頁的列表，深層頁面與第一頁的查詢成本相同"""
+        return KeysetChangeList
+
     def get_queryset(self, request):
         """優化查詢，減少資料庫查詢次數"""
         return super().get_queryset(request).select_related('user', 'reviewed_by')
 
     # 自定義Admin動作
-    actions = ['approve_applications', 'reject_applications']
+    actions = ['approve_applications', 'reject_applications', 'export_applications_csv', 'export_applications_xlsx']
 
     def approve_applications(self, request, queryset):
         """批量通過申請"""
-        count = 0
-        for application in queryset.filter(status='PENDING'):
-            application.status = 'APPROVED'
-            application.reviewed_by = request.user
-            application.save()
-            count += 1
-
-        self.message_user(request, f'成功通過 {count} 個申請。')
+        result = bulk_review(queryset, 'APPROVED', request.user, progress=self._log_review_progress)
+        self._report_bulk_review(request, f'成功通過 {result.updated} 個申請。', result)
 
     approve_applications.short_description = '批量通過選中的申請'
 
     def reject_applications(self, request, queryset):
         """批量拒絕申請"""
-        count = 0
-        for application in queryset.filter(status='PENDING'):
-            application.status = 'REJECTED'
-            application.reviewed_by = request.user
-            application.rejection_reason = '批量拒絕操作'
-            application.save()
-            count += 1
-
-        self.message_user(request, f'成功拒絕 {count} 個申請。')
+        result = bulk_review(queryset, 'REJECTED', request.user, rejection_reason='批量拒絕操作', progress=self._log_review_progress)
+        self._report_bulk_review(request, f'成功拒絕 {result.updated} 個申請。', result)
 
     reject_applications.short_description = '批量拒絕選中的申請'
 
+    def export_applications_csv(self, request, queryset):
+        """串流匯出選中的申請為 CSV"""
+        return export_response(queryset, 'csv')
+
+    export_applications_csv.short_description = '匯出選中的申請 (CSV)'
+
+    def export_applications_xlsx(self, request, queryset):
+        """串流匯出選中的申請為 XLSX"""
+        return export_response(queryset, 'xlsx')
+
+    export_applications_xlsx.short_description = '匯出選中的申請 (Excel)'
+
+    def _log_review_progress(self, result):
+        """記錄批量審核每個批次的進度"""
+        logger.info('批量審核第 %d 批完成：已更新 %d 筆，略過 %d 筆', result.chunks, result.updated, result.skipped)
+
+    def _report_bulk_review(self, request, message, result):
+        """回報批量審核結果，包含因併發變更而略過的筆數"""
+        if result.skipped:
+            message += f'另有 {result.skipped} 個申請已被其他人員變更或認領，已略過。'
+        self.message_user(request, message)
+
     class Media:
         css = {'all': ('admin/css/custom_admin.css', )}
+
+
+@admin.register(BackgroundTask)
+class BackgroundTaskAdmin(admin.ModelAdmin):
+    """背景工作的Admin管理介面（唯讀，只能重新排入失敗的工作）"""
+
+    list_display = ['id', 'name', 'status', 'attempts', 'max_attempts', 'run_after', 'created_at', 'finished_at']
+    list_filter = ['status', 'name']
+    search_fields = ['idempotency_key']
+    readonly_fields = [field.name for field in BackgroundTask._meta.fields]
+    list_per_page = 50
+    actions = ['requeue_tasks']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def requeue_tasks(self, request, queryset):
+        """將失敗的工作重新排入佇列並重新計算執行次數"""
+        requeued = queryset.filter(status='FAILED').update(status='QUEUED', attempts=0, run_after=timezone.now(), finished_at=None)
+        self.message_user(request, f'已重新排入 {requeued} 個工作。')
+
+    requeue_tasks.short_description = '重新排入選中的失敗工作'
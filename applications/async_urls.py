@@ -0,0 +1,26 @@
+from django.urls import path
+
+from applications import async_views, views
+
+# ASGI 部署使用的路由：申請人頁面改用非同步視圖，其餘沿用同步視圖
+urlpatterns = [
+    # 首頁
+    path('', async_views.home, name='home'),
+
+    # 身份驗證
+    path('accounts/register/', views.user_register, name='user_register'),
+    path('accounts/login/', views.user_login, name='user_login'),
+    path('accounts/logout/', views.user_logout, name='user_logout'),
+
+    # 申請流程
+    path('application/create/', async_views.application_create, name='application_create'),
+    path('application/status/', async_views.application_status, name='application_status'),
+    path('application/update/<int:application_id>/', async_views.application_update, name='application_update'),
+    path('application/success/<int:application_id>/', async_views.application_success, name='application_success'),
+
+    # 行動 App 使用的狀態 API
+    path('api/application/status/', async_views.application_status_api, name='application_status_api'),
+
+    # Prometheus 指標
+    path('metrics/', views.metrics, name='metrics'),
+]
@@ -0,0 +1,174 @@
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.http import Http404, JsonResponse
+from django.shortcuts import aget_object_or_404, redirect, render
+from django.views.decorators.cache import cache_page
+from django.views.decorators.vary import vary_on_cookie
+
+from .cache import aget_user_application
+from .conditional import application_version, render_conditionally
+from .forms import ApplicationAlreadyExists, ApplicationForm, ApplicationUpdateForm
+from .metrics import exclude_from_duration
+from .models import Application
+from .polling import ApplicationWatch, application_status_payload
+from .transitions import transition
+
+
+async def _resolve_user(request):
+    """以非同步方式載入登入使用者，並取代 request.user 的延遲物件
+
+    模板中的 user 變數來自 request.user，若不先解析會在事件迴圈中觸發同步查詢。
+    """
+    user = await request.auser()
+    request.user = user
+    return user
+
+
+# 與 views.home 相同的整頁快取
+@cache_page(settings.APPLICATION_HOME_CACHE_TIMEOUT)
+@vary_on_cookie
+async def home(request):
+    """首頁 - 根據登入狀態導向不同頁面"""
+
+    user = await _resolve_user(request)
+    if user.is_authenticated:
+        # 已登入用戶導向申請狀態頁面
+        return redirect('application_status')
+    else:
+        # 未登入用戶顯示登入/註冊選項
+        return render(request, 'applications/home.html')
+
+
+@login_required
+async def application_create(request):
+    """創建證券帳戶申請"""
+
+    user = await _resolve_user(request)
+
+    # 檢查用戶是否已有申請（送出時改由資料庫唯一限制檢查，省去一次查詢）
+    if request.method != 'POST' and await aget_user_application(user.pk) is not None:
+        messages.info(request, '您已有一個申請記錄，請查看申請狀態。')
+        return redirect('application_status')
+
+    if request.method == 'POST':
+        form = ApplicationForm(request.POST, check_account_name_unique=False)
+        if form.is_valid():
+            application = form.save(commit=False)
+            application.user = user
+            try:
+                saved = await form.asave_reserving_account_name(application)
+            except ApplicationAlreadyExists:
+                messages.info(request, '您已有一個申請記錄，請查看申請狀態。')
+                return redirect('application_status')
+
+            if saved:
+                messages.success(request, '證券帳戶申請已成功提交！我們會盡快處理您的申請。')
+                return redirect('application_status')
+    else:
+        form = ApplicationForm()
+
+    return render(request, 'applications/create.html', {'form': form})
+
+
+@login_required
+async def application_status(request):
+    """查看申請狀態"""
+
+    user = await _resolve_user(request)
+    application = await aget_user_application(user.pk)
+
+    context = {
+        'application': application,
+    }
+
+    return render_conditionally(request, application, 'applications/status.html', context)
+
+
+async def application_status_api(request):
+    """申請狀態 JSON，支援長輪詢
+
+    帶入上次回應的 version（since）與等待秒數（wait）時，若狀態尚未變更，請求會在事件迴圈中等待，
+    直到申請變更（由 invalidate_user_applications() 喚醒）或逾時才回應。
+    """
+
+    user = await _resolve_user(request)
+    if not user.is_authenticated:
+        return JsonResponse({'error': '請先登入'}, status=401)
+
+    try:
+        wait = min(max(int(request.GET.get('wait', 0)), 0), settings.APPLICATION_STATUS_LONGPOLL_MAX_WAIT)
+    except ValueError:
+        return JsonResponse({'error': 'wait 必須是整數秒數'}, status=400)
+    since = request.GET.get('since')
+
+    async with ApplicationWatch(user.pk) as watch:
+        application = await aget_user_application(user.pk)
+        if wait and since == application_version(application):
+            # 等待變更的時間不計入請求指標的處理時間，避免長輪詢拉高延遲直方圖
+            with exclude_from_duration():
+                changed = await watch.wait(wait)
+            if changed:
+                application = await aget_user_application(user.pk)
+
+    return JsonResponse(application_status_payload(application))
+
+
+@login_required
+async def application_update(request, application_id):
+    """更新申請（補件功能）"""
+
+    user = await _resolve_user(request)
+
+    # 確保只能更新自己的申請
+    application = await aget_object_or_404(Application, id=application_id, user=user)
+
+    # 只有「待補件」狀態才能更新
+    if not application.can_be_updated:
+        messages.error(request, '此申請目前無法修改。只有「待補件」狀態的申請可以更新。')
+        return redirect('application_status')
+
+    if request.method == 'POST':
+        form = ApplicationUpdateForm(request.POST, instance=application, check_account_name_unique=False)
+        if form.is_valid():
+            # 更新申請並重置狀態為 PENDING
+            application = form.save(commit=False)
+            transition(application, 'PENDING', actor=user, note='申請人補件後重新送審', save=False)
+
+            if await form.asave_reserving_account_name(application):
+                messages.success(request, '申請資料已更新並重新提交審核。感謝您提供補充資料！')
+                return redirect('application_status')
+        # 表單驗證與 transition() 已修改記憶體中的申請（帳號名稱、狀態、補件說明），以資料庫中的原始資料重新顯示頁面
+        await application.arefresh_from_db()
+    else:
+        form = ApplicationUpdateForm(instance=application)
+
+    context = {
+        'form': form,
+        'application': application,
+    }
+
+    return render(request, 'applications/update.html', context)
+
+
+@login_required
+async def application_success(request, application_id):
+    """申請通過的恭喜頁面"""
+
+    user = await _resolve_user(request)
+
+    # 確保只能查看自己的申請
+    application = await aget_user_application(user.pk)
+    if application is None or application.pk != application_id:
+        raise Http404('找不到此申請')
+
+    # 只有已通過的申請才能查看此頁面
+    if not application.is_approved:
+        messages.error(request, '此申請尚未通過審核。')
+        return redirect('application_status')
+
+    context = {
+        'application': application,
+    }
+
+    return render_conditionally(request, application, 'applications/success.html', context)
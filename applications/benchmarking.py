@@ -0,0 +1,30 @@
+import time
+
+
+def percentile(values, pct):
+    """計算百分位數（最近秩法），values 為空時回傳 0"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def time_calls(func, repeat):
+    """重複執行 func 並回傳每次的耗時（秒）"""
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - started)
+    return durations
+
+
+def summarize(durations):
+    """將耗時列表（秒）整理為毫秒為單位的 p50/p95/p99 摘要"""
+    return {
+        'count': len(durations),
+        'p50_ms': percentile(durations, 50) * 1000,
+        'p95_ms': percentile(durations, 95) * 1000,
+        'p99_ms': percentile(durations, 99) * 1000,
+    }
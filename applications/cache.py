@@ -0,0 +1,67 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Application
+from .polling import notify_application_changed
+
+# 快取中代表「此使用者尚無申請」的標記，與快取未命中 (None) 區分
+NO_APPLICATION = 'NO_APPLICATION'
+
+
+def user_application_key(user_id):
+    """使用者申請快取的鍵值"""
+    return f'application:user:{user_id}'
+
+
+def get_user_application(user_id):
+    """取得使用者的申請（先查快取，未命中才查詢資料庫），沒有申請時回傳 None"""
+    key = user_application_key(user_id)
+    cached = cache.get(key)
+    if cached is not None:
+        return None if cached == NO_APPLICATION else cached
+
+    try:
+        # 狀態頁面會顯示審核人員，一併載入避免快取物件在模板中再次查詢
+        application = Application.objects.select_related('reviewed_by').get(user_id=user_id)
+    except Application.DoesNotExist:
+        application = None
+
+    cache.set(key, NO_APPLICATION if application is None else application, settings.APPLICATION_STATUS_CACHE_TIMEOUT)
+    return application
+
+
+async def aget_user_application(user_id):
+    """get_user_application() 的非同步版本"""
+    key = user_application_key(user_id)
+    cached = await cache.aget(key)
+    if cached is not None:
+        return None if cached == NO_APPLICATION else cached
+
+    try:
+        application = await Application.objects.select_related('reviewed_by').aget(user_id=user_id)
+    except Application.DoesNotExist:
+        application = None
+
+    await cache.aset(key, NO_APPLICATION if application is None else application, settings.APPLICATION_STATUS_CACHE_TIMEOUT)
+    return application
+
+
+def invalidate_user_applications(user_ids):
+    """清除使用者申請快取
+
+    除了立即清除外，也在交易提交後再清除一次，避免交易期間其他請求把舊資料寫回快取，
+    並喚醒等待這些使用者申請變更的長輪詢請求。
+    """
+    user_ids = set(user_ids)
+    keys = [user_application_key(user_id) for user_id in user_ids]
+    if not keys:
+        return
+    cache.delete_many(keys)
+
+    def after_commit():
+        cache.delete_many(keys)
+        # 快取清除後才喚醒等待中的長輪詢請求，確保它們重新讀取到新的狀態
+        notify_application_changed(user_ids)
+
+    transaction.on_commit(after_commit)
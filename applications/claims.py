@@ -0,0 +1,56 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Q, Subquery
+from django.utils import timezone
+
+from .models import Application
+
+# 每次認領的預設筆數
+DEFAULT_CLAIM_COUNT = 10
+
+
+def claimable_applications(now=None):
+    """可認領的申請：審核中且未被認領或租約已到期，等待最久的在前"""
+    now = now or timezone.now()
+    return Application.objects.filter(Q(claim_expires_at__isnull=True) | Q(claim_expires_at__lte=now), status='PENDING').order_by('status_changed_at', 'pk')
+
+
+def claim_applications(reviewer, count=DEFAULT_CLAIM_COUNT, lease=None):
+    """為審核人員認領最多 count 筆等待最久的申請，回傳認領到的申請
+
+    支援 SKIP LOCKED 的資料庫（PostgreSQL、MySQL 8、Oracle）以 SELECT ... FOR UPDATE SKIP LOCKED
+    取出並鎖定資料列，同時認領的其他審核人員會略過已鎖定的資料列而不必等待。
+    SQLite 不支援資料列鎖定，改以單一條件式 UPDATE ... WHERE id IN (SELECT ... LIMIT n) 認領，
+    SQLite 的寫入本身是序列化的，因此不會有兩人認領到同一筆。
+    """
+    now = timezone.now()
+    expires_at = now + (lease or timedelta(seconds=settings.APPLICATION_CLAIM_LEASE_SECONDS))
+    claimable = claimable_applications(now)
+    connection = connections[claimable.db]
+
+    with transaction.atomic():
+        if connection.features.has_select_for_update_skip_locked:
+            pks = list(claimable.select_for_update(skip_locked=True).values_list('pk', flat=True)[:count])
+            Application.objects.filter(pk__in=pks).update(claimed_by=reviewer, claim_expires_at=expires_at)
+        else:
+            Application.objects.filter(pk__in=Subquery(claimable.values('pk')[:count])).update(claimed_by=reviewer, claim_expires_at=expires_at)
+            # 同一位審核人員的認領到期時間精確到微秒，可用來找出本次認領到的資料列
+            pks = list(Application.objects.filter(claimed_by=reviewer, claim_expires_at=expires_at).values_list('pk', flat=True))
+
+    return list(Application.objects.filter(pk__in=pks).select_related('user').order_by('status_changed_at', 'pk'))
+
+
+def release_claims(reviewer, pks=None):
+    """釋放審核人員的認領（pks 為 None 時釋放全部），回傳釋放的筆數"""
+    claimed = Application.objects.filter(claimed_by=reviewer)
+    if pks is not None:
+        claimed = claimed.filter(pk__in=pks)
+    return claimed.update(claimed_by=None, claim_expires_at=None)
+
+
+def active_claims(reviewer, now=None):
+    """審核人員目前仍在租約內的認領"""
+    now = now or timezone.now()
+    return Application.objects.filter(claimed_by=reviewer, claim_expires_at__gt=now, status='PENDING').select_related('user').order_by('status_changed_at', 'pk')
@@ -0,0 +1,50 @@
+import hashlib
+
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.shortcuts import render
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+
+def application_version(application):
+    """申請的版本字串，申請每次儲存都會改變，尚無申請時為 none"""
+    return 'none' if application is None else f'{application.pk}-{application.updated_at.timestamp():.6f}'
+
+
+def viewer_version(user):
+    """頁面導覽列顯示的使用者資料（名稱與管理後台連結）的版本，這些資料變更時 ETag 隨之改變"""
+    rendered = f'{user.username}\0{user.first_name}\0{user.is_staff}'
+    return hashlib.sha256(rendered.encode()).hexdigest()[:16]
+
+
+def application_etag(user, application):
+    """由使用者 id、導覽列顯示的使用者資料與申請版本組成 ETag"""
+    return quote_etag(f'{user.pk}-{viewer_version(user)}-{application_version(application)}')
+
+
+def render_conditionally(request, application, template_name, context):
+    """渲染申請人的申請頁面並支援條件式 GET
+
+    application 由呼叫端以 get_user_application() 取得（通常來自快取），用戶端帶著仍然有效的
+    If-None-Match 時直接回應 304，不渲染模板。
+    有待顯示的訊息時頁面內容與 ETag 不一致，因此不做條件判斷也不附上驗證標頭。
+
+    Last-Modified 只反映申請的更新時間，使用者資料沒有對應的修改時間，因此只附上標頭供參考，
+    不以 If-Modified-Since 回應 304；瀏覽器會同時送出 If-None-Match，以 ETag 判斷。
+    """
+    if request.COOKIES.get(CookieStorage.cookie_name):
+        response = render(request, template_name, context)
+    else:
+        etag = application_etag(request.user, application)
+        last_modified = int(application.updated_at.timestamp()) if application is not None else None
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = render(request, template_name, context)
+        response.headers.setdefault('ETag', etag)
+        if last_modified is not None:
+            response.headers.setdefault('Last-Modified', http_date(last_modified))
+
+    # 頁面依登入使用者而異，只允許瀏覽器保存，且每次使用前都要重新驗證
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ('Cookie',))
+    return response
@@ -0,0 +1,174 @@
+import csv
+import re
+import zipfile
+from datetime import datetime
+from xml.sax.saxutils import escape
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from .models import Application
+
+# 每次自資料庫取回的筆數
+DEFAULT_CHUNK_SIZE = 2000
+
+# 匯出欄位：(標題, values_list 欄位)
+EXPORT_COLUMNS = [
+    ('申請編號', 'id'),
+    ('申請人帳號', 'user__username'),
+    ('申請人電子郵件', 'user__email'),
+    ('申請人帳號名稱', 'account_name'),
+    ('電話號碼', 'phone_number'),
+    ('詳細地址', 'address'),
+    ('申請狀態', 'status'),
+    ('申請時間', 'created_at'),
+    ('審核時間', 'reviewed_at'),
+    ('審核人員', 'reviewed_by__username'),
+    ('通過時間', 'approved_at'),
+    ('拒絕原因', 'rejection_reason'),
+    ('需補充資料說明', 'additional_info_required'),
+]
+
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+# XML 1.0 不允許的控制字元
+_ILLEGAL_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+# 試算表會將這些字元開頭的儲存格當作公式執行
+_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _escape_formula(value):
+    """在可能被試算表當作公式的字串前加上單引號，避免匯出檔中的公式注入"""
+    if value.startswith(_FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def _format_value(field, value, status_labels):
+    """將欄位值轉為匯出用的字串"""
+    if value is None:
+        return ''
+    if field == 'status':
+        return status_labels.get(value, value)
+    if isinstance(value, datetime):
+        return timezone.localtime(value).strftime('%Y-%m-%d %H:%M:%S')
+    return str(value)
+
+
+def iter_export_rows(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    """逐筆產生匯出資料列（第一列為標題）
+
+    以 values_list 搭配關聯欄位在同一個 JOIN 查詢中取回申請人與審核人員，
+    並用 iterator(chunk_size=...) 分批讀取，記憶體用量不隨資料筆數增加。
+    """
+    status_labels = dict(Application.STATUS_CHOICES)
+    yield [header for header, _ in EXPORT_COLUMNS]
+
+    rows = queryset.values_list(*(field for _, field in EXPORT_COLUMNS)).iterator(chunk_size=chunk_size)
+    for row in rows:
+        yield [_format_value(field, value, status_labels) for (_, field), value in zip(EXPORT_COLUMNS, row)]
+
+
+class _Echo:
+    """只回傳寫入內容的假檔案，讓 csv.writer 可逐列產生字串"""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows):
+    """將資料列串流為 UTF-8 CSV（帶 BOM 讓 Excel 正確辨識編碼）"""
+    writer = csv.writer(_Echo())
+    yield '\ufeff'.encode('utf-8')
+    for row in rows:
+        yield writer.writerow([_escape_formula(value) for value in row]).encode('utf-8')
+
+
+class _ZipStream:
+    """zipfile 寫入用的不可定位緩衝區，產生器每次取出已寫入的位元組"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+_XLSX_STATIC_PARTS = {
+    '[Content_Types].xml': ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                            '<Default Extension="xml" ContentType="application/xml"/>'
+                            '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+                            '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                            '</Types>'),
+    '_rels/.rels': ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+                    '</Relationships>'),
+    'xl/workbook.xml': ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+                        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+                        '<sheets><sheet name="Applications" sheetId="1" r:id="rId1"/></sheets>'
+                        '</workbook>'),
+    'xl/_rels/workbook.xml.rels': ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                                   '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                                   '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+                                   '</Relationships>'),
+}
+
+
+def _xlsx_row(row):
+    """將一列資料轉為使用內嵌字串的工作表 XML"""
+    cells = ''.join(f'<c t="inlineStr"><is><t xml:space="preserve">{escape(_ILLEGAL_XML_CHARS.sub("", _escape_formula(value)))}</t></is></c>' for value in row)
+    return f'<row>{cells}</row>'
+
+
+def stream_xlsx(rows, flush_every=500):
+    """將資料列串流為 XLSX
+
+    以標準函式庫的 zipfile 寫入不可定位的緩衝區（使用資料描述區塊），
+    每累積 flush_every 列就送出已壓縮的位元組，不需先在記憶體或磁碟中組出整個檔案。
+    """
+    stream = _ZipStream()
+    with zipfile.ZipFile(stream, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in _XLSX_STATIC_PARTS.items():
+            archive.writestr(name, content)
+        yield stream.drain()
+
+        with archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            sheet.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                        b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>')
+            for count, row in enumerate(rows, start=1):
+                sheet.write(_xlsx_row(row).encode('utf-8'))
+                if count % flush_every == 0:
+                    yield stream.drain()
+            sheet.write(b'</sheetData></worksheet>')
+    yield stream.drain()
+
+
+def stream_export(queryset, file_format, chunk_size=DEFAULT_CHUNK_SIZE):
+    """依格式產生匯出內容的位元組串流"""
+    rows = iter_export_rows(queryset, chunk_size=chunk_size)
+    return stream_xlsx(rows) if file_format == 'xlsx' else stream_csv(rows)
+
+
+def export_response(queryset, file_format, filename=None):
+    """以 StreamingHttpResponse 回傳匯出檔，查詢開始後即可送出第一個位元組"""
+    filename = filename or f'applications-{timezone.localdate():%Y%m%d}.{file_format}'
+    response = StreamingHttpResponse(stream_export(queryset, file_format), content_type=CONTENT_TYPES[file_format])
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
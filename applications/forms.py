@@ -1,11 +1,17 @@
-import re
-
+from asgiref.sync import sync_to_async
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
 
 from .models import Application
+from .transitions import can_transition, current_status
+from .validators import validate_account_name_format, validate_address, validate_phone_number
+
+
+class ApplicationAlreadyExists(Exception):
+    """使用者已有申請（違反一人一申請的唯一限制）"""
 
 
 class ApplicationForm(forms.ModelForm):
@@ -43,63 +49,71 @@ class ApplicationForm(forms.ModelForm):
             }),
         }
 
+    def __init__(self, *args, check_account_name_unique=True, **kwargs):
+        # 送出申請的視圖會關閉查詢檢查，改由 save_reserving_account_name() 以資料庫唯一限制保證
+        self.check_account_name_unique = check_account_name_unique
+        super().__init__(*args, **kwargs)
+
     def clean_account_name(self):
         """驗證帳號名稱格式和唯一性"""
         account_name = self.cleaned_data['account_name']
 
         # 格式驗證
-        if not re.match(r'^[a-zA-Z0-9][a-zA-Z0-9_-]*$', account_name):
-            raise ValidationError('帳號名稱只能包含英文字母、數字、底線、短橫線，且必須以字母或數字開頭')
+        validate_account_name_format(account_name)
 
-        if len(account_name) < 3:
-            raise ValidationError('帳號名稱至少需要3個字符')
+        # 唯一性驗證 - 檢查整個系統中是否已存在
+        if self.check_account_name_unique and self._conflicting_applications(account_name).exists():
+            raise ValidationError('此帳號名稱已被使用，請選擇其他名稱')
 
-        if len(account_name) > 20:
-            raise ValidationError('帳號名稱不能超過20個字符')
+        return account_name
 
-        # 唯一性驗證 - 檢查整個系統中是否已存在
+    def _conflicting_applications(self, account_name):
+        """使用相同帳號名稱的其他申請"""
         existing_application = Application.objects.filter(account_name=account_name)
 
         # 如果是更新表單，排除自己
         if self.instance.pk:
             existing_application = existing_application.exclude(pk=self.instance.pk)
 
-        if existing_application.exists():
-            raise ValidationError('此帳號名稱已被使用，請選擇其他名稱')
-
-        return account_name
+        return existing_application
+
+    def _get_validation_exclusions(self):
+        """帳號名稱唯一性已由 clean_account_name 或資料庫唯一限制處理，略過模型限制的重複查詢"""
+        exclude = super()._get_validation_exclusions()
+        exclude.add('account_name')
+        return exclude
+
+    def save_reserving_account_name(self, application):
+        """以單一 INSERT/UPDATE 寫入申請，由資料庫唯一限制保證帳號名稱不重複
+
+        同時送出相同帳號名稱時只有一筆能寫入成功，其餘會得到 IntegrityError，
+        並轉換為與 clean_account_name 相同的表單錯誤後回傳 None。
+        新申請違反一人一申請限制時拋出 ApplicationAlreadyExists。
+        """
+        adding = application._state.adding
+        try:
+            with transaction.atomic():
+                application.save()
+        except IntegrityError:
+            # 僅在失敗時才多查一次，判斷違反的是哪一個唯一限制
+            if adding and Application.objects.filter(user_id=application.user_id).exists():
+                raise ApplicationAlreadyExists
+            self.add_error('account_name', '此帳號名稱已被使用，請選擇其他名稱')
+            return None
+        return application
+
+    async def asave_reserving_account_name(self, application):
+        """save_reserving_account_name() 的非同步版本"""
+        return await sync_to_async(self.save_reserving_account_name)(application)
 
     def clean_phone_number(self):
         """驗證手機號碼格式"""
 
-        phone_number = self.cleaned_data['phone_number']
-
-        # 移除所有空格和短橫線，方便驗證
-        cleaned_phone = re.sub(r'[\s\-()]', '', phone_number)
-
-        # 台灣手機號碼格式：09XXXXXXXX
-        mobile_pattern = r'^09\d{8}$'
-
-        if not re.match(mobile_pattern, cleaned_phone):
-            raise ValidationError('請輸入有效的台灣手機號碼格式，例如：0912-345-678')
-
-        return phone_number
+        return validate_phone_number(self.cleaned_data['phone_number'])
 
     def clean_address(self):
         """驗證地址內容"""
-        address = self.cleaned_data['address'].strip()
-
-        if len(address) < 10:
-            raise ValidationError('地址太短，請提供完整的聯絡地址')
-
-        if len(address) > 200:
-            raise ValidationError('地址過長，請簡化至200個字符以內')
-
-        # 檢查是否包含基本地址元素
-        if not any(keyword in address for keyword in ['市', '縣', '區', '鄉', '鎮', '路', '街', '巷', '號']):
-            raise ValidationError('請提供完整的地址資訊，包含縣市、區域、街道門牌')
-
-        return address
+        return validate_address(self.cleaned_data['address'])
 
 
 class ApplicationUpdateForm(ApplicationForm):
@@ -114,6 +128,33 @@ class ApplicationUpdateForm(ApplicationForm):
                 field.help_text = f"{field.help_text or ''}\n補件說明：{self.instance.additional_info_required}"
 
 
+class ApplicationAdminForm(forms.ModelForm):
+    """管理後台的申請表單，狀態只能依允許的轉換變更，且不可修改其他審核人員認領中的申請"""
+
+    # 由 ApplicationAdmin.get_form() 設定為目前的審核人員
+    reviewer = None
+
+    class Meta:
+        model = Application
+        fields = '__all__'
+
+    def clean(self):
+        """檢查申請是否由其他審核人員認領中"""
+        cleaned_data = super().clean()
+        if self.reviewer is not None and self.has_changed() and self.instance.is_claimed_by_other(self.reviewer):
+            raise ValidationError(f'此申請已由 {self.instance.claimed_by} 認領，租約到期前無法修改，請改為認領其他申請')
+        return cleaned_data
+
+    def clean_status(self):
+        """驗證狀態轉換是否允許"""
+        status = self.cleaned_data['status']
+        from_status = current_status(self.instance)
+        if from_status is not None and status != from_status and not can_transition(from_status, status):
+            labels = dict(Application.STATUS_CHOICES)
+            raise ValidationError(f'申請狀態不可由「{labels[from_status]}」變更為「{labels[status]}」')
+        return status
+
+
 class CustomUserCreationForm(UserCreationForm):
     """自定義使用者註冊表單"""
 
@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, PBKDF2PasswordHasher, ScryptPasswordHasher
+
+
+def hasher_cost(policy, name, default):
+    """讀取 settings.APPLICATION_PASSWORD_HASHER_COST 中的成本參數，未設定時沿用 Django 的預設值"""
+    return getattr(settings, 'APPLICATION_PASSWORD_HASHER_COST', {}).get(policy, {}).get(name, default)
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """迭代次數可由設定調整的 PBKDF2；儲存的雜湊次數與設定不同時，登入成功後會以目前設定重新雜湊"""
+
+    policy = 'pbkdf2'
+
+    @property
+    def iterations(self):
+        return hasher_cost(self.policy, 'iterations', super().iterations)
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    """成本參數可由設定調整的 scrypt"""
+
+    policy = 'scrypt'
+
+    @property
+    def work_factor(self):
+        return hasher_cost(self.policy, 'work_factor', super().work_factor)
+
+    @property
+    def block_size(self):
+        return hasher_cost(self.policy, 'block_size', super().block_size)
+
+    @property
+    def parallelism(self):
+        return hasher_cost(self.policy, 'parallelism', super().parallelism)
+
+    @property
+    def maxmem(self):
+        # scrypt 約需 128 * n * r 位元組，OpenSSL 預設上限為 32 MiB，提高 work_factor 時一併放寬
+        return hasher_cost(self.policy, 'maxmem', 256 * self.work_factor * self.block_size)
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """成本參數可由設定調整的 Argon2id（需要 argon2-cffi 套件）"""
+
+    policy = 'argon2'
+
+    @property
+    def time_cost(self):
+        return hasher_cost(self.policy, 'time_cost', super().time_cost)
+
+    @property
+    def memory_cost(self):
+        return hasher_cost(self.policy, 'memory_cost', super().memory_cost)
+
+    @property
+    def parallelism(self):
+        return hasher_cost(self.policy, 'parallelism', super().parallelism)
@@ -0,0 +1,138 @@
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, connections
+from django.utils import timezone
+
+from applications.benchmarking import summarize
+from applications.claims import active_claims, claim_applications
+from applications.models import Application
+
+
+class Command(BaseCommand):
+    help = '在暫存資料庫中模擬多位審核人員同時處理審核佇列，比較認領 (claim) 與直接搶最舊申請的吞吐量與重工'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=2000,
+            help='待審核的申請筆數 (預設: 2000)'
+        )
+        parser.add_argument(
+            '--reviewers',
+            type=int,
+            default=30,
+            help='同時作業的審核人員數 (預設: 30)'
+        )
+        parser.add_argument(
+            '--batch',
+            type=int,
+            default=5,
+            help='每位審核人員每次取得的申請數 (預設: 5)'
+        )
+        parser.add_argument(
+            '--review-ms',
+            type=float,
+            default=2.0,
+            help='模擬審核每筆申請所需的毫秒數 (預設: 2)'
+        )
+
+    def handle(self, *args, **options):
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            reviewers = self._seed_reviewers(options['reviewers'])
+            results = {}
+            for mode in ('naive', 'claim'):
+                self._seed_applications(options['rows'])
+                results[mode] = self._run(mode, reviewers, options['batch'], options['review_ms'] / 1000)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        self.stdout.write(self.style.SUCCESS(f'{options["rows"]} 筆申請、{options["reviewers"]} 位審核人員、每次 {options["batch"]} 筆'))
+        for label, mode in (('直接取最舊申請', 'naive'), ('認領 (claim)', 'claim')):
+            result = results[mode]
+            self.stdout.write(f'  {label}: {result["throughput"]:.1f} 筆/秒，完成 {result["reviewed"]} 筆，'
+                              f'重工 {result["wasted"]} 筆，重複認領 {result["duplicates"]} 筆，'
+                              f'取得工作 p50 {result["p50_ms"]:.2f} ms / p99 {result["p99_ms"]:.2f} ms，鎖定重試 {result["retries"]} 次')
+
+    def _seed_reviewers(self, count):
+        return User.objects.bulk_create([User(username=f'reviewer_{i}', password='!', is_staff=True) for i in range(count)])
+
+    def _seed_applications(self, rows):
+        """重新建立待審核的申請"""
+        Application.objects.all().delete()
+        User.objects.filter(username__startswith='bench_').delete()
+        users = User.objects.bulk_create([User(username=f'bench_{i}', password='!') for i in range(rows)])
+        Application.objects.bulk_create([
+            Application(user=user, account_name=f'bench_{i}', phone_number='0912-345-678', address='台北市信義區信義路五段7號') for i, user in enumerate(users)
+        ], batch_size=1000)
+
+    def _retry(self, func, stats):
+        """SQLite 在多執行緒同時寫入時會回報資料表鎖定，稍候重試並計數"""
+        while True:
+            try:
+                return func()
+            except OperationalError:
+                with stats['lock']:
+                    stats['retries'] += 1
+                time.sleep(0.001)
+
+    def _run(self, mode, reviewers, batch, review_seconds):
+        stats = {'lock': threading.Lock(), 'retries': 0, 'reviewed': 0, 'wasted': 0, 'fetch': [], 'taken': Counter()}
+
+        def take_work(reviewer):
+            if mode == 'claim':
+                # 先接續自己尚未處理完的認領（認領已提交但讀回時遇到鎖定而重試的情況）
+                pks = list(active_claims(reviewer).values_list('pk', flat=True)[:batch])
+                return pks or [application.pk for application in claim_applications(reviewer, batch)]
+            # 沒有認領機制時，每位審核人員都打開佇列中等待最久的申請
+            return list(Application.objects.filter(status='PENDING').order_by('status_changed_at', 'pk').values_list('pk', flat=True)[:batch])
+
+        def review(reviewer, pk):
+            now = timezone.now()
+            return Application.objects.filter(pk=pk, status='PENDING').update(status='APPROVED', reviewed_by=reviewer, reviewed_at=now, approved_at=now, status_changed_at=now, claimed_by=None, claim_expires_at=None)
+
+        def work(reviewer):
+            try:
+                while True:
+                    started = time.perf_counter()
+                    pks = self._retry(lambda: take_work(reviewer), stats)
+                    fetched = time.perf_counter() - started
+                    if not pks:
+                        return
+                    reviewed = wasted = 0
+                    for pk in pks:
+                        time.sleep(review_seconds)
+                        if self._retry(lambda: review(reviewer, pk), stats):
+                            reviewed += 1
+                        else:
+                            wasted += 1  # 審核完才發現已被其他人處理
+                    with stats['lock']:
+                        stats['fetch'].append(fetched)
+                        stats['taken'].update(pks)
+                        stats['reviewed'] += reviewed
+                        stats['wasted'] += wasted
+            finally:
+                connections.close_all()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(reviewers)) as executor:
+            list(executor.map(work, reviewers))
+        elapsed = time.perf_counter() - started
+
+        summary = summarize(stats['fetch'])
+        return {
+            'throughput': stats['reviewed'] / elapsed if elapsed else 0.0,
+            'reviewed': stats['reviewed'],
+            'wasted': stats['wasted'],
+            'duplicates': sum(count - 1 for count in stats['taken'].values() if count > 1) if mode == 'claim' else 0,
+            'retries': stats['retries'],
+            'p50_ms': summary['p50_ms'],
+            'p99_ms': summary['p99_ms'],
+        }
@@ -0,0 +1,117 @@
+import copy
+import queue
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.test import Client, override_settings
+
+from applications.benchmarking import summarize
+
+
+class Command(BaseCommand):
+    help = '在暫存資料庫中併發送出申請表單，比較目前資料庫設定 (DJANGO_DB_PROFILE) 與未調校時的寫入吞吐量'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--submissions',
+            type=int,
+            default=1000,
+            help='每種設定送出的申請數 (預設: 1000)'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=20,
+            help='同時送出申請的使用者數 (預設: 20)'
+        )
+
+    def handle(self, *args, **options):
+        original = copy.deepcopy(connection.settings_dict)
+        results = []
+        try:
+            for label, overrides in self._variants(original):
+                connection.settings_dict.update(copy.deepcopy(overrides))
+                results.append((label, self._run_variant(options['submissions'], options['concurrency'])))
+                connection.settings_dict.clear()
+                connection.settings_dict.update(copy.deepcopy(original))
+        finally:
+            connection.settings_dict.clear()
+            connection.settings_dict.update(original)
+
+        self.stdout.write(self.style.SUCCESS(f'DJANGO_DB_PROFILE={settings.DB_PROFILE}：{options["submissions"]} 筆申請（同時 {options["concurrency"]} 位使用者送出）'))
+        for label, result in results:
+            self.stdout.write(f'  {label}: {result["wps"]:.1f} 筆/秒, p50 {result["p50_ms"]:.2f} ms, '
+                              f'p99 {result["p99_ms"]:.2f} ms, 失敗 {result["errors"]} 筆')
+
+    def _variants(self, original):
+        """要比較的資料庫設定：未調校的基準與目前的設定"""
+        if original['ENGINE'] == 'django.db.backends.sqlite3':
+            baseline = ('SQLite 預設（rollback journal、交易延遲取得鎖）', {'OPTIONS': {}})
+        else:
+            options = {key: value for key, value in original['OPTIONS'].items() if key != 'pool'}
+            baseline = ('每個請求重新連線', {'CONN_MAX_AGE': 0, 'OPTIONS': options})
+        return [baseline, ('目前設定', {})]
+
+    def _run_variant(self, submissions, concurrency):
+        old_name = connection.settings_dict['NAME']
+        with tempfile.TemporaryDirectory() as directory:
+            if connection.vendor == 'sqlite':
+                # 記憶體資料庫沒有檔案鎖與日誌，改用暫存檔案才能反映 WAL 等設定的效果
+                connection.settings_dict['TEST'] = {**connection.settings_dict.get('TEST', {}), 'NAME': str(Path(directory) / 'benchmark.sqlite3')}
+            connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+            try:
+                return self._submit(submissions, concurrency)
+            finally:
+                connections.close_all()
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def _submit(self, submissions, concurrency):
+        """每位使用者送出一份申請，以執行緒模擬 WSGI 伺服器的工作執行緒"""
+        users = User.objects.bulk_create([User(username=f'bench_{i}', email=f'bench_{i}@example.com', password='!') for i in range(submissions)])
+        # 先在主執行緒登入，壓測期間只有申請表單的寫入
+        pending = queue.SimpleQueue()
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            for i, user in enumerate(users):
+                client = Client(raise_request_exception=False)
+                client.force_login(user)
+                pending.put((i, client))
+            durations, errors = [], []
+            lock = threading.Lock()
+
+            def work():
+                try:
+                    while True:
+                        try:
+                            i, client = pending.get_nowait()
+                        except queue.Empty:
+                            return
+                        data = {'account_name': f'bench_{i}', 'phone_number': '0912-345-678', 'address': '台北市信義區信義路五段7號'}
+                        started = time.perf_counter()
+                        response = client.post('/application/create/', data)
+                        elapsed = time.perf_counter() - started
+                        with lock:
+                            durations.append(elapsed)
+                            # 成功送出會導向申請狀態頁，其他回應（如 database is locked 的 500）視為失敗
+                            if response.status_code != 302:
+                                errors.append(response.status_code)
+                finally:
+                    connections.close_all()
+
+            started = time.perf_counter()
+            workers = [threading.Thread(target=work) for _ in range(concurrency)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            elapsed = time.perf_counter() - started
+
+        result = summarize(durations)
+        result['wps'] = (len(durations) - len(errors)) / elapsed if elapsed else 0.0
+        result['errors'] = len(errors)
+        return result
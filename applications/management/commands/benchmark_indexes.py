@@ -0,0 +1,141 @@
+import random
+from contextlib import contextmanager
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from applications.benchmarking import summarize, time_calls
+from applications.models import Application
+
+
+class Command(BaseCommand):
+    help = '在暫存的測試資料庫中灌入大量申請，比較加上索引前後熱門查詢的查詢計畫與延遲'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=1_000_000,
+            help='灌入的申請筆數 (預設: 1000000)'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=50,
+            help='每個查詢重複執行的次數 (預設: 50)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10_000,
+            help='bulk_create 每批筆數 (預設: 10000)'
+        )
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+
+        # 使用獨立的測試資料庫，避免動到開發或正式資料
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            self.stdout.write(f'灌入 {rows} 筆申請資料...')
+            self._seed(rows, options['batch_size'])
+
+            self._drop_indexes()
+            before = self._measure('加上索引前', options['repeat'])
+            self._restore_indexes()
+            after = self._measure('加上索引後', options['repeat'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        self.stdout.write(self.style.SUCCESS('延遲比較 (p50 / p95, 毫秒)'))
+        for name in before:
+            self.stdout.write(f'  {name}: {before[name]["p50_ms"]:.3f} / {before[name]["p95_ms"]:.3f}'
+                              f' -> {after[name]["p50_ms"]:.3f} / {after[name]["p95_ms"]:.3f}')
+
+    def _seed(self, rows, batch_size):
+        """以 bulk_create 分批灌入使用者與申請（所有使用者共用不可登入的密碼）"""
+        rng = random.Random(42)
+        now = timezone.now()
+        statuses = ['PENDING'] * 5 + ['APPROVED'] * 3 + ['REJECTED'] + ['ADDITIONAL_REQUIRED']
+
+        for start in range(0, rows, batch_size):
+            end = min(start + batch_size, rows)
+            users = User.objects.bulk_create([User(username=f'bench_{i}', email=f'bench_{i}@example.com', password='!') for i in range(start, end)])
+
+            applications = []
+            for i, user in enumerate(users, start=start):
+                status = rng.choice(statuses)
+                created_at = now - timezone.timedelta(minutes=rng.randint(0, 365 * 24 * 60))
+                reviewed_at = created_at + timezone.timedelta(hours=rng.randint(1, 120)) if status != 'PENDING' else None
+                applications.append(
+                    Application(user=user,
+                                account_name=f'bench_{i}',
+                                phone_number='0912-345-678',
+                                address='台北市信義區信義路五段7號',
+                                status=status,
+                                created_at=created_at,
+                                reviewed_at=reviewed_at,
+                                approved_at=reviewed_at if status == 'APPROVED' else None))
+            Application.objects.bulk_create(applications)
+
+    def _queries(self):
+        """與頁面對應的熱門查詢"""
+        probe = Application.objects.order_by('pk').values('user_id', 'account_name')[Application.objects.count() // 2]
+        return {
+            'application_status 依使用者查詢': Application.objects.filter(user_id=probe['user_id']),
+            'clean_account_name 唯一性檢查': Application.objects.filter(account_name=probe['account_name']),
+            '後台列表 依申請時間排序': Application.objects.order_by('-created_at')[:25],
+            '後台列表 審核中依申請時間排序': Application.objects.filter(status='PENDING').order_by('-created_at')[:25],
+            '後台列表 已通過依審核時間排序': Application.objects.filter(status='APPROVED').order_by('-reviewed_at')[:25],
+        }
+
+    def _measure(self, label, repeat):
+        """輸出每個查詢的查詢計畫並量測延遲"""
+        self.stdout.write(self.style.MIGRATE_HEADING(label))
+        results = {}
+        for name, queryset in self._queries().items():
+            self.stdout.write(f'  {name}')
+            for line in queryset.explain().splitlines():
+                self.stdout.write(f'    {line}')
+            results[name] = summarize(time_calls(lambda: list(queryset.all()), repeat))
+        return results
+
+    def _existing_names(self):
+        """查詢資料庫中 Application 資料表目前存在的索引與限制名稱"""
+        with connection.cursor() as cursor:
+            return set(connection.introspection.get_constraints(cursor, Application._meta.db_table))
+
+    @contextmanager
+    def _without_declared_indexes(self):
+        """暫時清空 Meta 上的索引與限制，讓 SQLite 重建資料表時不再帶入它們"""
+        meta = Application._meta
+        indexes, constraints = meta.indexes, meta.constraints
+        meta.indexes, meta.constraints = [], []
+        try:
+            yield
+        finally:
+            meta.indexes, meta.constraints = indexes, constraints
+
+    def _drop_indexes(self):
+        """移除 Application 上宣告的索引與唯一限制，模擬加上索引前的狀態"""
+        constraints, indexes = list(Application._meta.constraints), list(Application._meta.indexes)
+        with self._without_declared_indexes(), connection.schema_editor() as editor:
+            for constraint in constraints:
+                if constraint.name in self._existing_names():
+                    editor.remove_constraint(Application, constraint)
+            for index in indexes:
+                if index.name in self._existing_names():
+                    editor.remove_index(Application, index)
+
+    def _restore_indexes(self):
+        """重新建立 Application 上宣告的索引與唯一限制"""
+        with connection.schema_editor() as editor:
+            for constraint in Application._meta.constraints:
+                if constraint.name not in self._existing_names():
+                    editor.add_constraint(Application, constraint)
+            for index in Application._meta.indexes:
+                if index.name not in self._existing_names():
+                    editor.add_index(Application, index)
@@ -0,0 +1,74 @@
+import copy
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hashers
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from applications.benchmarking import summarize, time_calls
+
+PASSWORD = 'Benchmark-passw0rd'
+# 各演算法 decode() 結果中屬於成本參數的欄位
+COST_PARAMETERS = ('iterations', 'work_factor', 'block_size', 'parallelism', 'time_cost', 'memory_cost')
+
+
+class Command(BaseCommand):
+    help = '量測各密碼雜湊設定驗證一次密碼的耗時與每核心每秒可處理的登入數，作為調整成本參數的依據'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=10,
+            help='每種設定驗證密碼的次數 (預設: 10)'
+        )
+        parser.add_argument(
+            '--pbkdf2-iterations',
+            type=int,
+            nargs='+',
+            help='要比較的 PBKDF2 迭代次數 (預設: 目前設定)'
+        )
+        parser.add_argument(
+            '--scrypt-work-factor',
+            type=int,
+            nargs='+',
+            help='要比較的 scrypt work factor，須為 2 的次方 (預設: 目前設定)'
+        )
+        parser.add_argument(
+            '--target-ms',
+            type=float,
+            help='依量測結果估算 PBKDF2 單次驗證耗時達到此毫秒數所需的迭代次數'
+        )
+
+    def handle(self, *args, **options):
+        variants = {
+            'pbkdf2': [('iterations', value) for value in options['pbkdf2_iterations'] or []],
+            'scrypt': [('work_factor', value) for value in options['scrypt_work_factor'] or []],
+        }
+        current = settings.PASSWORD_HASHERS[0]
+        self.stdout.write(self.style.SUCCESS(f'目前使用 {current}（單一執行緒量測，即每核心的處理量）'))
+
+        for hasher in get_hashers():
+            policy = getattr(hasher, 'policy', hasher.algorithm)
+            if getattr(hasher, 'library', None):
+                try:
+                    hasher._load_library()
+                except ValueError:
+                    self.stdout.write(f'  {policy}: 未安裝 {hasher.library} 套件，略過')
+                    continue
+            for name, value in variants.get(policy) or [(None, None)]:
+                cost = copy.deepcopy(getattr(settings, 'APPLICATION_PASSWORD_HASHER_COST', {}))
+                if name is not None:
+                    cost.setdefault(policy, {})[name] = value
+                with override_settings(APPLICATION_PASSWORD_HASHER_COST=cost):
+                    self._measure(hasher, policy, options['repeat'], options['target_ms'])
+
+    def _measure(self, hasher, policy, repeat, target_ms):
+        encoded = hasher.encode(PASSWORD, hasher.salt())
+        summary = summarize(time_calls(lambda: hasher.verify(PASSWORD, encoded), repeat))
+        params = ', '.join(f'{key}={value}' for key, value in hasher.decode(encoded).items() if key in COST_PARAMETERS)
+        logins = 1000 / summary['p50_ms'] if summary['p50_ms'] else 0.0
+        self.stdout.write(f'  {policy} ({params}): p50 {summary["p50_ms"]:.1f} ms, p95 {summary["p95_ms"]:.1f} ms, 每核心 {logins:.1f} 次登入/秒')
+        if target_ms and policy == 'pbkdf2' and summary['p50_ms']:
+            suggested = round(hasher.iterations * target_ms / summary['p50_ms'], -3)
+            self.stdout.write(f'    單次驗證約 {target_ms:g} ms 需要 iterations≈{suggested:,.0f}（DJANGO_PBKDF2_ITERATIONS）')
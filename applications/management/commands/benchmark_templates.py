@@ -0,0 +1,96 @@
+import copy
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser, User
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.management.base import BaseCommand
+from django.template.backends.django import DjangoTemplates
+from django.test import RequestFactory, override_settings
+from django.utils import timezone
+
+from applications.benchmarking import summarize, time_calls
+from applications.forms import ApplicationForm, ApplicationUpdateForm, CustomUserCreationForm, LoginForm
+from applications.models import Application
+
+UNCACHED_LOADERS = ['django.template.loaders.filesystem.Loader', 'django.template.loaders.app_directories.Loader']
+CACHED_LOADERS = [('django.template.loaders.cached.Loader', UNCACHED_LOADERS)]
+# 片段快取的比較設定：DummyCache 等同每次都重新渲染片段
+FRAGMENT_CACHES = {
+    'off': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+    'on': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'benchmark-template-fragments'},
+}
+
+
+class Command(BaseCommand):
+    help = '量測申請人頁面各模板在未快取 loader、cached loader 與加上片段快取時的渲染耗時（不存取資料庫）'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=500,
+            help='每個模板在每種設定下的渲染次數 (預設: 500)'
+        )
+
+    def handle(self, *args, **options):
+        variants = [
+            ('未快取 loader', UNCACHED_LOADERS, 'off'),
+            ('cached loader', CACHED_LOADERS, 'off'),
+            ('cached loader + 片段快取', CACHED_LOADERS, 'on'),
+        ]
+        results = {}
+        for label, loaders, fragments in variants:
+            engine = self._engine(loaders)
+            with override_settings(CACHES={**settings.CACHES, 'template_fragments': FRAGMENT_CACHES[fragments]}):
+                for name, template_name, context, user in self._pages():
+                    # 第一次渲染不計時，讓 cached loader 與片段快取進入穩定狀態
+                    durations = time_calls(lambda: self._render(engine, template_name, context, user), options['repeat'] + 1)[1:]
+                    results.setdefault(name, {})[label] = summarize(durations)
+
+        self.stdout.write(self.style.SUCCESS(f'每個模板渲染 {options["repeat"]} 次的 p50 / p95（毫秒）'))
+        for name, timings in results.items():
+            cells = ', '.join(f'{label} {summary["p50_ms"]:.3f} / {summary["p95_ms"]:.3f}' for label, summary in timings.items())
+            self.stdout.write(f'  {name}: {cells}')
+
+    def _engine(self, loaders):
+        """以目前的模板設定建立使用指定 loaders 的模板引擎"""
+        params = copy.deepcopy(settings.TEMPLATES[0])
+        # BACKEND 由 django.template.engines 使用，直接建立後端時不能傳入
+        params.pop('BACKEND')
+        params.update(NAME=f'benchmark-{id(loaders)}', APP_DIRS=False)
+        params['OPTIONS']['loaders'] = loaders
+        return DjangoTemplates(params)
+
+    def _render(self, engine, template_name, context, user):
+        """以模擬的請求渲染模板，每次都經過模板查找，與 render() 捷徑相同"""
+        request = RequestFactory().get('/')
+        request.user = user
+        request._messages = CookieStorage(request)
+        return engine.get_template(template_name).render(context, request)
+
+    def _pages(self):
+        """各模板的代表性頁面：(名稱, 模板, context, 使用者)，物件只建立在記憶體中"""
+        now = timezone.now()
+        user = User(pk=1, username='applicant', first_name='測試')
+        reviewer = User(pk=2, username='reviewer', first_name='審核員')
+        pages = [
+            ('home', 'applications/home.html', {}, AnonymousUser()),
+            ('login', 'applications/login.html', {'form': LoginForm()}, AnonymousUser()),
+            ('register', 'applications/register.html', {'form': CustomUserCreationForm()}, AnonymousUser()),
+            ('create', 'applications/create.html', {'form': ApplicationForm()}, user),
+            ('status (無申請)', 'applications/status.html', {'application': None}, user),
+        ]
+        for status, _ in Application.STATUS_CHOICES:
+            application = Application(
+                pk=1, user=user, account_name='applicant01', phone_number='0912-345-678', address='台北市信義區信義路五段7號',
+                status=status, created_at=now, reviewed_at=now, reviewed_by=reviewer,
+                approved_at=now if status == 'APPROVED' else None,
+                rejection_reason='資料不完整' if status == 'REJECTED' else '',
+                additional_info_required='請補充身分證影本' if status == 'ADDITIONAL_REQUIRED' else '',
+            )
+            pages.append((f'status ({status})', 'applications/status.html', {'application': application}, user))
+            if status == 'APPROVED':
+                pages.append(('success', 'applications/success.html', {'application': application}, user))
+            if status == 'ADDITIONAL_REQUIRED':
+                pages.append(('update', 'applications/update.html', {'form': ApplicationUpdateForm(instance=application), 'application': application}, user))
+        return pages
@@ -0,0 +1,82 @@
+import re
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand
+
+from applications.benchmarking import summarize, time_calls
+from applications.validators import validate_application_record, validate_application_records
+
+
+def _legacy_validate(record):
+    """重構前 ApplicationForm 中逐次以字串樣式比對的驗證邏輯（作為效能基準）"""
+    errors = {}
+    try:
+        account_name = record['account_name']
+        if not re.match(r'^[a-zA-Z0-9][a-zA-Z0-9_-]*$', account_name):
+            raise ValidationError('帳號名稱只能包含英文字母、數字、底線、短橫線，且必須以字母或數字開頭')
+        if len(account_name) < 3:
+            raise ValidationError('帳號名稱至少需要3個字符')
+        if len(account_name) > 20:
+            raise ValidationError('帳號名稱不能超過20個字符')
+    except ValidationError as e:
+        errors['account_name'] = e.messages
+    try:
+        if not re.match(r'^09\d{8}$', re.sub(r'[\s\-()]', '', record['phone_number'])):
+            raise ValidationError('請輸入有效的台灣手機號碼格式，例如：0912-345-678')
+    except ValidationError as e:
+        errors['phone_number'] = e.messages
+    try:
+        address = record['address'].strip()
+        if len(address) < 10:
+            raise ValidationError('地址太短，請提供完整的聯絡地址')
+        if len(address) > 200:
+            raise ValidationError('地址過長，請簡化至200個字符以內')
+        if not any(keyword in address for keyword in ['市', '縣', '區', '鄉', '鎮', '路', '街', '巷', '號']):
+            raise ValidationError('請提供完整的地址資訊，包含縣市、區域、街道門牌')
+    except ValidationError as e:
+        errors['address'] = e.messages
+    return errors
+
+
+class Command(BaseCommand):
+    help = '比較重構前的驗證邏輯、逐筆驗證（與申請表單相同的路徑）與批次驗證申請資料時每筆的耗時'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--records',
+            type=int,
+            default=2000,
+            help='每次驗證的資料筆數 (預設: 2000)'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='每種驗證方式重複執行的次數 (預設: 20)'
+        )
+        parser.add_argument(
+            '--invalid-ratio',
+            type=float,
+            default=0.1,
+            help='不合規則的資料比例 (預設: 0.1)'
+        )
+
+    def handle(self, *args, **options):
+        count = options['records']
+        invalid_every = round(1 / options['invalid_ratio']) if options['invalid_ratio'] > 0 else 0
+        records = [
+            {'account_name': f'user_{i:05d}', 'phone_number': '0912-345-678', 'address': '台北市信義區信義路五段7號' if not invalid_every or i % invalid_every else '地址'}
+            for i in range(count)
+        ]
+
+        results = {
+            '重構前': summarize(time_calls(lambda: [_legacy_validate(record) for record in records], options['repeat'])),
+            '逐筆驗證': summarize(time_calls(lambda: [validate_application_record(record) for record in records], options['repeat'])),
+            '批次驗證': summarize(time_calls(lambda: list(validate_application_records(records)), options['repeat'])),
+        }
+
+        baseline = results['重構前']['p50_ms']
+        self.stdout.write(self.style.SUCCESS(f'驗證 {count} 筆資料的每筆耗時 (p50 / p95, 微秒)'))
+        for name, summary in results.items():
+            speedup = baseline / summary['p50_ms'] if summary['p50_ms'] else 0.0
+            self.stdout.write(f'  {name}: {summary["p50_ms"] * 1000 / count:.2f} / {summary["p95_ms"] * 1000 / count:.2f}（為重構前的 {speedup:.2f} 倍速）')
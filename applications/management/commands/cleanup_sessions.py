@@ -0,0 +1,35 @@
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = '分批刪除資料庫中已過期的 session（建議以 cron 等排程每日執行）'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='每批刪除的筆數，避免一次 DELETE 長時間鎖住 session 資料表 (預設: 5000)'
+        )
+
+    def handle(self, *args, **options):
+        engine = import_module(settings.SESSION_ENGINE)
+        if not hasattr(engine.SessionStore, 'get_model_class'):
+            # cache 等不使用資料庫的 session 會由快取的存活時間自行過期
+            self.stdout.write(f'{settings.SESSION_ENGINE} 不使用資料庫儲存 session，無需清理')
+            return
+
+        # cached_db 的快取項目與 session 同時過期，只需清理資料庫
+        model = engine.SessionStore.get_model_class()
+        now = timezone.now()
+        deleted = 0
+        while True:
+            keys = list(model.objects.filter(expire_date__lt=now).values_list('pk', flat=True)[:options['batch_size']])
+            if not keys:
+                break
+            deleted += model.objects.filter(pk__in=keys).delete()[0]
+        self.stdout.write(self.style.SUCCESS(f'已刪除 {deleted} 筆過期的 session'))
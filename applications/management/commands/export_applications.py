@@ -0,0 +1,72 @@
+import sys
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from applications.exports import DEFAULT_CHUNK_SIZE, stream_export
+from applications.models import Application
+
+
+class Command(BaseCommand):
+    help = '串流匯出申請資料（含申請人與審核人員）為 CSV 或 XLSX，記憶體用量不隨資料筆數增加'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'xlsx'],
+            default='csv',
+            help='匯出格式 (預設: csv)'
+        )
+        parser.add_argument(
+            '--status',
+            choices=[value for value, _ in Application.STATUS_CHOICES],
+            help='只匯出指定狀態的申請'
+        )
+        parser.add_argument('--since', type=str, help='只匯出此日期 (YYYY-MM-DD) 之後建立的申請')
+        parser.add_argument('--until', type=str, help='只匯出此日期 (YYYY-MM-DD) 之前建立的申請（含當日）')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f'每次自資料庫取回的筆數 (預設: {DEFAULT_CHUNK_SIZE})'
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            help='輸出檔案 (預設輸出至標準輸出)'
+        )
+
+    def handle(self, *args, **options):
+        queryset = Application.objects.order_by('created_at', 'pk')
+        if options['status']:
+            queryset = queryset.filter(status=options['status'])
+        if options['since']:
+            queryset = queryset.filter(created_at__date__gte=self._parse_date(options['since']))
+        if options['until']:
+            queryset = queryset.filter(created_at__date__lte=self._parse_date(options['until']))
+
+        started = time.perf_counter()
+        if options['output']:
+            with Path(options['output']).open('wb') as output:
+                size = self._write(queryset, options, output)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(self.style.SUCCESS(f'已匯出至 {options["output"]}（{size} 位元組，耗時 {elapsed:.2f} 秒）'))
+        else:
+            self._write(queryset, options, sys.stdout.buffer)
+
+    def _parse_date(self, value):
+        date = parse_date(value)
+        if date is None:
+            raise CommandError(f'無效的日期格式: {value}，請使用 YYYY-MM-DD')
+        return date
+
+    def _write(self, queryset, options, output):
+        """將匯出內容逐塊寫入輸出，回傳寫入的位元組數"""
+        size = 0
+        for chunk in stream_export(queryset, options['format'], chunk_size=options['chunk_size']):
+            output.write(chunk)
+            size += len(chunk)
+        output.flush()
+        return size
@@ -0,0 +1,193 @@
+import csv
+import json
+import time
+from itertools import islice
+from pathlib import Path
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+
+from applications.cache import invalidate_user_applications
+from applications.models import Application
+from applications.notifications import enqueue_status_notifications
+from applications.stats import record_created
+from applications.transitions import log_created
+from applications.validators import validate_application_records
+
+# 匯入檔案的欄位
+FIELDS = ['username', 'email', 'first_name', 'account_name', 'phone_number', 'address']
+
+
+class Command(BaseCommand):
+    help = '從 CSV 或 JSONL 檔案串流匯入紙本申請，以與申請表單相同的規則驗證並分批建立使用者與申請'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', type=str, help='要匯入的 CSV 或 JSONL 檔案')
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'jsonl'],
+            help='檔案格式 (預設依副檔名判斷)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='每批寫入的筆數 (預設: 1000)'
+        )
+        parser.add_argument(
+            '--errors-file',
+            type=str,
+            help='被拒絕的資料與原因輸出的 CSV 檔 (預設: <檔名>.errors.csv)'
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.exists():
+            raise CommandError(f'找不到檔案: {path}')
+        file_format = options['format'] or ('jsonl' if path.suffix in ('.jsonl', '.ndjson') else 'csv')
+        errors_path = Path(options['errors_file'] or f'{path}.errors.csv')
+
+        self.imported = self.rejected = 0
+        started = time.perf_counter()
+
+        with path.open(newline='', encoding='utf-8-sig') as source, errors_path.open('w', newline='', encoding='utf-8') as errors_file:
+            self.error_writer = csv.writer(errors_file)
+            self.error_writer.writerow(['line', 'reason', *FIELDS])
+
+            rows = self._read_csv(source) if file_format == 'csv' else self._read_jsonl(source)
+            while batch := list(islice(rows, options['batch_size'])):
+                self._import_batch(batch)
+
+        elapsed = time.perf_counter() - started
+        total = self.imported + self.rejected
+        rate = total / elapsed if elapsed else 0.0
+        self.stdout.write(self.style.SUCCESS(f'匯入完成：成功 {self.imported} 筆，拒絕 {self.rejected} 筆，耗時 {elapsed:.2f} 秒（{rate:.0f} 筆/秒）'))
+        if self.rejected:
+            self.stdout.write(self.style.WARNING(f'被拒絕的資料已寫入 {errors_path}'))
+
+    def _read_csv(self, source):
+        """逐列讀取 CSV，產生 (行號, 資料)"""
+        reader = csv.DictReader(source)
+        for record in reader:
+            yield reader.line_num, record
+
+    def _read_jsonl(self, source):
+        """逐行讀取 JSONL，產生 (行號, 資料)；無法解析的行以 None 表示"""
+        for line_no, line in enumerate(source, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                record = None
+            yield line_no, record if isinstance(record, dict) else None
+
+    def _reject(self, line_no, record, reason):
+        """將被拒絕的資料與原因寫入錯誤檔"""
+        self.rejected += 1
+        record = record or {}
+        self.error_writer.writerow([line_no, reason, *(record.get(field, '') for field in FIELDS)])
+
+    def _validate_batch(self, batch):
+        """驗證一批資料，回傳通過驗證的 [(行號, 原始資料, 清理後的資料)]"""
+        parseable = []
+        for line_no, record in batch:
+            if record is None:
+                self._reject(line_no, None, '無法解析的資料列')
+            else:
+                parseable.append((line_no, record))
+
+        valid = []
+        seen_usernames, seen_account_names = set(), set()
+        results = validate_application_records(record for _, record in parseable)
+        for (line_no, record), (cleaned, errors) in zip(parseable, results):
+            username = str(record.get('username') or '').strip()
+            email = str(record.get('email') or '').strip()
+            try:
+                if not username or len(username) > 150:
+                    raise ValidationError('使用者帳號需為1-150個字符')
+                User.username_validator(username)
+            except ValidationError as e:
+                errors['username'] = e.messages
+            if email:
+                try:
+                    validate_email(email)
+                except ValidationError as e:
+                    errors['email'] = e.messages
+
+            if errors:
+                self._reject(line_no, record, '; '.join(f'{field}: {" ".join(messages)}' for field, messages in errors.items()))
+            elif username in seen_usernames:
+                self._reject(line_no, record, '同一批次中使用者帳號重複')
+            elif cleaned['account_name'] in seen_account_names:
+                self._reject(line_no, record, '同一批次中帳號名稱重複')
+            else:
+                seen_usernames.add(username)
+                seen_account_names.add(cleaned['account_name'])
+                cleaned.update(username=username, email=email, first_name=str(record.get('first_name') or '').strip()[:150])
+                valid.append((line_no, record, cleaned))
+        return valid
+
+    def _import_batch(self, batch):
+        """驗證並在單一交易中寫入一批資料"""
+        valid = self._validate_batch(batch)
+        if not valid:
+            return
+
+        try:
+            with transaction.atomic():
+                inserted, conflicts = self._insert(valid)
+        except IntegrityError:
+            # 與其他寫入併發衝突時，改為逐筆寫入以找出衝突的資料
+            inserted, conflicts = [], []
+            for row in valid:
+                try:
+                    with transaction.atomic():
+                        row_inserted, row_conflicts = self._insert([row])
+                except IntegrityError:
+                    row_inserted, row_conflicts = [], [(row[0], row[1], '與既有資料衝突')]
+                inserted.extend(row_inserted)
+                conflicts.extend(row_conflicts)
+
+        self.imported += len(inserted)
+        for line_no, record, reason in conflicts:
+            self._reject(line_no, record, reason)
+
+    def _insert(self, valid):
+        """以 bulk_create 建立缺少的使用者與申請，回傳 (寫入的資料, [(行號, 原始資料, 衝突原因)])"""
+        usernames = [cleaned['username'] for _, _, cleaned in valid]
+        account_names = [cleaned['account_name'] for _, _, cleaned in valid]
+        users = dict(User.objects.filter(username__in=usernames).values_list('username', 'id'))
+        has_application = set(Application.objects.filter(user__username__in=usernames).values_list('user__username', flat=True))
+        taken_names = set(Application.objects.filter(account_name__in=account_names).values_list('account_name', flat=True))
+
+        rows, conflicts = [], []
+        for line_no, record, cleaned in valid:
+            if cleaned['username'] in has_application:
+                conflicts.append((line_no, record, '使用者已有申請'))
+            elif cleaned['account_name'] in taken_names:
+                conflicts.append((line_no, record, '此帳號名稱已被使用'))
+            else:
+                rows.append(cleaned)
+
+        # 匯入的使用者沒有可登入的密碼，需另行透過重設密碼流程啟用
+        new_users = User.objects.bulk_create([
+            User(username=cleaned['username'], email=cleaned['email'], first_name=cleaned['first_name'], password=make_password(None))
+            for cleaned in rows if cleaned['username'] not in users
+        ])
+        users.update((user.username, user.pk) for user in new_users)
+
+        applications = Application.objects.bulk_create([
+            Application(user_id=users[cleaned['username']], account_name=cleaned['account_name'], phone_number=cleaned['phone_number'], address=cleaned['address'])
+            for cleaned in rows
+        ])
+        # bulk_create 不會經過 Application.save() 與 post_save 信號，需自行寫入轉換記錄、更新審核統計、清除申請人的狀態快取並通知申請人
+        log_created(applications, note='紙本申請匯入')
+        record_created(applications)
+        invalidate_user_applications(users[cleaned['username']] for cleaned in rows)
+        enqueue_status_notifications((application.pk, application.status, application.status_changed_at) for application in applications)
+        return rows, conflicts
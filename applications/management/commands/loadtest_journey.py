@@ -0,0 +1,329 @@
+import json
+import random
+import re
+import subprocess
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from html.parser import HTMLParser
+from http.cookiejar import CookieJar
+from pathlib import Path
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode
+from urllib.request import HTTPCookieProcessor, HTTPRedirectHandler, Request, build_opener
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from applications.benchmarking import summarize
+
+PASSWORD = 'Journey-passw0rd!'
+# RequestMetricsMiddleware 在抽樣的請求附上的 Server-Timing（伺服器需設定 DJANGO_METRICS_SAMPLE_RATE=1 與 DJANGO_METRICS_SERVER_TIMING=1）
+SERVER_TIMING_DB = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries"')
+CHANGE_LINK = re.compile(r'/admin/applications/application/(\d+)/change/')
+
+
+class _NoRedirect(HTTPRedirectHandler):
+    """不自動跟隨轉址，每個請求各自計時"""
+
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class _FormFields(HTMLParser):
+    """取出指定 id 的表單目前的欄位值（input、select 選取的選項、textarea）"""
+
+    def __init__(self, form_id):
+        super().__init__()
+        self.form_id = form_id
+        self.fields = {}
+        self._in_form = False
+        self._select = None
+        self._textarea = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'form':
+            self._in_form = attrs.get('id') == self.form_id
+            return
+        if not self._in_form:
+            return
+        name = attrs.get('name')
+        if tag == 'input' and name:
+            kind = attrs.get('type', 'text')
+            if kind in ('submit', 'button', 'file', 'image') or kind in ('checkbox', 'radio') and 'checked' not in attrs:
+                return
+            self.fields[name] = attrs.get('value') or ('on' if kind == 'checkbox' else '')
+        elif tag == 'select' and name:
+            self._select = name
+            self.fields.setdefault(name, '')
+        elif tag == 'option' and self._select and 'selected' in attrs:
+            self.fields[self._select] = attrs.get('value') or ''
+        elif tag == 'textarea' and name:
+            self._textarea = name
+            self.fields[name] = ''
+
+    def handle_endtag(self, tag):
+        if tag == 'form':
+            self._in_form = False
+        elif tag == 'select':
+            self._select = None
+        elif tag == 'textarea':
+            self._textarea = None
+
+    def handle_data(self, data):
+        if self._textarea:
+            self.fields[self._textarea] += data
+
+
+class Recorder:
+    """依端點累計延遲、狀態碼與伺服器回報的查詢數"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.durations = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.queries = defaultdict(list)
+        self.db_ms = defaultdict(list)
+
+    def add(self, endpoint, seconds, status, server_timing):
+        with self._lock:
+            self.durations[endpoint].append(seconds)
+            if not 200 <= status < 400:
+                self.errors[endpoint] += 1
+            match = SERVER_TIMING_DB.search(server_timing or '')
+            if match:
+                self.db_ms[endpoint].append(float(match.group(1)))
+                self.queries[endpoint].append(int(match.group(2)))
+
+    def summary(self, elapsed):
+        endpoints = {}
+        for endpoint, durations in sorted(self.durations.items()):
+            result = summarize(durations)
+            queries = self.queries[endpoint]
+            result.update(
+                rps=len(durations) / elapsed if elapsed else 0.0,
+                errors=self.errors[endpoint],
+                queries_per_request=sum(queries) / len(queries) if queries else None,
+                db_ms_per_request=sum(self.db_ms[endpoint]) / len(queries) if queries else None,
+            )
+            endpoints[endpoint] = result
+        return endpoints
+
+
+class Browser:
+    """保存 cookie 的 HTTP 用戶端，每個請求都記錄到 Recorder"""
+
+    def __init__(self, base_url, recorder, timeout):
+        self.base_url = base_url.rstrip('/')
+        self.recorder = recorder
+        self.timeout = timeout
+        self.cookies = CookieJar()
+        self.opener = build_opener(HTTPCookieProcessor(self.cookies), _NoRedirect)
+
+    def csrf_token(self):
+        return next((cookie.value for cookie in self.cookies if cookie.name == 'csrftoken'), '')
+
+    def get(self, endpoint, path, headers=None):
+        return self._request(f'GET {endpoint}', Request(self.base_url + path, headers=headers or {}))
+
+    def post(self, endpoint, path, data):
+        body = urlencode({**data, 'csrfmiddlewaretoken': self.csrf_token()}).encode()
+        # CSRF 檢查在 HTTPS 下要求同源的 Referer
+        headers = {'Content-Type': 'application/x-www-form-urlencoded', 'Referer': self.base_url + path}
+        return self._request(f'POST {endpoint}', Request(self.base_url + path, data=body, headers=headers, method='POST'))
+
+    def _request(self, endpoint, request):
+        started = time.perf_counter()
+        try:
+            with self.opener.open(request, timeout=self.timeout) as response:
+                status, headers, body = response.status, response.headers, response.read()
+        except HTTPError as error:
+            # 轉址與 304 也以 HTTPError 回報
+            status, headers, body = error.code, error.headers, error.read()
+        except (URLError, TimeoutError, ConnectionError):
+            status, headers, body = 0, {}, b''
+        self.recorder.add(endpoint, time.perf_counter() - started, status, headers.get('Server-Timing'))
+        return status, headers, body.decode('utf-8', 'replace')
+
+
+class Command(BaseCommand):
+    help = ('對執行中的伺服器（runserver、WSGI 或 ASGI）模擬申請人完整流程（註冊 → 登入 → 申請 → 輪詢狀態 → 補件）'
+            '與審核人員透過管理後台審核，輸出各端點的吞吐量、p50/p95/p99 延遲與每個請求的查詢數，並存成 JSON 供不同 commit 比較')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000', help='伺服器網址 (預設: http://127.0.0.1:8000)')
+        parser.add_argument('--applicants', type=int, default=50, help='模擬的申請人數 (預設: 50)')
+        parser.add_argument('--concurrency', type=int, default=10, help='同時進行流程的申請人數 (預設: 10)')
+        parser.add_argument('--reviewers', type=int, default=2, help='審核人員數 (預設: 2)')
+        parser.add_argument('--additional-ratio', type=float, default=0.3, help='首次審核要求補件的比例 (預設: 0.3)')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='申請人輪詢狀態與審核人員認領的間隔秒數 (預設: 1)')
+        parser.add_argument('--journey-timeout', type=float, default=120.0, help='單一申請人流程的最長秒數 (預設: 120)')
+        parser.add_argument('--request-timeout', type=float, default=30.0, help='單一請求的逾時秒數 (預設: 30)')
+        parser.add_argument('--seed', type=int, default=0, help='審核決定的亂數種子 (預設: 0)')
+        parser.add_argument('--output', help='結果 JSON 的路徑 (預設: loadtest-results/journey-<commit>-<時間>.json)')
+        parser.add_argument('--compare', help='與先前的結果 JSON 比較 p95 延遲、吞吐量與查詢數')
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.run_id = uuid.uuid4().hex[:6]
+        self.stop = threading.Event()
+        self.recorder = Recorder()
+        # 已要求補件的申請主鍵：申請人補件後重新送審時 additional_info_required 已清空，以此判斷直接通過
+        self.returned = set()
+        self.returned_lock = threading.Lock()
+        # 審核人員直接寫入資料庫，伺服器需使用與此指令相同的資料庫設定
+        reviewers = [self._reviewer_account(i) for i in range(options['reviewers'])]
+        self.stdout.write(f'對 {options["base_url"]} 模擬 {options["applicants"]} 位申請人（同時 {options["concurrency"]} 位）與 {len(reviewers)} 位審核人員')
+
+        started = time.perf_counter()
+        reviewer_threads = [threading.Thread(target=self._review, args=(username, random.Random(options['seed'] + i)), daemon=True) for i, username in enumerate(reviewers)]
+        for thread in reviewer_threads:
+            thread.start()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            outcomes = list(executor.map(self._apply, range(options['applicants'])))
+        self.stop.set()
+        for thread in reviewer_threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        result = {
+            'meta': {
+                'commit': self._commit(),
+                'started_at': datetime.now(timezone.utc).isoformat(),
+                'base_url': options['base_url'],
+                'applicants': options['applicants'],
+                'concurrency': options['concurrency'],
+                'reviewers': options['reviewers'],
+                'additional_ratio': options['additional_ratio'],
+                'poll_interval': options['poll_interval'],
+            },
+            'elapsed_s': elapsed,
+            'journeys': {outcome: outcomes.count(outcome) for outcome in sorted(set(outcomes))},
+            'endpoints': self.recorder.summary(elapsed),
+        }
+        self._print(result)
+        self._save(result)
+        if options['compare']:
+            self._compare(result, options['compare'])
+
+    def _reviewer_account(self, index):
+        username = f'loadtest_reviewer_{index}'
+        user, _ = User.objects.get_or_create(username=username, defaults={'is_staff': True, 'is_superuser': True})
+        user.set_password(PASSWORD)
+        user.save()
+        return username
+
+    def _apply(self, index):
+        """申請人流程，回傳結果：approved、rejected、failed 或 timeout"""
+        options = self.options
+        browser = Browser(options['base_url'], self.recorder, options['request_timeout'])
+        username = f'lt{self.run_id}{index}'
+        form = {'account_name': username, 'phone_number': '0912-345-678', 'address': '台北市信義區信義路五段7號'}
+
+        browser.get('user_register', '/accounts/register/')
+        status, _, _ = browser.post('user_register', '/accounts/register/', {
+            'username': username, 'first_name': '壓測', 'email': f'{username}@example.com', 'password1': PASSWORD, 'password2': PASSWORD,
+        })
+        browser.get('user_login', '/accounts/login/')
+        login_status, _, _ = browser.post('user_login', '/accounts/login/', {'username': username, 'password': PASSWORD})
+        browser.get('application_create', '/application/create/')
+        create_status, _, _ = browser.post('application_create', '/application/create/', form)
+        if (status, login_status, create_status) != (302, 302, 302):
+            return 'failed'
+
+        etag, updated = None, False
+        deadline = time.monotonic() + options['journey_timeout']
+        while time.monotonic() < deadline:
+            status, headers, _ = browser.get('application_status', '/application/status/', {'If-None-Match': etag} if etag else None)
+            if status == 200:
+                etag = headers.get('ETag')
+                _, _, body = browser.get('application_status_api', '/api/application/status/')
+                data = json.loads(body or '{}')
+                if data.get('status') == 'ADDITIONAL_REQUIRED' and not updated:
+                    path = f'/application/update/{data["id"]}/'
+                    browser.get('application_update', path)
+                    browser.post('application_update', path, {**form, 'address': '台北市信義區信義路五段8號'})
+                    updated = True
+                elif data.get('status') == 'APPROVED':
+                    browser.get('application_success', f'/application/success/{data["id"]}/')
+                    return 'approved'
+                elif data.get('status') == 'REJECTED':
+                    return 'rejected'
+            time.sleep(options['poll_interval'])
+        return 'timeout'
+
+    def _review(self, username, rng):
+        """審核人員：認領等待最久的申請，逐筆開啟修改頁面後通過或要求補件，直到所有申請人結束"""
+        options = self.options
+        browser = Browser(options['base_url'], self.recorder, options['request_timeout'])
+        browser.get('admin login', '/admin/login/')
+        browser.post('admin login', '/admin/login/', {'username': username, 'password': PASSWORD, 'next': '/admin/'})
+        claims = '/admin/applications/application/claims/'
+
+        while not self.stop.is_set():
+            browser.get('admin claims', claims)
+            browser.post('admin claims', claims, {'count': 5})
+            _, _, body = browser.get('admin claims', claims)
+            pks = list(dict.fromkeys(CHANGE_LINK.findall(body)))
+            if not pks:
+                browser.get('admin changelist', '/admin/applications/application/')
+                self.stop.wait(options['poll_interval'])
+                continue
+            for pk in pks:
+                path = f'/admin/applications/application/{pk}/change/'
+                _, _, body = browser.get('admin change', path)
+                parser = _FormFields('application_form')
+                parser.feed(body)
+                fields = parser.fields
+                # 已要求過補件（申請人補件後重新送審）的申請直接通過，申請人只會補件一次
+                with self.returned_lock:
+                    resubmitted = pk in self.returned
+                    if not resubmitted and rng.random() < options['additional_ratio']:
+                        self.returned.add(pk)
+                        fields.update(status='ADDITIONAL_REQUIRED', additional_info_required='請補充身分證影本')
+                    else:
+                        fields['status'] = 'APPROVED'
+                browser.post('admin change', path, {**fields, '_save': '儲存'})
+
+    def _commit(self):
+        try:
+            return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return 'unknown'
+
+    def _print(self, result):
+        self.stdout.write(self.style.SUCCESS(f'{result["elapsed_s"]:.1f} 秒，流程結果：{result["journeys"]}'))
+        for endpoint, stats in result['endpoints'].items():
+            queries = f'{stats["queries_per_request"]:.1f}' if stats['queries_per_request'] is not None else '-'
+            self.stdout.write(f'  {endpoint}: {stats["count"]} 次, {stats["rps"]:.1f} req/s, p50 {stats["p50_ms"]:.1f} ms, '
+                              f'p95 {stats["p95_ms"]:.1f} ms, p99 {stats["p99_ms"]:.1f} ms, 查詢 {queries}/請求, 錯誤 {stats["errors"]}')
+        if not any(stats['queries_per_request'] is not None for stats in result['endpoints'].values()):
+            self.stdout.write(self.style.WARNING('伺服器沒有回報 Server-Timing，請以 DJANGO_METRICS_SAMPLE_RATE=1 DJANGO_METRICS_SERVER_TIMING=1 啟動伺服器以取得查詢數'))
+
+    def _save(self, result):
+        output = Path(self.options['output'] or f'loadtest-results/journey-{result["meta"]["commit"]}-{datetime.now():%Y%m%d-%H%M%S}.json')
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(result, ensure_ascii=False, indent=2))
+        self.stdout.write(f'結果已存到 {output}')
+
+    def _compare(self, result, path):
+        try:
+            previous = json.loads(Path(path).read_text())
+        except (OSError, ValueError) as error:
+            raise CommandError(f'無法讀取比較用的結果 {path}：{error}')
+        self.stdout.write(self.style.SUCCESS(f'與 {previous["meta"]["commit"]} 比較（p95 延遲 / 吞吐量 / 查詢數）'))
+        for endpoint, stats in result['endpoints'].items():
+            before = previous['endpoints'].get(endpoint)
+            if before is None:
+                self.stdout.write(f'  {endpoint}: 新端點')
+                continue
+            p95 = (stats['p95_ms'] / before['p95_ms'] - 1) if before['p95_ms'] else 0.0
+            rps = (stats['rps'] / before['rps'] - 1) if before['rps'] else 0.0
+            queries = ''
+            if stats['queries_per_request'] is not None and before.get('queries_per_request') is not None:
+                queries = f', 查詢 {before["queries_per_request"]:.1f} → {stats["queries_per_request"]:.1f}'
+            self.stdout.write(f'  {endpoint}: p95 {p95:+.0%}, req/s {rps:+.0%}{queries}')
@@ -0,0 +1,86 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+
+from applications.benchmarking import summarize
+from applications.ratelimit import RATE_LIMIT_CACHE_ALIAS
+
+PASSWORD = 'Loadtest-passw0rd'
+
+
+class Command(BaseCommand):
+    help = '在暫存資料庫中模擬撞庫攻擊，比較啟用與停用登入限流時處理攻擊請求的 CPU 時間，以及正常使用者的登入延遲'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--attempts',
+            type=int,
+            default=500,
+            help='攻擊者送出的登入嘗試次數 (預設: 500)'
+        )
+        parser.add_argument(
+            '--attackers',
+            type=int,
+            default=5,
+            help='攻擊來源 IP 數量 (預設: 5)'
+        )
+        parser.add_argument(
+            '--logins',
+            type=int,
+            default=20,
+            help='攻擊期間正常使用者的登入次數 (預設: 20)'
+        )
+
+    def handle(self, *args, **options):
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            User.objects.create_user(username='victim', password=PASSWORD)
+            User.objects.create_user(username='customer', password=PASSWORD)
+            # 測試用戶端以 testserver 作為 Host
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+                with override_settings(APPLICATION_LOGIN_RATE_LIMITS={}):
+                    baseline = self._run(options['attempts'], options['attackers'], options['logins'])
+                limited = self._run(options['attempts'], options['attackers'], options['logins'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{options["attackers"]} 個 IP 送出 {options["attempts"]} 次錯誤密碼登入，期間正常使用者登入 {options["logins"]} 次（使用 {settings.PASSWORD_HASHERS[0]}）'
+        ))
+        for label, result in (('停用限流', baseline), ('啟用限流', limited)):
+            self.stdout.write(f'  {label}: 攻擊請求 CPU {result["cpu_s"]:.2f} s（每次 {result["cpu_ms"]:.2f} ms），429 回應 {result["rejected"]} 次，'
+                              f'正常登入 p50 {result["p50_ms"]:.1f} ms，成功 {result["succeeded"]} 次')
+        if baseline['cpu_s']:
+            self.stdout.write(f'  限流節省攻擊請求 {1 - limited["cpu_s"] / baseline["cpu_s"]:.0%} 的 CPU 時間')
+
+    def _run(self, attempts, attackers, logins):
+        """輪流送出攻擊請求與正常使用者登入，分別計算攻擊請求的行程 CPU 時間與正常登入的延遲"""
+        caches[RATE_LIMIT_CACHE_ALIAS].clear()
+        client = Client()
+        every = max(1, attempts // max(1, logins))
+        cpu, rejected, durations, succeeded = 0.0, 0, [], 0
+
+        for i in range(attempts):
+            # 攻擊者輪流以不同帳號嘗試，同時鎖定 victim 帳號
+            username = 'victim' if i % 2 else f'guess_{i}'
+            started = time.process_time()
+            response = client.post('/accounts/login/', {'username': username, 'password': f'wrong-{i}'}, REMOTE_ADDR=f'203.0.113.{i % attackers}')
+            cpu += time.process_time() - started
+            rejected += response.status_code == 429
+
+            if i % every == 0 and len(durations) < logins:
+                customer = Client()
+                started = time.perf_counter()
+                response = customer.post('/accounts/login/', {'username': 'customer', 'password': PASSWORD}, REMOTE_ADDR='198.51.100.1')
+                durations.append(time.perf_counter() - started)
+                succeeded += response.status_code == 302
+
+        result = summarize(durations)
+        result.update(cpu_s=cpu, cpu_ms=cpu / attempts * 1000 if attempts else 0.0, rejected=rejected, succeeded=succeeded)
+        return result
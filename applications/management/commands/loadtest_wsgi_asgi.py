@@ -0,0 +1,127 @@
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import AsyncClient, Client, override_settings
+
+from applications.benchmarking import summarize
+from applications.models import Application
+
+
+class Command(BaseCommand):
+    help = '在暫存資料庫中以同步 (WSGI) 與非同步 (ASGI) 處理器壓測申請人頁面，比較每秒請求數與延遲'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            type=str,
+            default='/application/status/',
+            help='壓測的路徑 (預設: /application/status/)'
+        )
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=200,
+            help='登入的申請人數量 (預設: 200)'
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=2000,
+            help='每種部署送出的請求總數 (預設: 2000)'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=50,
+            help='同時進行的請求數 (預設: 50)'
+        )
+
+    def handle(self, *args, **options):
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            users = self._seed(options['users'])
+            # 測試用戶端以 testserver 作為 Host
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+                wsgi = self._run_wsgi(users, options['path'], options['requests'], options['concurrency'])
+                with override_settings(ROOT_URLCONF='securities_system.asgi_urls'):
+                    asgi = asyncio.run(self._run_asgi(users, options['path'], options['requests'], options['concurrency']))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        self.stdout.write(self.style.SUCCESS(f'{options["path"]}（同時 {options["concurrency"]} 個請求）'))
+        for label, result in (('WSGI', wsgi), ('ASGI', asgi)):
+            self.stdout.write(f'  {label}: {result["rps"]:.1f} req/s, p50 {result["p50_ms"]:.2f} ms, '
+                              f'p99 {result["p99_ms"]:.2f} ms, 非 200/302 回應 {result["errors"]} 個')
+
+    def _seed(self, count):
+        """建立登入用的申請人與其申請"""
+        users = User.objects.bulk_create([User(username=f'load_{i}', email=f'load_{i}@example.com', password='!') for i in range(count)])
+        Application.objects.bulk_create([
+            Application(user=user, account_name=f'load_{i}', phone_number='0912-345-678', address='台北市信義區信義路五段7號') for i, user in enumerate(users)
+        ])
+        return users
+
+    def _run_wsgi(self, users, path, total, concurrency):
+        """以執行緒池模擬 WSGI 伺服器的工作執行緒"""
+        # 先在主執行緒登入，避免壓測期間多個執行緒同時寫入 session 資料表
+        logged_in = queue.SimpleQueue()
+        for i in range(concurrency):
+            client = Client()
+            client.force_login(users[i % len(users)])
+            logged_in.put(client)
+        local = threading.local()
+        durations, errors = [], []
+
+        def request(i):
+            client = getattr(local, 'client', None)
+            if client is None:
+                client = local.client = logged_in.get_nowait()
+            started = time.perf_counter()
+            response = client.get(path)
+            durations.append(time.perf_counter() - started)
+            if response.status_code not in (200, 302):
+                errors.append(response.status_code)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(request, range(total)))
+        return self._result(durations, errors, time.perf_counter() - started)
+
+    async def _run_asgi(self, users, path, total, concurrency):
+        """以事件迴圈中的並行請求模擬 ASGI 伺服器"""
+        clients = []
+        for i in range(concurrency):
+            client = AsyncClient()
+            await client.aforce_login(users[i % len(users)])
+            clients.append(client)
+        durations, errors = [], []
+        pending = asyncio.Queue()
+        for i in range(total):
+            pending.put_nowait(i)
+
+        async def worker(client):
+            while not pending.empty():
+                pending.get_nowait()
+                started = time.perf_counter()
+                response = await client.get(path)
+                durations.append(time.perf_counter() - started)
+                if response.status_code not in (200, 302):
+                    errors.append(response.status_code)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for client in clients))
+        return self._result(durations, errors, time.perf_counter() - started)
+
+    def _result(self, durations, errors, elapsed):
+        result = summarize(durations)
+        result['rps'] = len(durations) / elapsed if elapsed else 0.0
+        result['errors'] = len(errors)
+        return result
@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import override_settings
+
+from applications.querycount import QueryCountScenario
+
+
+class Command(BaseCommand):
+    help = '在暫存資料庫中以不同申請數請求各申請人頁面與管理頁面，列出查詢數隨資料量增加的頁面與最常執行的 SQL'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            type=int,
+            nargs='+',
+            default=[1, 100, 10000],
+            help='量測的申請數 (預設: 1 100 10000)'
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=15,
+            help='列出的 SQL 指紋數量 (預設: 15)'
+        )
+
+    def handle(self, *args, **options):
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            # 測試用戶端以 testserver 作為 Host
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+                profile = QueryCountScenario().measure(options['sizes'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        self.stdout.write(profile.report(options['top']))
+        failed = {page: statuses for page, statuses in profile.statuses.items() if any(status != 200 for status in statuses.values())}
+        if failed:
+            self.stdout.write(self.style.WARNING(f'回應不是 200 的頁面：{failed}'))
+        if profile.growing_pages():
+            self.stdout.write(self.style.ERROR(f'查詢數隨資料量增加：{", ".join(profile.growing_pages())}'))
+        else:
+            self.stdout.write(self.style.SUCCESS('所有頁面的查詢數都不隨資料量增加'))
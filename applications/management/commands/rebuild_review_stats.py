@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from applications.stats import rebuild_review_stats
+
+
+class Command(BaseCommand):
+    help = '依目前的申請資料重新計算審核佇列統計（直接修改資料庫或統計出現偏差時執行）'
+
+    def handle(self, *args, **options):
+        rows = rebuild_review_stats()
+        self.stdout.write(self.style.SUCCESS(f'審核統計已重建，共 {rows} 筆每日統計'))
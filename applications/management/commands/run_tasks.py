@@ -0,0 +1,98 @@
+import signal
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from applications.tasks import claim_tasks, purge_finished_tasks, run_task, worker_id
+
+# 清除已完成工作的間隔秒數
+PURGE_INTERVAL_SECONDS = 60 * 60
+
+
+class Command(BaseCommand):
+    help = '執行背景工作佇列中的工作（申請狀態通知等），以執行緒池平行執行，失敗的工作依退避時間重試'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=4,
+            help='同時執行工作的執行緒數，1 表示在主執行緒中依序執行 (預設: 4)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='每次自佇列取出的工作數 (預設: 與執行緒數相同)'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='佇列沒有工作時再次檢查的間隔秒數 (預設: 1)'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='執行完目前可執行的工作後結束（搭配排程使用）'
+        )
+        parser.add_argument(
+            '--purge-after-days',
+            type=int,
+            default=7,
+            help='刪除完成超過此天數的已完成工作，0 表示不刪除 (預設: 7)'
+        )
+
+    def handle(self, *args, **options):
+        threads = max(1, options['threads'])
+        batch_size = options['batch_size'] or threads
+        worker = worker_id()
+        self.stopping = False
+        # 收到 SIGTERM 時完成目前這批工作後結束，不會留下執行中的工作等待租約到期
+        previous_handler = signal.signal(signal.SIGTERM, self._stop)
+
+        self.stdout.write(f'執行程序 {worker} 開始執行背景工作（{threads} 個執行緒）')
+        totals = Counter()
+        last_purge = 0.0
+        executor = ThreadPoolExecutor(max_workers=threads) if threads > 1 else None
+        try:
+            while not self.stopping:
+                if options['purge_after_days'] and time.monotonic() - last_purge > PURGE_INTERVAL_SECONDS:
+                    purged = purge_finished_tasks(timedelta(days=options['purge_after_days']))
+                    last_purge = time.monotonic()
+                    if purged:
+                        self.stdout.write(f'已刪除 {purged} 筆已完成的工作')
+
+                tasks = claim_tasks(worker, batch_size)
+                if not tasks:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+                    continue
+
+                results = executor.map(self._run, tasks) if executor else map(run_task, tasks)
+                batch = Counter(results)
+                totals.update(batch)
+                if options['verbosity'] > 1:
+                    self.stdout.write(f'  完成 {batch["SUCCEEDED"]} 筆，稍後重試 {batch["QUEUED"]} 筆，失敗 {batch["FAILED"]} 筆')
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if executor:
+                executor.shutdown(wait=True)
+            signal.signal(signal.SIGTERM, previous_handler)
+
+        self.stdout.write(self.style.SUCCESS(f'結束：完成 {totals["SUCCEEDED"]} 筆，稍後重試 {totals["QUEUED"]} 筆，失敗 {totals["FAILED"]} 筆'))
+
+    def _stop(self, signum, frame):
+        self.stopping = True
+
+    def _run(self, task):
+        """在執行緒池中執行工作，結束後關閉逾時或發生錯誤的資料庫連線（每個執行緒各有一條連線）"""
+        try:
+            return run_task(task)
+        finally:
+            close_old_connections()
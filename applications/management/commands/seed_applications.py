@@ -0,0 +1,288 @@
+import math
+import multiprocessing
+import os
+import random
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import timedelta
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+from django.utils import timezone
+
+from applications.models import Application, ApplicationTransition
+from applications.stats import apply_review_stats, created_deltas
+from applications.validators import validate_account_name_format
+
+DEFAULT_PASSWORD = 'Seed-passw0rd'
+DEFAULT_STATUS_MIX = 'PENDING=15,APPROVED=65,REJECTED=10,ADDITIONAL_REQUIRED=10'
+
+SURNAMES = '陳林黃張李王吳劉蔡楊許鄭謝洪郭邱曾廖賴徐周葉蘇莊呂江何蕭羅高潘簡朱鍾彭游詹胡施沈余盧梁趙顏柯翁魏孫戴范方宋鄧'
+GIVEN_NAME_CHARS = '志明俊傑建宏家豪冠宇承恩宗翰彥廷柏翰淑芬美玲雅婷怡君佳穎詩涵宜庭欣怡思妤子晴品妍'
+# 縣市、區域與郵遞區號
+DISTRICTS = [
+    ('台北市', '信義區', '110'), ('台北市', '大安區', '106'), ('台北市', '中山區', '104'), ('台北市', '內湖區', '114'),
+    ('新北市', '板橋區', '220'), ('新北市', '新店區', '231'), ('新北市', '三重區', '241'), ('新北市', '淡水區', '251'),
+    ('桃園市', '桃園區', '330'), ('桃園市', '中壢區', '320'), ('台中市', '西屯區', '407'), ('台中市', '北屯區', '406'),
+    ('台南市', '東區', '701'), ('台南市', '永康區', '710'), ('高雄市', '苓雅區', '802'), ('高雄市', '左營區', '813'),
+    ('新竹市', '東區', '300'), ('新竹縣', '竹北市', '302'), ('彰化縣', '彰化市', '500'), ('宜蘭縣', '羅東鎮', '265'),
+]
+ROADS = ['中山路', '中正路', '民生路', '民權路', '民族路', '復興路', '和平路', '光復路', '建國路', '成功路', '中華路', '文化路', '自由路', '忠孝東路', '信義路', '仁愛路']
+SECTIONS = ['', '', '一段', '二段', '三段', '四段', '五段']
+MOBILE_PREFIXES = ['0910', '0912', '0918', '0919', '0921', '0928', '0932', '0933', '0937', '0952', '0955', '0963', '0972', '0975', '0978', '0988']
+REJECTION_REASONS = ['身分證明文件與申請資料不符', '聯絡電話無法接通', '未通過徵信審查', '重複申請']
+ADDITIONAL_INFO = ['請補充身分證正反面影本', '請補充第二證件影本', '請確認通訊地址是否正確', '請補充銀行存摺封面影本']
+# 自申請到審核耗時的對數常態分佈：中位數約 24 小時，少數會拖到數週
+REVIEW_HOURS_MEDIAN = 24
+REVIEW_HOURS_SIGMA = 1.2
+
+
+def parse_status_mix(value):
+    """將 'PENDING=15,APPROVED=65,...' 解析為 {狀態: 權重}"""
+    statuses = dict(Application.STATUS_CHOICES)
+    mix = {}
+    for item in value.split(','):
+        status, _, weight = item.partition('=')
+        status = status.strip().upper()
+        if status not in statuses:
+            raise ValueError(f'不支援的申請狀態：{status}')
+        mix[status] = float(weight)
+    if sum(mix.values()) <= 0:
+        raise ValueError('狀態權重總和必須大於 0')
+    return mix
+
+
+def random_phone_number(rng):
+    """台灣手機號碼，混合常見的書寫方式"""
+    prefix, rest = rng.choice(MOBILE_PREFIXES), f'{rng.randrange(1_000_000):06d}'
+    return rng.choice([f'{prefix}-{rest[:3]}-{rest[3:]}', f'{prefix}{rest}', f'{prefix} {rest[:3]} {rest[3:]}'])
+
+
+def random_address(rng):
+    """包含郵遞區號、縣市、區域與街道門牌的地址"""
+    city, district, postal_code = rng.choice(DISTRICTS)
+    lane = f'{rng.randint(1, 300)}巷' if rng.random() < 0.3 else ''
+    floor = f'{rng.randint(2, 20)}樓' if rng.random() < 0.5 else ''
+    return f'{postal_code}{city}{district}{rng.choice(ROADS)}{rng.choice(SECTIONS)}{lane}{rng.randint(1, 400)}號{floor}'
+
+
+def random_created_at(rng, now, days):
+    """申請時間：越接近現在越多（模擬申請量成長），並集中在白天"""
+    day = int(days * (1 - math.sqrt(rng.random())))
+    hour = min(23, max(0, int(rng.gauss(14, 4))))
+    moment = timezone.localtime(now - timedelta(days=day)).replace(hour=hour, minute=rng.randrange(60), second=rng.randrange(60), microsecond=rng.randrange(1_000_000))
+    return min(moment, now)
+
+
+@contextmanager
+def _explicit_timestamps():
+    """暫時關閉 created_at / updated_at 的自動設定，讓 bulk_create 寫入產生的時間"""
+    fields = [Application._meta.get_field('created_at'), Application._meta.get_field('updated_at')]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def _init_worker():
+    """子程序初始化：spawn 啟動的程序需重新載入 Django，fork 的程序沿用父程序已關閉連線後的狀態"""
+    if not apps.ready:
+        django.setup()
+
+
+def seed_batch(job):
+    """產生並寫入 [start, end) 範圍的使用者與申請，回傳 (筆數, status_deltas, daily_deltas)
+
+    每批使用以 seed 與起始編號決定的亂數，同樣的參數不論分給幾個程序都會產生相同的資料。
+    """
+    start, end, options = job
+    rng = random.Random(f'{options["seed"]}:{start}')
+    prefix, now = options['prefix'], options['now']
+    statuses, weights = zip(*options['status_mix'].items())
+    reviewer_ids = options['reviewer_ids']
+    review_mu = math.log(REVIEW_HOURS_MEDIAN)
+
+    users, applications = [], []
+    for i in range(start, end):
+        username = f'{prefix}_{i}'
+        joined_at = random_created_at(rng, now, options['days'])
+        users.append(User(username=username, email=f'{username}@example.com', password=options['password'],
+                          first_name=rng.choice(SURNAMES) + ''.join(rng.sample(GIVEN_NAME_CHARS, 2)), date_joined=joined_at))
+
+        created_at = min(now, joined_at + timedelta(minutes=rng.expovariate(1 / 30)))
+        status = rng.choices(statuses, weights)[0]
+        reviewed_at = None
+        if status != 'PENDING':
+            reviewed_at = created_at + timedelta(hours=rng.lognormvariate(review_mu, REVIEW_HOURS_SIGMA))
+            if reviewed_at > now:
+                # 審核時間落在未來的申請仍在審核中，最近的申請因此以審核中居多
+                status, reviewed_at = 'PENDING', None
+        applications.append(Application(
+            account_name=username,
+            phone_number=random_phone_number(rng),
+            address=random_address(rng),
+            status=status,
+            created_at=created_at,
+            updated_at=reviewed_at or created_at,
+            status_changed_at=reviewed_at or created_at,
+            reviewed_at=reviewed_at,
+            first_reviewed_at=reviewed_at,
+            reviewed_by_id=rng.choice(reviewer_ids) if reviewed_at and reviewer_ids else None,
+            approved_at=reviewed_at if status == 'APPROVED' else None,
+            rejection_reason=rng.choice(REJECTION_REASONS) if status == 'REJECTED' else '',
+            additional_info_required=rng.choice(ADDITIONAL_INFO) if status == 'ADDITIONAL_REQUIRED' else '',
+        ))
+
+    with transaction.atomic(), _explicit_timestamps():
+        users = User.objects.bulk_create(users)
+        for user, application in zip(users, applications):
+            application.user_id = user.pk
+        applications = Application.objects.bulk_create(applications)
+        if options['transitions']:
+            # bulk_create 不會經過 Application.save()，需自行寫入建立與審核的轉換記錄
+            transitions = []
+            for application in applications:
+                identity = {'application_id': application.pk, 'application_number': application.pk, 'account_name': application.account_name}
+                transitions.append(ApplicationTransition(**identity, from_status='', to_status='PENDING', created_at=application.created_at))
+                if application.reviewed_at:
+                    transitions.append(ApplicationTransition(
+                        **identity, from_status='PENDING', to_status=application.status,
+                        actor_id=application.reviewed_by_id, created_at=application.reviewed_at,
+                        previous_status_duration=application.reviewed_at - application.created_at,
+                    ))
+            ApplicationTransition.objects.bulk_create(transitions)
+    return (len(applications), *created_deltas(applications))
+
+
+class Command(BaseCommand):
+    help = '產生大量符合申請表單規則的使用者與申請（狀態比例、申請與審核時間分佈接近實際），供效能測試使用'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=100_000,
+            help='產生的使用者與申請筆數 (預設: 100000)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='每批以 bulk_create 寫入的筆數，每批為一個交易 (預設: 5000)'
+        )
+        parser.add_argument(
+            '--processes',
+            type=int,
+            help='平行寫入的程序數 (預設: PostgreSQL 為 CPU 核心數；SQLite 同時只能有一個寫入者，為 1)'
+        )
+        parser.add_argument(
+            '--prefix',
+            default='seed',
+            help='使用者帳號與申請帳號名稱的前綴，帳號為 <prefix>_<編號> (預設: seed)'
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=730,
+            help='申請時間分佈的天數 (預設: 730)'
+        )
+        parser.add_argument(
+            '--status-mix',
+            default=DEFAULT_STATUS_MIX,
+            help=f'各狀態的比例權重 (預設: {DEFAULT_STATUS_MIX})'
+        )
+        parser.add_argument(
+            '--reviewers',
+            type=int,
+            default=10,
+            help='建立並分配審核紀錄的審核人員數 (預設: 10)'
+        )
+        parser.add_argument(
+            '--password',
+            default=DEFAULT_PASSWORD,
+            help=f'所有產生的使用者共用的登入密碼，只雜湊一次 (預設: {DEFAULT_PASSWORD})'
+        )
+        parser.add_argument(
+            '--skip-transitions',
+            action='store_true',
+            help='不寫入狀態轉換記錄（寫入量約減少一半）'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='亂數種子 (預設: 42)'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='DEBUG 關閉時仍允許寫入'
+        )
+
+    def handle(self, *args, **options):
+        rows, batch_size, prefix = options['rows'], options['batch_size'], options['prefix']
+        if not settings.DEBUG and not options['force']:
+            raise CommandError('DEBUG 未開啟，看起來是正式環境；確定要寫入測試資料請加上 --force')
+        if rows < 1 or batch_size < 1:
+            raise CommandError('--rows 與 --batch-size 必須大於 0')
+        try:
+            validate_account_name_format(f'{prefix}_{rows - 1}')
+            status_mix = parse_status_mix(options['status_mix'])
+        except ValidationError as e:
+            raise CommandError(f'--prefix 產生的帳號名稱不合規則：{e.messages[0]}')
+        except ValueError as e:
+            raise CommandError(f'--status-mix 格式錯誤：{e}')
+        if User.objects.filter(username__startswith=f'{prefix}_').exists():
+            raise CommandError(f'已存在 {prefix}_ 開頭的使用者，請改用其他 --prefix')
+
+        processes = options['processes'] or (1 if connection.vendor == 'sqlite' else os.cpu_count() or 1)
+        password = make_password(options['password'])
+        reviewer_ids = [
+            User.objects.get_or_create(username=f'{prefix}_reviewer_{i}', defaults={'email': f'{prefix}_reviewer_{i}@example.com', 'is_staff': True, 'password': password})[0].pk
+            for i in range(options['reviewers'])
+        ]
+        job_options = {
+            'prefix': prefix, 'now': timezone.now(), 'days': options['days'], 'status_mix': status_mix,
+            'reviewer_ids': reviewer_ids, 'password': password, 'transitions': not options['skip_transitions'], 'seed': options['seed'],
+        }
+        jobs = [(start, min(start + batch_size, rows), job_options) for start in range(0, rows, batch_size)]
+
+        self.stdout.write(f'以 {processes} 個程序寫入 {rows} 筆使用者與申請（每批 {batch_size} 筆）...')
+        status_deltas, daily_deltas = Counter(), Counter()
+        done = 0
+        started = time.perf_counter()
+        for count, batch_status, batch_daily in self._run(jobs, processes):
+            done += count
+            status_deltas.update(batch_status)
+            daily_deltas.update(batch_daily)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f'  {done}/{rows}（{done / elapsed:.0f} 筆/秒）')
+
+        # 審核統計在全部寫入後一次套用，避免各程序同時增量更新相同的統計列
+        apply_review_stats(status_deltas, daily_deltas)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'完成：{done} 筆，耗時 {elapsed:.1f} 秒（{done / elapsed:.0f} 筆/秒），使用者密碼為 {options["password"]}'))
+        for status, label in Application.STATUS_CHOICES:
+            self.stdout.write(f'  {label}: {status_deltas[status]}')
+
+    def _run(self, jobs, processes):
+        """依序或以多個程序執行各批，依完成順序產生結果"""
+        if processes == 1:
+            yield from map(seed_batch, jobs)
+            return
+        # 子程序需各自建立資料庫連線，fork 前先關閉父程序的連線，避免共用同一個 socket
+        connections.close_all()
+        method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+        with multiprocessing.get_context(method).Pool(processes, initializer=_init_worker) as pool:
+            yield from pool.imap_unordered(seed_batch, jobs)
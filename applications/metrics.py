@@ -0,0 +1,205 @@
+import random
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.template.backends.django import DjangoTemplates
+
+# 直方圖的區間上限（秒與查詢數），最後一個區間為 +Inf
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# (指標名稱, 說明, 區間, RequestMetrics 的屬性)
+METRICS = (
+    ('app_request_duration_seconds', '請求處理時間（含所有 middleware，不含長輪詢等待狀態變更的時間）', DURATION_BUCKETS, 'total_time'),
+    ('app_db_query_duration_seconds', '每個請求的資料庫查詢總時間', DURATION_BUCKETS, 'query_time'),
+    ('app_db_queries_per_request', '每個請求的資料庫查詢數', QUERY_COUNT_BUCKETS, 'query_count'),
+    ('app_template_render_seconds', '每個請求的模板渲染總時間', DURATION_BUCKETS, 'template_time'),
+)
+
+# 目前請求的量測資料，未抽樣的請求為 None；contextvars 會跟著 sync_to_async 進入執行緒
+_current = ContextVar('request_metrics', default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    """connection.execute_wrapper 使用的查詢計時，累計到目前 context 中的 RequestMetrics
+
+    非同步視圖的 ORM 查詢在 sync_to_async 的執行緒中以該執行緒自己的連線執行，
+    因此計時掛在每條連線上，再由 contextvar 找到查詢所屬的請求；未抽樣的請求直接執行。
+    """
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.add_query(time.perf_counter() - started)
+
+
+def install_query_wrapper(connection):
+    """在資料庫連線上加上查詢計時（重複呼叫不會重複加上）"""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class Histogram:
+    """累積式直方圖，bucket_counts[i] 為落在第 i 個區間（含 +Inf）的次數"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.bucket_counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """本程序的請求指標：{(指標名稱, URL 名稱): Histogram}"""
+
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def record(self, view_name, metrics):
+        with self._lock:
+            for name, _, buckets, attribute in METRICS:
+                histogram = self._histograms.get((name, view_name))
+                if histogram is None:
+                    histogram = self._histograms[(name, view_name)] = Histogram(buckets)
+                histogram.observe(getattr(metrics, attribute))
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def render_prometheus(self):
+        """以 Prometheus 文字格式輸出所有直方圖"""
+        lines = []
+        with self._lock:
+            for name, help_text, buckets, _ in METRICS:
+                lines += [f'# HELP {name} {help_text}（抽樣）', f'# TYPE {name} histogram']
+                for (metric, view_name), histogram in sorted(self._histograms.items()):
+                    if metric != name:
+                        continue
+                    label = view_name.replace('\\', '\\\\').replace('"', '\\"')
+                    cumulative = 0
+                    for bound, count in zip((*buckets, '+Inf'), histogram.bucket_counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{view="{label}",le="{bound}"}} {cumulative}')
+                    lines.append(f'{name}_sum{{view="{label}"}} {histogram.sum}')
+                    lines.append(f'{name}_count{{view="{label}"}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+class RequestMetrics:
+    """單一請求的查詢數、查詢時間、模板渲染時間、總時間與不計入總時間的等待時間（秒）"""
+
+    def __init__(self):
+        self.query_count = 0
+        self.query_time = 0.0
+        self.template_time = 0.0
+        self.total_time = 0.0
+        self.wait_time = 0.0
+        self._rendering = 0
+        self._lock = threading.Lock()
+
+    def add_query(self, duration):
+        """累計一次查詢；非同步請求的查詢可能在不同的執行緒中執行"""
+        with self._lock:
+            self.query_count += 1
+            self.query_time += duration
+
+    @contextmanager
+    def measure(self):
+        """量測區塊內的總時間，以及同一個 context 中（含 sync_to_async 的執行緒）執行的所有查詢"""
+        token = _current.set(self)
+        started = time.perf_counter()
+        try:
+            # 已在此執行緒開啟的連線也加上查詢計時，之後新開的連線由 connection_created 信號加上
+            for alias in connections:
+                install_query_wrapper(connections[alias])
+            yield self
+        finally:
+            self.total_time = time.perf_counter() - started - self.wait_time
+            _current.reset(token)
+
+    def server_timing(self):
+        """Server-Timing 標頭（毫秒）"""
+        entries = [
+            f'db;dur={self.query_time * 1000:.1f};desc="{self.query_count} queries"',
+            f'tpl;dur={self.template_time * 1000:.1f}',
+            f'total;dur={self.total_time * 1000:.1f}',
+        ]
+        if self.wait_time:
+            entries.append(f'wait;dur={self.wait_time * 1000:.1f}')
+        return ', '.join(entries)
+
+
+@contextmanager
+def exclude_from_duration():
+    """區塊內的時間不計入目前請求的總時間（長輪詢等待狀態變更時請求只是停在事件迴圈中）"""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.wait_time += time.perf_counter() - started
+
+
+def should_sample():
+    """依 APPLICATION_METRICS_SAMPLE_RATE 決定是否量測這個請求"""
+    rate = settings.APPLICATION_METRICS_SAMPLE_RATE
+    return rate >= 1 or (rate > 0 and random.random() < rate)
+
+
+def show_server_timing(user):
+    """是否在回應附上 Server-Timing：設定 APPLICATION_METRICS_SERVER_TIMING 時一律附上，否則只給管理人員"""
+    return settings.APPLICATION_METRICS_SERVER_TIMING or (user is not None and user.is_staff)
+
+
+class InstrumentedTemplate:
+    """記錄渲染時間的模板包裝，巢狀渲染（例如模板中再渲染另一個模板）只計算最外層"""
+
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        metrics = _current.get()
+        if metrics is None:
+            return self.template.render(context, request)
+        metrics._rendering += 1
+        started = time.perf_counter()
+        try:
+            return self.template.render(context, request)
+        finally:
+            metrics._rendering -= 1
+            if not metrics._rendering:
+                metrics.template_time += time.perf_counter() - started
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """在抽樣的請求中記錄模板渲染時間的 Django 模板後端"""
+
+    def from_string(self, template_code):
+        return InstrumentedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return InstrumentedTemplate(super().get_template(template_name))
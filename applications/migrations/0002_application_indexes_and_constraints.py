@@ -0,0 +1,61 @@
+# Generated by Django 5.2.3 on 2026-10-16 20:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+# 錯誤訊息最多列出的重複組數
+MAX_REPORTED_DUPLICATES = 20
+
+
+def check_duplicate_applications(apps, schema_editor):
+    """加上唯一約束前檢查既有的重複申請
+
+    有重複時列出各組重複的申請 id 並中止遷移，此時尚未變更任何資料表；
+    保留哪一筆申請需要人工判斷，處理後再重新執行 migrate。
+    """
+    Application = apps.get_model('applications', 'Application')
+    applications = Application.objects.using(schema_editor.connection.alias).order_by()
+    groups = []
+    for field, label in (('user_id', '使用者 id'), ('account_name', '帳號名稱')):
+        duplicated = applications.values(field).annotate(count=models.Count('id')).filter(count__gt=1).values_list(field, flat=True)
+        for value in duplicated:
+            ids = list(applications.filter(**{field: value}).order_by('id').values_list('id', flat=True))
+            groups.append(f'{label} {value!r}：申請 {", ".join(map(str, ids))}')
+    if groups:
+        more = f'\n  …另有 {len(groups) - MAX_REPORTED_DUPLICATES} 組' if len(groups) > MAX_REPORTED_DUPLICATES else ''
+        raise RuntimeError(
+            '既有資料違反一人一申請或帳號名稱唯一的限制，請先合併或刪除重複的申請再執行 migrate：\n  '
+            + '\n  '.join(groups[:MAX_REPORTED_DUPLICATES]) + more
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_applications, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['created_at'], name='application_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['status', 'created_at'], name='application_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['status', 'reviewed_at'], name='application_status_review_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='application',
+            constraint=models.UniqueConstraint(fields=('user',), name='unique_application_per_user', violation_error_message='您已有一個申請記錄'),
+        ),
+        migrations.AddConstraint(
+            model_name='application',
+            constraint=models.UniqueConstraint(fields=('account_name',), name='unique_application_account_name', violation_error_message='此帳號名稱已被使用，請選擇其他名稱'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.3 on 2026-10-16 20:59
+
+from django.db import migrations, models
+
+from applications.stats import count_review_stats, write_review_stats
+
+
+def backfill_review_stats(apps, schema_editor):
+    """依既有的申請計算統計，遷移完成後統計即與申請資料一致（尚無首次審核時間，以 reviewed_at 計算）"""
+    Application = apps.get_model('applications', 'Application')
+    rows = Application.objects.order_by().values_list('status', 'created_at', 'reviewed_at', 'approved_at').iterator(chunk_size=2000)
+    write_review_stats(apps.get_model('applications', 'ReviewStatusCount'), apps.get_model('applications', 'ReviewDailyStat'), *count_review_stats(rows))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0002_application_indexes_and_constraints'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewStatusCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('PENDING', '審核中'), ('APPROVED', '已通過'), ('REJECTED', '已拒絕'), ('ADDITIONAL_REQUIRED', '待補件')], max_length=20, unique=True, verbose_name='申請狀態')),
+                ('count', models.IntegerField(default=0, verbose_name='申請數')),
+            ],
+            options={
+                'verbose_name': '申請狀態統計',
+                'verbose_name_plural': '申請狀態統計',
+            },
+        ),
+        migrations.CreateModel(
+            name='ReviewDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='日期')),
+                ('milestone', models.CharField(choices=[('SUBMITTED', '新申請'), ('REVIEWED', '首次審核'), ('APPROVED', '通過')], max_length=20, verbose_name='里程碑')),
+                ('bucket', models.PositiveSmallIntegerField(default=0, verbose_name='處理時間區間')),
+                ('count', models.IntegerField(default=0, verbose_name='申請數')),
+            ],
+            options={
+                'verbose_name': '每日審核統計',
+                'verbose_name_plural': '每日審核統計',
+                'constraints': [models.UniqueConstraint(fields=('date', 'milestone', 'bucket'), name='unique_review_daily_stat')],
+            },
+        ),
+        migrations.RunPython(backfill_review_stats, migrations.RunPython.noop),
+    ]
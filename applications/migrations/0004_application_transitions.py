@@ -0,0 +1,73 @@
+# Generated by Django 5.2.3 on 2026-10-16 21:04
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Case, F, When
+from django.db.models.functions import Coalesce
+
+
+def backfill_status_changed_at(apps, schema_editor):
+    """以既有的時間戳記推估進入目前狀態的時間"""
+    Application = apps.get_model('applications', 'Application')
+    Application.objects.update(status_changed_at=Case(
+        When(status='PENDING', then=F('created_at')),
+        When(status='APPROVED', then=Coalesce('approved_at', 'reviewed_at', 'created_at')),
+        default=Coalesce('reviewed_at', 'created_at'),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0003_review_stats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationTransition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(blank=True, choices=[('PENDING', '審核中'), ('APPROVED', '已通過'), ('REJECTED', '已拒絕'), ('ADDITIONAL_REQUIRED', '待補件')], max_length=20, verbose_name='原狀態')),
+                ('to_status', models.CharField(choices=[('PENDING', '審核中'), ('APPROVED', '已通過'), ('REJECTED', '已拒絕'), ('ADDITIONAL_REQUIRED', '待補件')], max_length=20, verbose_name='新狀態')),
+                ('note', models.TextField(blank=True, verbose_name='備註')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='轉換時間')),
+                ('previous_status_duration', models.DurationField(blank=True, null=True, verbose_name='原狀態停留時間')),
+            ],
+            options={
+                'verbose_name': '申請狀態轉換記錄',
+                'verbose_name_plural': '申請狀態轉換記錄',
+                'ordering': ['created_at', 'id'],
+            },
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='status_changed_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='進入目前狀態時間'),
+        ),
+        migrations.RunPython(backfill_status_changed_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['status', 'status_changed_at'], name='application_status_changed_idx'),
+        ),
+        migrations.AddField(
+            model_name='applicationtransition',
+            name='actor',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='application_transitions', to=settings.AUTH_USER_MODEL, verbose_name='操作人員'),
+        ),
+        migrations.AddField(
+            model_name='applicationtransition',
+            name='application',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='transitions', to='applications.application', verbose_name='申請'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationtransition',
+            index=models.Index(fields=['application', 'created_at'], name='transition_application_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationtransition',
+            index=models.Index(fields=['from_status', 'created_at'], name='transition_from_status_idx'),
+        ),
+    ]
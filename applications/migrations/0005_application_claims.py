@@ -0,0 +1,26 @@
+# Generated by Django 5.2.3 on 2026-10-16 21:08
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0004_application_transitions'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='claim_expires_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='認領到期時間'),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='claimed_by',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='claimed_applications', to=settings.AUTH_USER_MODEL, verbose_name='認領人員'),
+        ),
+    ]
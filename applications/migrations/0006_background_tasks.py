@@ -0,0 +1,39 @@
+# Generated by Django 5.2.3 on 2026-10-16 22:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0005_application_claims'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BackgroundTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='工作名稱')),
+                ('payload', models.JSONField(blank=True, default=dict, verbose_name='參數')),
+                ('idempotency_key', models.CharField(blank=True, max_length=200, null=True, verbose_name='冪等鍵')),
+                ('status', models.CharField(choices=[('QUEUED', '等待執行'), ('RUNNING', '執行中'), ('SUCCEEDED', '已完成'), ('FAILED', '已失敗')], default='QUEUED', max_length=20, verbose_name='狀態')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='已執行次數')),
+                ('max_attempts', models.PositiveSmallIntegerField(default=5, verbose_name='最多執行次數')),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='最早執行時間')),
+                ('locked_by', models.CharField(blank=True, max_length=100, verbose_name='執行程序')),
+                ('locked_until', models.DateTimeField(blank=True, null=True, verbose_name='租約到期時間')),
+                ('last_error', models.TextField(blank=True, verbose_name='最後錯誤')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='建立時間')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='完成時間')),
+            ],
+            options={
+                'verbose_name': '背景工作',
+                'verbose_name_plural': '背景工作',
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['status', 'run_after'], name='background_task_ready_idx')],
+                'constraints': [models.UniqueConstraint(fields=('idempotency_key',), name='unique_background_task_key')],
+            },
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.3 on 2026-10-16 23:45
+
+from django.db import migrations, models
+from django.db.models import Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from applications.stats import count_review_stats, write_review_stats
+
+
+def backfill_first_reviewed_at(apps, schema_editor):
+    """以轉換記錄中第一次離開審核中的時間作為首次審核時間，沒有轉換記錄時使用 reviewed_at"""
+    Application = apps.get_model('applications', 'Application')
+    ApplicationTransition = apps.get_model('applications', 'ApplicationTransition')
+    first_review = (ApplicationTransition.objects.filter(application=OuterRef('pk'), from_status='PENDING')
+                    .order_by().values('application').annotate(first=Min('created_at')).values('first'))
+    Application.objects.update(first_reviewed_at=Coalesce(Subquery(first_review), 'reviewed_at'))
+
+
+def rebuild_review_stats(apps, schema_editor):
+    """以首次審核時間重新計算統計，修正重新送審後再次審核被重複計入的首次審核"""
+    Application = apps.get_model('applications', 'Application')
+    rows = Application.objects.order_by().values_list('status', 'created_at', 'first_reviewed_at', 'approved_at').iterator(chunk_size=2000)
+    write_review_stats(apps.get_model('applications', 'ReviewStatusCount'), apps.get_model('applications', 'ReviewDailyStat'), *count_review_stats(rows))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0006_background_tasks'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='reviewdailystat',
+            name='unique_review_daily_stat',
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='first_reviewed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='首次審核時間'),
+        ),
+        migrations.AddField(
+            model_name='reviewdailystat',
+            name='shard',
+            field=models.PositiveSmallIntegerField(default=0, verbose_name='分片'),
+        ),
+        migrations.AddField(
+            model_name='reviewstatuscount',
+            name='shard',
+            field=models.PositiveSmallIntegerField(default=0, verbose_name='分片'),
+        ),
+        migrations.AlterField(
+            model_name='reviewstatuscount',
+            name='status',
+            field=models.CharField(choices=[('PENDING', '審核中'), ('APPROVED', '已通過'), ('REJECTED', '已拒絕'), ('ADDITIONAL_REQUIRED', '待補件')], max_length=20, verbose_name='申請狀態'),
+        ),
+        migrations.AddConstraint(
+            model_name='reviewdailystat',
+            constraint=models.UniqueConstraint(fields=('date', 'milestone', 'bucket', 'shard'), name='unique_review_daily_stat'),
+        ),
+        migrations.AddConstraint(
+            model_name='reviewstatuscount',
+            constraint=models.UniqueConstraint(fields=('status', 'shard'), name='unique_review_status_count'),
+        ),
+        migrations.RunPython(backfill_first_reviewed_at, migrations.RunPython.noop),
+        migrations.RunPython(rebuild_review_stats, migrations.RunPython.noop),
+    ]
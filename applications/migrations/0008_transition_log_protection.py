@@ -0,0 +1,47 @@
+# Generated by Django 5.2.3 on 2026-10-17 00:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import F, OuterRef, Subquery
+
+
+def copy_application_identity(apps, schema_editor):
+    """為既有的轉換記錄補上申請編號與目前的帳號名稱"""
+    Application = apps.get_model('applications', 'Application')
+    ApplicationTransition = apps.get_model('applications', 'ApplicationTransition')
+    ApplicationTransition.objects.update(
+        application_number=F('application_id'),
+        account_name=Subquery(Application.objects.filter(pk=OuterRef('application_id')).values('account_name')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0007_review_stat_shards_and_first_review'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='applicationtransition',
+            name='application_number',
+            field=models.PositiveBigIntegerField(null=True, verbose_name='申請編號'),
+        ),
+        migrations.AddField(
+            model_name='applicationtransition',
+            name='account_name',
+            field=models.CharField(default='', max_length=100, verbose_name='申請人帳號名稱'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_application_identity, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='applicationtransition',
+            name='application_number',
+            field=models.PositiveBigIntegerField(verbose_name='申請編號'),
+        ),
+        migrations.AlterField(
+            model_name='applicationtransition',
+            name='application',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='transitions', to='applications.application', verbose_name='申請'),
+        ),
+    ]
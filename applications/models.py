@@ -1,5 +1,5 @@
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 
 
@@ -25,26 +25,117 @@ class Application(models.Model):
     rejection_reason = models.TextField(blank=True, verbose_name='拒絕原因', help_text='當申請被拒絕時填寫的原因')  # 拒絕原因（當 status 為 REJECTED 時使用）
     additional_info_required = models.TextField(blank=True, verbose_name='需補充資料說明', help_text='需要申請人補充的具體內容和原因')  # 補件說明（當 status 為 ADDITIONAL_REQUIRED 時使用）
     approved_at = models.DateTimeField(null=True, blank=True, verbose_name='通過時間')  # 通過時間（當status為 APPROVED 時自動設定）
+    status_changed_at = models.DateTimeField(default=timezone.now, editable=False, verbose_name='進入目前狀態時間')  # 每次狀態轉換時更新，查詢佇列等待時間不需 JOIN 轉換記錄
+    claimed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='claimed_applications', verbose_name='認領人員')  # 審核人員認領後，租約到期前其他人不會取得此申請
+    claim_expires_at = models.DateTimeField(null=True, blank=True, editable=False, verbose_name='認領到期時間')
+    first_reviewed_at = models.DateTimeField(null=True, blank=True, editable=False, verbose_name='首次審核時間')  # 重新送審時 reviewed_at 會被清除，此欄位保留第一次審核的時間供審核統計使用
 
     class Meta:
         verbose_name = '證券帳號申請'
         verbose_name_plural = '證券帳號申請'
         ordering = ['-created_at']
+        constraints = [
+            # 一人一帳戶：由資料庫保證每位使用者只有一筆申請
+            models.UniqueConstraint(fields=['user'], name='unique_application_per_user', violation_error_message='您已有一個申請記錄'),
+            # 帳號名稱在整個系統中必須唯一
+            models.UniqueConstraint(fields=['account_name'], name='unique_application_account_name', violation_error_message='此帳號名稱已被使用，請選擇其他名稱'),
+        ]
+        indexes = [
+            # 後台預設依申請時間排序與日期層次導航
+            models.Index(fields=['created_at'], name='application_created_idx'),
+            # 後台依狀態篩選並依申請時間排序（審核佇列）
+            models.Index(fields=['status', 'created_at'], name='application_status_created_idx'),
+            # 後台依狀態篩選並依審核時間排序
+            models.Index(fields=['status', 'reviewed_at'], name='application_status_review_idx'),
+            # 依狀態查詢在目前狀態停留最久的申請
+            models.Index(fields=['status', 'status_changed_at'], name='application_status_changed_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.account_name} ({self.get_status_display()})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """載入時記錄各欄位的原始值（延遲載入的欄位不記錄）"""
+        instance = super().from_db(db, field_names, values)
+        instance._remember_loaded_values()
+        return instance
+
+    def _remember_loaded_values(self, fields=None):
+        """記錄欄位目前的值作為比對基準；fields 為 None 時記錄所有已載入的欄位"""
+        attnames = [field.attname for field in self._meta.concrete_fields] if fields is None else [self._meta.get_field(field).attname for field in fields]
+        loaded = {} if fields is None else self.loaded_values
+        loaded.update((attname, getattr(self, attname)) for attname in attnames if attname in self.__dict__)
+        self._loaded_values = loaded
+
+    @property
+    def loaded_values(self):
+        """上次自資料庫載入或儲存時各欄位的值（以 attname 為鍵），新建立的物件為空 dict"""
+        return getattr(self, '_loaded_values', {})
+
+    def get_changed_fields(self):
+        """回傳自載入後被修改過的欄位 attname（未載入而後被指定的欄位也視為已修改）"""
+        loaded = self.loaded_values
+        return [field.attname for field in self._meta.concrete_fields if field.attname in self.__dict__ and (field.attname not in loaded or loaded[field.attname] != getattr(self, field.attname))]
+
+    def has_field_changed(self, field):
+        """判斷單一欄位自載入後是否被修改"""
+        return self._meta.get_field(field).attname in self.get_changed_fields()
+
     def save(self, *args, **kwargs):
-        """覆寫save方法，自動設定時間戳記"""
+        """覆寫save方法，自動設定時間戳記並記錄狀態轉換，且只寫入有變更的欄位"""
+        now = timezone.now()
         # 如果狀態改為已通過，設定通過時間
         if self.status == 'APPROVED' and not self.approved_at:
-            self.approved_at = timezone.now()
+            self.approved_at = now
 
         # 如果狀態有變更（非PENDING），設定審核時間
         if self.status != 'PENDING' and not self.reviewed_at:
-            self.reviewed_at = timezone.now()
+            self.reviewed_at = now
+        if self.status != 'PENDING' and not self.first_reviewed_at:
+            self.first_reviewed_at = self.reviewed_at
 
-        super().save(*args, **kwargs)
+        # 新申請或狀態與載入時不同時記錄轉換（未載入狀態的物件無法判斷來源狀態，不記錄）
+        adding = self._state.adding
+        previous_status = self.loaded_values.get('status')
+        previous_changed_at = self.loaded_values.get('status_changed_at')
+        status_changed = adding or (previous_status is not None and previous_status != self.status)
+        if status_changed:
+            self.status_changed_at = now
+
+        update_fields = kwargs.get('update_fields')
+        # 自資料庫載入的物件只 UPDATE 變更過的欄位（updated_at 由 auto_now 每次更新）
+        if not adding and self.loaded_values and update_fields is None and not kwargs.get('force_insert') and not args:
+            kwargs['update_fields'] = list(dict.fromkeys([*self.get_changed_fields(), 'updated_at']))
+        elif update_fields is not None and status_changed and 'status' in update_fields:
+            kwargs['update_fields'] = [*update_fields, 'status_changed_at']
+
+        # 轉換記錄與申請在同一個交易中寫入
+        with transaction.atomic(using=kwargs.get('using'), savepoint=False):
+            super().save(*args, **kwargs)
+            if status_changed:
+                ApplicationTransition.objects.using(self._state.db).create(
+                    application=self,
+                    application_number=self.pk,
+                    account_name=self.account_name,
+                    from_status='' if adding else previous_status,
+                    to_status=self.status,
+                    actor=self.__dict__.pop('_transition_actor', None),
+                    note=self.__dict__.pop('_transition_note', ''),
+                    created_at=now,
+                    previous_status_duration=now - previous_changed_at if previous_changed_at else None,
+                )
+        self._remember_loaded_values(kwargs.get('update_fields'))
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        """重新載入後以新的值作為比對基準"""
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        self._remember_loaded_values(fields)
+
+    def is_claimed_by_other(self, user, now=None):
+        """判斷申請是否由其他審核人員認領且租約尚未到期"""
+        now = now or timezone.now()
+        return self.claimed_by_id is not None and self.claimed_by_id != user.pk and self.claim_expires_at is not None and self.claim_expires_at > now
 
     @property
     def can_be_updated(self):
@@ -65,3 +156,148 @@ class Application(models.Model):
     def is_rejected(self):
         """判斷是否已拒絕"""
         return self.status == 'REJECTED'
+
+
+class ApplicationTransitionQuerySet(models.QuerySet):
+    """轉換記錄只能新增，批次修改與刪除一律拒絕"""
+
+    def update(self, **kwargs):
+        raise ValueError('狀態轉換記錄不可修改')
+
+    def delete(self):
+        raise ValueError('狀態轉換記錄不可刪除')
+
+
+class ApplicationTransition(models.Model):
+    """申請狀態轉換記錄（只新增、不修改）
+
+    申請被刪除時保留轉換記錄，只清除外鍵；記錄中另存申請編號與當時的帳號名稱供識別。
+    """
+
+    application = models.ForeignKey(Application, on_delete=models.SET_NULL, null=True, related_name='transitions', verbose_name='申請')
+    application_number = models.PositiveBigIntegerField(verbose_name='申請編號')  # 申請刪除後仍可識別
+    account_name = models.CharField(max_length=100, verbose_name='申請人帳號名稱')
+    from_status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES, blank=True, verbose_name='原狀態')  # 新申請為空字串
+    to_status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES, verbose_name='新狀態')
+    actor = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='application_transitions', verbose_name='操作人員')
+    note = models.TextField(blank=True, verbose_name='備註')
+    created_at = models.DateTimeField(default=timezone.now, verbose_name='轉換時間')
+    previous_status_duration = models.DurationField(null=True, blank=True, verbose_name='原狀態停留時間')  # 統計各狀態停留時間不需再找上一筆轉換
+
+    objects = ApplicationTransitionQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = '申請狀態轉換記錄'
+        verbose_name_plural = '申請狀態轉換記錄'
+        ordering = ['created_at', 'id']
+        indexes = [
+            # 依申請查詢歷程
+            models.Index(fields=['application', 'created_at'], name='transition_application_idx'),
+            # 統計某狀態的停留時間
+            models.Index(fields=['from_status', 'created_at'], name='transition_from_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.application_number}: {self.from_status or '-'} → {self.to_status}"
+
+    def save(self, *args, **kwargs):
+        """轉換記錄只能新增"""
+        if not self._state.adding:
+            raise ValueError('狀態轉換記錄不可修改')
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        """轉換記錄不可刪除"""
+        raise ValueError('狀態轉換記錄不可刪除')
+
+
+class ReviewStatusCount(models.Model):
+    """各申請狀態目前的申請數（隨狀態轉換增量維護）
+
+    每個狀態分散為多個 shard 資料列，增量更新時隨機選擇其中一列，讀取時加總，
+    避免併發的審核在同一列上排隊等待鎖。
+    """
+
+    status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES, verbose_name='申請狀態')
+    shard = models.PositiveSmallIntegerField(default=0, verbose_name='分片')
+    count = models.IntegerField(default=0, verbose_name='申請數')
+
+    class Meta:
+        verbose_name = '申請狀態統計'
+        verbose_name_plural = '申請狀態統計'
+        constraints = [
+            models.UniqueConstraint(fields=['status', 'shard'], name='unique_review_status_count'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_status_display()} #{self.shard}: {self.count}"
+
+
+class ReviewDailyStat(models.Model):
+    """每日申請、審核與通過的筆數與處理時間分佈（隨狀態轉換增量維護）
+
+    milestone 為 SUBMITTED 時 bucket 固定為 0；REVIEWED / APPROVED 依自申請時間起算的
+    處理時間落在 stats.TURNAROUND_BUCKET_HOURS 的哪個區間分組計數。與 ReviewStatusCount 相同，
+    每個分組分散為多個 shard 資料列，讀取時加總。
+    """
+
+    MILESTONE_CHOICES = [
+        ('SUBMITTED', '新申請'),
+        ('REVIEWED', '首次審核'),
+        ('APPROVED', '通過'),
+    ]
+
+    date = models.DateField(verbose_name='日期')
+    milestone = models.CharField(max_length=20, choices=MILESTONE_CHOICES, verbose_name='里程碑')
+    bucket = models.PositiveSmallIntegerField(default=0, verbose_name='處理時間區間')
+    shard = models.PositiveSmallIntegerField(default=0, verbose_name='分片')
+    count = models.IntegerField(default=0, verbose_name='申請數')
+
+    class Meta:
+        verbose_name = '每日審核統計'
+        verbose_name_plural = '每日審核統計'
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'milestone', 'bucket', 'shard'], name='unique_review_daily_stat'),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.get_milestone_display()} #{self.bucket}/{self.shard}: {self.count}"
+
+
+class BackgroundTask(models.Model):
+    """背景工作佇列中的一筆工作（由 run_tasks 指令執行，見 applications.tasks）"""
+
+    STATUS_CHOICES = [
+        ('QUEUED', '等待執行'),
+        ('RUNNING', '執行中'),
+        ('SUCCEEDED', '已完成'),
+        ('FAILED', '已失敗'),
+    ]
+
+    name = models.CharField(max_length=100, verbose_name='工作名稱')
+    payload = models.JSONField(default=dict, blank=True, verbose_name='參數')
+    idempotency_key = models.CharField(max_length=200, null=True, blank=True, verbose_name='冪等鍵')  # 相同鍵值的工作只會加入一次
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='QUEUED', verbose_name='狀態')
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name='已執行次數')
+    max_attempts = models.PositiveSmallIntegerField(default=5, verbose_name='最多執行次數')
+    run_after = models.DateTimeField(default=timezone.now, verbose_name='最早執行時間')  # 重試時依退避時間延後
+    locked_by = models.CharField(max_length=100, blank=True, verbose_name='執行程序')
+    locked_until = models.DateTimeField(null=True, blank=True, verbose_name='租約到期時間')  # 執行程序中斷時，租約到期後由其他程序重新執行
+    last_error = models.TextField(blank=True, verbose_name='最後錯誤')
+    created_at = models.DateTimeField(default=timezone.now, verbose_name='建立時間')
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='完成時間')
+
+    class Meta:
+        verbose_name = '背景工作'
+        verbose_name_plural = '背景工作'
+        ordering = ['-created_at', '-id']
+        constraints = [
+            models.UniqueConstraint(fields=['idempotency_key'], name='unique_background_task_key'),
+        ]
+        indexes = [
+            # 執行程序依狀態與最早執行時間取出工作
+            models.Index(fields=['status', 'run_after'], name='background_task_ready_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.get_status_display()})"
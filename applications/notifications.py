@@ -0,0 +1,69 @@
+from django.conf import settings
+from django.core.mail import send_mail
+from django.utils.module_loading import import_string
+
+from .models import Application
+from .tasks import enqueue_many, register
+
+# 各狀態通知的主旨與內容
+STATUS_MESSAGES = {
+    'PENDING': ('已收到您的證券帳戶申請', '您的證券帳戶申請（{account_name}）已送出，我們會盡快完成審核。'),
+    'APPROVED': ('您的證券帳戶申請已通過', '恭喜！您的證券帳戶申請（{account_name}）已通過審核。'),
+    'REJECTED': ('您的證券帳戶申請未通過', '很抱歉，您的證券帳戶申請（{account_name}）未通過審核。{rejection_reason}'),
+    'ADDITIONAL_REQUIRED': ('您的證券帳戶申請需要補件', '您的證券帳戶申請（{account_name}）需要補充資料：{additional_info_required}'),
+}
+
+# 送件（審核中）通知只確認申請人已送出申請或補件，執行前申請已被審核也不會誤導申請人，因此一律寄送
+ALWAYS_SENT_STATUSES = {'PENDING'}
+
+
+def enqueue_status_notifications(changes):
+    """在交易提交後加入申請人的狀態通知工作，changes 為 [(申請主鍵, 新狀態, 狀態轉換時間)]
+
+    冪等鍵包含轉換時間，同一次轉換重複呼叫只會通知一次。未設定簡訊發送函式時只寄送電子郵件。
+    """
+    changes = [(pk, status, changed_at.timestamp()) for pk, status, changed_at in changes]
+    channels = ['email', 'sms'] if settings.APPLICATION_SMS_SENDER else ['email']
+    for channel in channels:
+        enqueue_many(f'notify_status_{channel}', [
+            (f'notify_status_{channel}:{pk}:{changed_at:.6f}', {'application_id': pk, 'status': status})
+            for pk, status, changed_at in changes
+        ])
+
+
+def _current_application(application_id, status):
+    """回傳要通知的申請，申請已刪除時回傳 None
+
+    送件通知一律寄送；審核結果的通知在申請已再次轉換時視為過時並回傳 None，
+    避免寄出與目前狀態不符的審核結果（例如補件通知在申請人補件後才執行）。
+    """
+    applications = Application.objects.select_related('user').filter(pk=application_id)
+    if status not in ALWAYS_SENT_STATUSES:
+        applications = applications.filter(status=status)
+    return applications.first()
+
+
+def status_message(application, status):
+    """申請轉換為 status 時的通知 (主旨, 內容)"""
+    subject, body = STATUS_MESSAGES[status]
+    return subject, body.format(account_name=application.account_name, rejection_reason=application.rejection_reason, additional_info_required=application.additional_info_required)
+
+
+@register('notify_status_email')
+def notify_status_email(application_id, status):
+    """寄送申請狀態通知郵件"""
+    application = _current_application(application_id, status)
+    if application is None or not application.user.email:
+        return
+    subject, body = status_message(application, status)
+    send_mail(subject, body, None, [application.user.email])
+
+
+@register('notify_status_sms')
+def notify_status_sms(application_id, status):
+    """以 APPLICATION_SMS_SENDER 發送申請狀態通知簡訊至申請的電話號碼"""
+    application = _current_application(application_id, status)
+    if application is None or not settings.APPLICATION_SMS_SENDER:
+        return
+    subject, body = status_message(application, status)
+    import_string(settings.APPLICATION_SMS_SENDER)(application.phone_number, f'{subject}：{body}')
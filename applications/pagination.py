@@ -0,0 +1,153 @@
+import base64
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.conf import settings
+from django.contrib.admin.views.main import PAGE_VAR, ChangeList
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+# 游標分頁的查詢參數
+CURSOR_VAR = 'cursor'
+
+# 游標分頁依 (created_at, id) 由新到舊排序，與管理列表的預設排序一致
+KEYSET_ORDERING = ('-created_at', '-pk')
+
+
+def encode_cursor(direction, created_at, pk):
+    """將分頁方向與排序鍵編碼為網址安全的游標"""
+    raw = f'{direction}|{created_at.isoformat()}|{pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """解析游標，回傳 (方向, created_at, pk)；無效的游標回傳 None"""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode()
+        direction, created_at, pk = raw.split('|')
+        if direction not in ('after', 'before'):
+            return None
+        return direction, datetime.fromisoformat(created_at), int(pk)
+    except ValueError:
+        return None
+
+
+@dataclass
+class KeysetPage:
+    """游標分頁的一頁資料"""
+
+    object_list: list
+    next_cursor: str | None = None
+    previous_cursor: str | None = None
+
+
+def keyset_page(queryset, cursor, per_page):
+    """以 (created_at, id) 為鍵取得一頁資料，查詢成本與所在頁數無關
+
+    queryset 需依 KEYSET_ORDERING 排序。往後翻頁取比游標更舊的資料，
+    往前翻頁則反向取比游標更新的資料後再反轉，兩者都只多取一筆來判斷是否還有下一頁。
+    """
+    if cursor is None:
+        direction, rows = 'after', list(queryset[:per_page + 1])
+    else:
+        direction, created_at, pk = cursor
+        if direction == 'after':
+            # created_at__lte 為冗餘條件，讓資料庫能直接以 created_at 索引做範圍掃描
+            boundary = Q(created_at__lte=created_at) & (Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk))
+            rows = list(queryset.filter(boundary)[:per_page + 1])
+        else:
+            boundary = Q(created_at__gte=created_at) & (Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk))
+            rows = list(queryset.filter(boundary).reverse()[:per_page + 1])[::-1]
+
+    has_more = len(rows) > per_page
+    if direction == 'after':
+        rows = rows[:per_page]
+        has_next, has_previous = has_more, cursor is not None
+    else:
+        rows = rows[-per_page:]
+        has_next, has_previous = True, has_more
+
+    page = KeysetPage(object_list=rows)
+    if rows and has_next:
+        page.next_cursor = encode_cursor('after', rows[-1].created_at, rows[-1].pk)
+    if rows and has_previous:
+        page.previous_cursor = encode_cursor('before', rows[0].created_at, rows[0].pk)
+    return page
+
+
+def estimate_count(queryset):
+    """估計查詢結果的筆數
+
+    未篩選的 PostgreSQL 查詢直接讀取 pg_class.reltuples 統計值；
+    其他情況以查詢 SQL 為鍵快取實際計數，在 APPLICATION_ADMIN_COUNT_CACHE_TIMEOUT 秒內重複使用。
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql' and not queryset.query.has_filters():
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [queryset.model._meta.db_table])
+            row = cursor.fetchone()
+        # 尚未 ANALYZE 的資料表 reltuples 為 -1 或 0，改用快取計數
+        if row and row[0] > 0:
+            return row[0]
+
+    sql, params = queryset.query.sql_with_params()
+    key = 'application:count:' + hashlib.md5(f'{queryset.db}:{sql}:{params!r}'.encode()).hexdigest()
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, settings.APPLICATION_ADMIN_COUNT_CACHE_TIMEOUT)
+    return count
+
+
+class EstimatedCountPaginator(Paginator):
+    """以估計筆數取代 COUNT(*) 的分頁器（APPLICATION_ADMIN_ESTIMATED_COUNT 關閉時使用實際計數）"""
+
+    @cached_property
+    def is_estimated(self):
+        return settings.APPLICATION_ADMIN_ESTIMATED_COUNT
+
+    @cached_property
+    def count(self):
+        if self.is_estimated:
+            return estimate_count(self.object_list)
+        return super().count
+
+
+class KeysetChangeList(ChangeList):
+    """使用預設排序時以游標分頁的管理列表
+
+    使用者改依其他欄位排序、顯示全部或以 ?p= 指定頁碼時，沿用 Django 原本的 OFFSET 分頁。
+    """
+
+    def __init__(self, request, *args, **kwargs):
+        self.cursor = decode_cursor(request.GET.get(CURSOR_VAR))
+        super().__init__(request, *args, **kwargs)
+
+    def get_queryset(self, request, exclude_parameters=None):
+        # 游標不是篩選條件，避免被當成欄位查詢或保留在篩選與排序連結中
+        self.params.pop(CURSOR_VAR, None)
+        self.filter_params.pop(CURSOR_VAR, None)
+        return super().get_queryset(request, exclude_parameters)
+
+    def get_results(self, request):
+        super().get_results(request)
+        self.count_is_estimated = getattr(self.paginator, 'is_estimated', False)
+        # ModelAdmin.ordering 會同時出現在預設排序與查詢本身的排序中，比對前先去除重複
+        self.keyset_active = (self.multi_page and not (self.show_all and self.can_show_all) and PAGE_VAR not in request.GET and tuple(dict.fromkeys(self.queryset.query.order_by)) == KEYSET_ORDERING)
+        self.next_page_url = self.previous_page_url = self.first_page_url = None
+        if not self.keyset_active:
+            return
+
+        page = keyset_page(self.queryset, self.cursor, self.list_per_page)
+        self.result_list = page.object_list
+        if page.next_cursor:
+            self.next_page_url = self.get_query_string({CURSOR_VAR: page.next_cursor})
+        if page.previous_cursor:
+            self.previous_page_url = self.get_query_string({CURSOR_VAR: page.previous_cursor})
+            self.first_page_url = self.get_query_string()
@@ -0,0 +1,99 @@
+import asyncio
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .conditional import application_version
+
+# 等待中的長輪詢請求：{使用者 id: {ApplicationWatch, ...}}，只存在本程序中
+_watches = defaultdict(set)
+_lock = threading.Lock()
+
+
+def application_change_key(user_id):
+    """使用者申請最後變更標記的快取鍵值，讓其他程序的變更也能被察覺"""
+    return f'application:changed:user:{user_id}'
+
+
+def application_status_payload(application):
+    """狀態輪詢 API 回傳的內容，尚無申請時 status 為 None"""
+    if application is None:
+        return {'status': None, 'version': application_version(None)}
+    return {
+        'id': application.pk,
+        'status': application.status,
+        'status_display': application.get_status_display(),
+        'reviewed_at': application.reviewed_at,
+        'approved_at': application.approved_at,
+        'additional_info_required': application.additional_info_required,
+        'can_be_updated': application.can_be_updated,
+        'version': application_version(application),
+    }
+
+
+def notify_application_changed(user_ids):
+    """喚醒等待這些使用者申請變更的長輪詢請求
+
+    由 invalidate_user_applications() 在交易提交後呼叫，可能在任何執行緒中執行。
+    同一程序中的請求立即喚醒；其他程序中的請求會在下一次檢查變更標記時察覺。
+    """
+    user_ids = set(user_ids)
+    cache.set_many({application_change_key(user_id): time.time_ns() for user_id in user_ids}, settings.APPLICATION_STATUS_LONGPOLL_MAX_WAIT * 2)
+    with _lock:
+        watches = [watch for user_id in user_ids for watch in _watches.get(user_id, ())]
+    for watch in watches:
+        watch.wake()
+
+
+class ApplicationWatch:
+    """在 async with 區塊中等待使用者的申請變更
+
+    進入區塊時就登記，之後才讀取申請，讀取與開始等待之間發生的變更也不會遺漏。
+    等待中的請求只佔用一個 asyncio.Event，不查詢資料庫。
+    """
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self._loop = asyncio.get_running_loop()
+        self._event = asyncio.Event()
+        self._marker = None
+
+    async def __aenter__(self):
+        with _lock:
+            _watches[self.user_id].add(self)
+        self._marker = await cache.aget(application_change_key(self.user_id))
+        return self
+
+    async def __aexit__(self, *exc_info):
+        with _lock:
+            watches = _watches.get(self.user_id)
+            if watches is not None:
+                watches.discard(self)
+                if not watches:
+                    del _watches[self.user_id]
+
+    def wake(self):
+        try:
+            self._loop.call_soon_threadsafe(self._event.set)
+        except RuntimeError:
+            # 事件迴圈已關閉，請求已經結束
+            pass
+
+    async def wait(self, timeout):
+        """等待申請變更，變更時回傳 True，逾時回傳 False
+
+        每 APPLICATION_STATUS_LONGPOLL_RECHECK_SECONDS 秒檢查一次快取中的變更標記，
+        以察覺在其他程序（管理指令、其他工作程序）中發生的變更。
+        """
+        deadline = self._loop.time() + timeout
+        while (remaining := deadline - self._loop.time()) > 0:
+            try:
+                await asyncio.wait_for(self._event.wait(), min(remaining, settings.APPLICATION_STATUS_LONGPOLL_RECHECK_SECONDS))
+                return True
+            except TimeoutError:
+                if await cache.aget(application_change_key(self.user_id)) != self._marker:
+                    return True
+        return False
@@ -0,0 +1,150 @@
+import re
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .models import Application
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PARAM_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_SPACE = re.compile(r'\s+')
+
+# 背景申請輪流使用的狀態，讓列表、篩選與統計涵蓋各種狀態
+SEED_STATUSES = ('PENDING', 'APPROVED', 'REJECTED', 'ADDITIONAL_REQUIRED')
+
+
+def fingerprint(sql):
+    """將 SQL 正規化為指紋：字串與數字常數改為 ?，IN (?, ?, ...) 縮為 (...)"""
+    sql = _NUMBER.sub('?', _STRING.sub('?', sql)).replace('%s', '?')
+    return _SPACE.sub(' ', _PARAM_LIST.sub('(...)', sql)).strip()
+
+
+class QueryProfile:
+    """累計各頁面在不同資料量下的查詢數，以及所有查詢依指紋彙整的次數與時間"""
+
+    def __init__(self):
+        self.counts = defaultdict(dict)  # {頁面: {資料量: 查詢數}}
+        self.statuses = defaultdict(dict)  # {頁面: {資料量: HTTP 狀態碼}}
+        self.fingerprints = defaultdict(lambda: [0, 0.0])  # {指紋: [次數, 總秒數]}
+
+    @contextmanager
+    def record(self, page, size, using='default'):
+        with CaptureQueriesContext(connections[using]) as queries:
+            yield queries
+        self.counts[page][size] = len(queries)
+        for query in queries.captured_queries:
+            stats = self.fingerprints[fingerprint(query['sql'])]
+            stats[0] += 1
+            stats[1] += float(query['time'])
+
+    def growing_pages(self):
+        """查詢數隨資料量增加的頁面：{頁面: {資料量: 查詢數}}"""
+        growing = {}
+        for page, counts in self.counts.items():
+            baseline = counts[min(counts)]
+            if any(count > baseline for count in counts.values()):
+                growing[page] = dict(sorted(counts.items()))
+        return growing
+
+    def hottest(self, limit=10):
+        """執行次數最多的 SQL 指紋（次數相同時依總時間）：[(指紋, 次數, 總秒數)]"""
+        ranked = sorted(self.fingerprints.items(), key=lambda item: (item[1][0], item[1][1]), reverse=True)
+        return [(sql, count, seconds) for sql, (count, seconds) in ranked[:limit]]
+
+    def report(self, limit=10):
+        """各頁面的查詢數與最熱門的 SQL 指紋"""
+        sizes = sorted({size for counts in self.counts.values() for size in counts})
+        lines = ['頁面查詢數（資料量: ' + ' / '.join(str(size) for size in sizes) + '）']
+        growing = self.growing_pages()
+        for page, counts in self.counts.items():
+            mark = '  ← 隨資料量增加' if page in growing else ''
+            lines.append(f'  {page}: ' + ' / '.join(str(counts.get(size, '-')) for size in sizes) + mark)
+        lines.append(f'最常執行的 SQL（前 {limit} 名）')
+        for sql, count, seconds in self.hottest(limit):
+            lines.append(f'  {count:>6} 次 {seconds * 1000:>9.1f} ms  {sql[:200]}')
+        return '\n'.join(lines)
+
+
+class QueryCountScenario:
+    """量測各申請人頁面與管理頁面查詢數的情境
+
+    固定建立管理人員、審核人員與四種狀態的申請人，再以 grow_to() 逐步增加其他使用者的背景申請。
+    每個頁面先請求一次暖機（ContentType 等程序內快取），清除一般快取後再量測，
+    因此各資料量下量測的都是相同的快取未命中路徑。
+    """
+
+    def __init__(self):
+        self.admin = User.objects.create_user(username='qc_admin', password='!', is_staff=True, is_superuser=True)
+        self.reviewers = [User.objects.create_user(username=f'qc_reviewer_{i}', password='!', is_staff=True) for i in range(3)]
+        self.applicants = {}
+        for status in ('NONE', *SEED_STATUSES):
+            user = User.objects.create_user(username=f'qc_{status.lower()}', password='!')
+            self.applicants[status] = user
+            if status != 'NONE':
+                Application.objects.create(
+                    user=user, account_name=f'qc_{status.lower()}', phone_number='0912-345-678', address='台北市信義區信義路五段7號',
+                    status=status, reviewed_by=None if status == 'PENDING' else self.reviewers[0],
+                    additional_info_required='請補充身分證影本' if status == 'ADDITIONAL_REQUIRED' else '',
+                )
+        self.size = Application.objects.count()
+
+    def grow_to(self, size):
+        """以 bulk_create 增加背景申請，直到申請總數達到 size"""
+        start = self.size
+        if size <= start:
+            return
+        users = User.objects.bulk_create([User(username=f'qc_bg_{i}', email=f'qc_bg_{i}@example.com', password='!') for i in range(start, size)])
+        Application.objects.bulk_create([
+            Application(
+                user=user, account_name=f'qc_bg_{i}', phone_number='0912-345-678', address='台北市信義區信義路五段7號',
+                status=SEED_STATUSES[i % len(SEED_STATUSES)],
+                reviewed_by=None if i % len(SEED_STATUSES) == 0 else self.reviewers[i % len(self.reviewers)],
+            )
+            for i, user in zip(range(start, size), users)
+        ], batch_size=1000)
+        self.size = size
+
+    def pages(self):
+        """[(頁面名稱, 登入使用者, 網址)]"""
+        pending = Application.objects.get(user=self.applicants['PENDING'])
+        approved = Application.objects.get(user=self.applicants['APPROVED'])
+        additional = Application.objects.get(user=self.applicants['ADDITIONAL_REQUIRED'])
+        return [
+            ('home', None, reverse('home')),
+            ('user_login', None, reverse('user_login')),
+            ('user_register', None, reverse('user_register')),
+            ('application_create', self.applicants['NONE'], reverse('application_create')),
+            ('application_status', self.applicants['PENDING'], reverse('application_status')),
+            ('application_status (無申請)', self.applicants['NONE'], reverse('application_status')),
+            ('application_status_api', self.applicants['PENDING'], reverse('application_status_api')),
+            ('application_update', self.applicants['ADDITIONAL_REQUIRED'], reverse('application_update', args=[additional.pk])),
+            ('application_success', self.applicants['APPROVED'], reverse('application_success', args=[approved.pk])),
+            ('admin changelist', self.admin, reverse('admin:applications_application_changelist')),
+            ('admin changelist (審核中)', self.admin, reverse('admin:applications_application_changelist') + '?status__exact=PENDING'),
+            ('admin change', self.admin, reverse('admin:applications_application_change', args=[pending.pk])),
+            ('admin dashboard', self.admin, reverse('admin:applications_application_dashboard')),
+            ('admin claims', self.admin, reverse('admin:applications_application_claims')),
+        ]
+
+    def measure(self, sizes, profile=None):
+        """在每個資料量下請求所有頁面，回傳累計的 QueryProfile"""
+        profile = profile or QueryProfile()
+        for size in sorted(sizes):
+            self.grow_to(size)
+            for page, user, url in self.pages():
+                client = Client()
+                if user is not None:
+                    client.force_login(user)
+                client.get(url)
+                cache.clear()
+                with profile.record(page, size):
+                    response = client.get(url)
+                profile.statuses[page][size] = response.status_code
+        return profile
@@ -0,0 +1,96 @@
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+# token bucket 使用獨立的快取，清除一般快取時不會重置限制，測試中也可單獨清除
+RATE_LIMIT_CACHE_ALIAS = 'ratelimit'
+
+
+def client_ip(request):
+    """請求來源 IP
+
+    設定 APPLICATION_CLIENT_IP_HEADER（例如 HTTP_X_FORWARDED_FOR）時取該標頭的最後一個值，
+    即最外層受信任的反向代理所看到的位址；最左邊的值可由用戶端任意偽造，不能用來限流。
+    """
+    header = getattr(settings, 'APPLICATION_CLIENT_IP_HEADER', None)
+    if header and request.META.get(header):
+        return request.META[header].split(',')[-1].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def login_buckets(request, username):
+    """登入嘗試要扣除的 token bucket：{快取鍵值: (容量, 每秒補充的 token 數)}"""
+    limits = settings.APPLICATION_LOGIN_RATE_LIMITS
+    buckets = {}
+    if 'ip' in limits:
+        buckets[f'login:ip:{client_ip(request)}'] = limits['ip']
+    username = username.strip().lower()
+    if username and 'username' in limits:
+        # 帳號由用戶端輸入，以雜湊值作為鍵值避免過長或含有快取不接受的字元
+        digest = hashlib.sha256(username.encode()).hexdigest()
+        buckets[f'login:user:{digest}'] = limits['username']
+    return {key: (capacity, per_minute / 60) for key, (capacity, per_minute) in buckets.items()}
+
+
+def _refill(state, capacity, rate, now):
+    """依經過時間補充 token，state 為 None（從未使用或已過期）時視為滿的"""
+    if state is None:
+        return capacity
+    tokens, updated_at = state
+    return min(capacity, tokens + max(0.0, now - updated_at) * rate)
+
+
+def take_tokens(buckets, now=None):
+    """從每個 bucket 各取一個 token，任一不足時都不扣除並回傳需等待的秒數，否則回傳 None
+
+    不論 bucket 數量，固定只有一次 get_many 與一次 set_many。讀取與寫入之間不加鎖，
+    同時到達的請求可能多取到幾個 token，多出的量不超過同時進行的請求數。
+    """
+    cache = caches[RATE_LIMIT_CACHE_ALIAS]
+    now = time.time() if now is None else now
+    states = cache.get_many(buckets)
+    tokens = {key: _refill(states.get(key), capacity, rate, now) for key, (capacity, rate) in buckets.items()}
+
+    waits = [(1 - tokens[key]) / rate for key, (_, rate) in buckets.items() if tokens[key] < 1]
+    if waits:
+        return max(waits)
+
+    # bucket 在 capacity / rate 秒後必定補滿，屆時讓快取自行淘汰，記憶體用量只與近期的來源數量有關
+    timeout = math.ceil(max(capacity / rate for capacity, rate in buckets.values())) if buckets else None
+    cache.set_many({key: (tokens[key] - 1, now) for key in buckets}, timeout)
+    return None
+
+
+def return_tokens(buckets, now=None):
+    """歸還 take_tokens() 取走的 token，已過期（即已補滿）的 bucket 不必寫回"""
+    cache = caches[RATE_LIMIT_CACHE_ALIAS]
+    now = time.time() if now is None else now
+    states = cache.get_many(buckets)
+    if not states:
+        return
+    refunded = {}
+    for key, state in states.items():
+        capacity, rate = buckets[key]
+        refunded[key] = (min(capacity, _refill(state, capacity, rate, now) + 1), now)
+    cache.set_many(refunded, math.ceil(max(capacity / rate for capacity, rate in buckets.values())))
+
+
+def take_login_attempt(request, username):
+    """在 authenticate() 之前扣除來源 IP 與帳號各一個 token，超過限制時回傳需等待的秒數，否則回傳 None"""
+    return take_tokens(login_buckets(request, username))
+
+
+def return_login_attempt(request, username):
+    """登入成功時歸還 token，只有失敗的嘗試會累計到限制中"""
+    return_tokens(login_buckets(request, username))
+
+
+def rate_limited_response(retry_after):
+    """超過限制時的 429 回應，不渲染模板也不讀寫 session"""
+    response = HttpResponse('登入嘗試次數過多，請稍後再試。', status=429, content_type='text/plain; charset=utf-8')
+    response['Retry-After'] = str(math.ceil(retry_after))
+    return response
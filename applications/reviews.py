@@ -0,0 +1,87 @@
+from dataclasses import dataclass
+
+from django.db import models, transaction
+from django.db.models import Q
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .cache import invalidate_user_applications
+from .models import Application
+from .notifications import enqueue_status_notifications
+from .stats import record_bulk_review
+from .transitions import log_bulk_transitions
+
+# 每批次更新的申請筆數
+DEFAULT_CHUNK_SIZE = 1000
+
+
+@dataclass
+class BulkReviewResult:
+    """批量審核的執行結果"""
+
+    updated: int = 0  # 成功更新的筆數
+    skipped: int = 0  # 因併發變更（已非審核中）或由其他審核人員認領而略過的筆數
+    chunks: int = 0  # 已處理的批次數
+
+
+def bulk_review(queryset, status, reviewer, rejection_reason=None, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """以分批的集合式 UPDATE 批量審核「審核中」的申請
+
+    每一批次以主鍵遞增取出 chunk_size 筆審核中的申請，並在同一個交易內以一條 UPDATE
+    寫入狀態、審核人員與時間戳記。時間戳記沿用 Application.save() 的語意：
+    已有的 reviewed_at / first_reviewed_at / approved_at 不會被覆寫。
+
+    審核中只能轉換為審核結果（見 transitions.ALLOWED_TRANSITIONS），每筆都會寫入轉換記錄。
+    UPDATE 條件同時限定 status='PENDING'，因此在取出主鍵後被其他人改過狀態的申請
+    不會被覆寫，而是計入 skipped；由其他審核人員認領且租約未到期的申請同樣計入 skipped。
+    每完成一個批次會更新審核統計、清除該批申請人的狀態快取、在提交後加入通知工作，並以目前的 BulkReviewResult 呼叫 progress。
+    """
+    if status == 'PENDING':
+        raise ValueError('批量審核的目標狀態不可為審核中')
+
+    result = BulkReviewResult()
+    pending = queryset.filter(status='PENDING').order_by('pk')
+    last_pk = 0
+
+    while True:
+        chunk = list(pending.filter(pk__gt=last_pk).values_list('pk', 'user_id')[:chunk_size])
+        if not chunk:
+            break
+        pks = [pk for pk, _ in chunk]
+        last_pk = pks[-1]
+
+        now = timezone.now()
+        values = {
+            'status': status,
+            'reviewed_by': reviewer,
+            'reviewed_at': Coalesce('reviewed_at', models.Value(now, output_field=models.DateTimeField())),
+            'first_reviewed_at': Coalesce('first_reviewed_at', models.Value(now, output_field=models.DateTimeField())),
+            'status_changed_at': now,
+            'claimed_by': None,
+            'claim_expires_at': None,
+            'updated_at': now,  # update() 不會觸發 auto_now，需自行設定
+        }
+        if status == 'APPROVED':
+            values['approved_at'] = Coalesce('approved_at', models.Value(now, output_field=models.DateTimeField()))
+        if rejection_reason is not None:
+            values['rejection_reason'] = rejection_reason
+
+        with transaction.atomic():
+            # 鎖定仍在審核中的資料列並取得更新前的時間戳記，供審核統計計算處理時間
+            # 由其他審核人員認領且租約未到期的申請不在此批量審核，計入 skipped
+            unclaimed = Q(claimed_by__isnull=True) | Q(claimed_by=reviewer) | Q(claim_expires_at__lte=now)
+            rows = list(Application.objects.filter(unclaimed, pk__in=pks, status='PENDING').select_for_update().values_list('pk', 'created_at', 'first_reviewed_at', 'approved_at', 'status_changed_at', 'account_name'))
+            updated = Application.objects.filter(pk__in=[row[0] for row in rows], status='PENDING').update(**values)
+            # update() 不會經過 Application.save() 與 post_save 信號，需自行寫入轉換記錄、更新審核統計、清除申請人的狀態快取並通知申請人
+            log_bulk_transitions([(row[0], row[5], 'PENDING', row[4]) for row in rows], status, reviewer, now, note=rejection_reason or '')
+            record_bulk_review(rows, status, now)
+            invalidate_user_applications(user_id for _, user_id in chunk)
+            enqueue_status_notifications((row[0], status, now) for row in rows)
+
+        result.updated += updated
+        result.skipped += len(chunk) - updated
+        result.chunks += 1
+        if progress is not None:
+            progress(result)
+
+    return result
@@ -0,0 +1,43 @@
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_user_applications
+from .metrics import install_query_wrapper
+from .models import Application
+from .notifications import enqueue_status_notifications
+from .stats import record_deleted, record_saved
+
+
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+def invalidate_application_cache(sender, instance, **kwargs):
+    """申請被儲存或刪除時清除申請人的狀態快取"""
+    invalidate_user_applications([instance.user_id])
+
+
+@receiver(post_save, sender=Application)
+def update_review_stats_on_save(sender, instance, created, raw=False, **kwargs):
+    """申請建立或狀態轉換時增量更新審核統計（loaddata 匯入的資料由 rebuild_review_stats 重算）"""
+    if not raw:
+        record_saved(instance, created)
+
+
+@receiver(post_delete, sender=Application)
+def update_review_stats_on_delete(sender, instance, **kwargs):
+    """申請刪除時扣除該狀態的申請數"""
+    record_deleted(instance)
+
+
+@receiver(post_save, sender=Application)
+def enqueue_notifications_on_save(sender, instance, created, raw=False, **kwargs):
+    """申請建立或狀態轉換時，在交易提交後加入通知申請人的背景工作"""
+    loaded_status = instance.loaded_values.get('status')
+    if not raw and (created or (loaded_status is not None and loaded_status != instance.status)):
+        enqueue_status_notifications([(instance.pk, instance.status, instance.status_changed_at)])
+
+
+@receiver(connection_created)
+def install_request_metrics(sender, connection, **kwargs):
+    """每條新開的資料庫連線都加上查詢計時，抽樣的請求不論查詢在哪個執行緒執行都會計入"""
+    install_query_wrapper(connection)
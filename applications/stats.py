@@ -0,0 +1,213 @@
+import random
+from bisect import bisect_left
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import Application, ReviewDailyStat, ReviewStatusCount
+
+# 處理時間分組的上限（小時），超過最後一個上限的歸入最後一組
+TURNAROUND_BUCKET_HOURS = (1, 2, 4, 8, 12, 24, 48, 72, 120, 168, 336, 720)
+_BUCKET_BOUNDS = [timedelta(hours=hours) for hours in TURNAROUND_BUCKET_HOURS]
+
+# 需要關注的審核佇列狀態
+QUEUE_STATUSES = ('PENDING', 'ADDITIONAL_REQUIRED')
+
+
+def turnaround_bucket(created_at, reached_at):
+    """處理時間所屬的分組編號"""
+    return bisect_left(_BUCKET_BOUNDS, reached_at - created_at)
+
+
+def bucket_label(bucket):
+    """分組的顯示文字"""
+    if bucket >= len(TURNAROUND_BUCKET_HOURS):
+        return f'超過 {TURNAROUND_BUCKET_HOURS[-1]} 小時'
+    return f'{TURNAROUND_BUCKET_HOURS[bucket]} 小時內'
+
+
+def histogram_percentile(histogram, pct):
+    """依 {分組: 筆數} 以最近排名法取得百分位數所在的分組，沒有資料時回傳 None"""
+    total = sum(histogram.values())
+    if not total:
+        return None
+    rank = max(1, -(-total * pct // 100))
+    seen = 0
+    for bucket in sorted(histogram):
+        seen += histogram[bucket]
+        if seen >= rank:
+            return bucket
+    return None
+
+
+def _increment(model, amount, **lookup):
+    """以 UPDATE ... SET count = count + n 增量更新統計的一個 shard，資料列不存在時建立"""
+    if not amount:
+        return
+    if model.objects.filter(**lookup).update(count=F('count') + amount):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(count=amount, **lookup)
+    except IntegrityError:
+        # 併發建立同一列時改為更新
+        model.objects.filter(**lookup).update(count=F('count') + amount)
+
+
+def apply_review_stats(status_deltas=None, daily_deltas=None):
+    """套用統計的增量
+
+    status_deltas 為 {狀態: 增減筆數}，daily_deltas 為 {(日期, 里程碑, 分組): 增減筆數}。
+    應在寫入申請的同一個交易中呼叫，申請寫入失敗時統計一併回復。
+
+    每次呼叫隨機選擇一個 shard 寫入所有增量，並依固定順序更新資料列：
+    併發的交易多半落在不同的資料列上，落在同一個 shard 時也以相同順序取得鎖，不會互相死結。
+    """
+    shard = random.randrange(settings.APPLICATION_REVIEW_STATS_SHARDS)
+    for status, amount in sorted((status_deltas or {}).items()):
+        _increment(ReviewStatusCount, amount, status=status, shard=shard)
+    for (date, milestone, bucket), amount in sorted((daily_deltas or {}).items()):
+        _increment(ReviewDailyStat, amount, date=date, milestone=milestone, bucket=bucket, shard=shard)
+
+
+def _milestones(created_at, first_reviewed_at=None, approved_at=None):
+    """產生 (日期, 里程碑, 分組)；只傳入本次新達成的里程碑時間"""
+    if first_reviewed_at is not None:
+        yield timezone.localdate(first_reviewed_at), 'REVIEWED', turnaround_bucket(created_at, first_reviewed_at)
+    if approved_at is not None:
+        yield timezone.localdate(approved_at), 'APPROVED', turnaround_bucket(created_at, approved_at)
+
+
+def count_review_stats(rows):
+    """依 [(狀態, created_at, first_reviewed_at, approved_at)] 計算完整的統計 (status_deltas, daily_deltas)
+
+    只使用傳入的欄位值，遷移中以歷史模型取出的資料也可直接計算。
+    """
+    status_deltas, daily_deltas = Counter(), Counter()
+    for status, created_at, first_reviewed_at, approved_at in rows:
+        status_deltas[status] += 1
+        daily_deltas[timezone.localdate(created_at), 'SUBMITTED', 0] += 1
+        daily_deltas.update(_milestones(created_at, first_reviewed_at, approved_at))
+    return status_deltas, daily_deltas
+
+
+def created_deltas(applications):
+    """新建立的申請對應的統計增量 (status_deltas, daily_deltas)，可先累加多批再一次套用"""
+    return count_review_stats(
+        (application.status, application.created_at, application.first_reviewed_at, application.approved_at) for application in applications
+    )
+
+
+def record_created(applications):
+    """記錄新建立的申請（包含 bulk_create 建立的申請）"""
+    apply_review_stats(*created_deltas(applications))
+
+
+def record_saved(application, created):
+    """依載入時記錄的欄位值，記錄一筆申請儲存時的狀態轉換與首次審核／通過
+
+    首次審核以 first_reviewed_at 判斷，重新送審後再次審核不會重複計入。
+    """
+    if created:
+        record_created([application])
+        return
+
+    loaded = application.loaded_values
+    status_deltas, daily_deltas = Counter(), Counter()
+    if 'status' in loaded and loaded['status'] != application.status:
+        status_deltas[loaded['status']] -= 1
+        status_deltas[application.status] += 1
+    first_reviewed_at = application.first_reviewed_at if 'first_reviewed_at' in loaded and loaded['first_reviewed_at'] is None else None
+    approved_at = application.approved_at if 'approved_at' in loaded and loaded['approved_at'] is None else None
+    daily_deltas.update(_milestones(application.created_at, first_reviewed_at, approved_at))
+    apply_review_stats(status_deltas, daily_deltas)
+
+
+def record_bulk_review(rows, status, reviewed_at):
+    """記錄批量審核，rows 為更新前的 [(主鍵, created_at, first_reviewed_at, approved_at, ...)]"""
+    daily_deltas = Counter()
+    for _, created_at, previous_first_reviewed_at, previous_approved_at, *_ in rows:
+        daily_deltas.update(_milestones(
+            created_at,
+            reviewed_at if previous_first_reviewed_at is None else None,
+            reviewed_at if status == 'APPROVED' and previous_approved_at is None else None,
+        ))
+    apply_review_stats({'PENDING': -len(rows), status: len(rows)}, daily_deltas)
+
+
+def record_deleted(application):
+    """記錄刪除的申請（每日統計保留歷史，不扣除）"""
+    apply_review_stats({application.loaded_values.get('status', application.status): -1})
+
+
+def write_review_stats(status_model, daily_model, status_counts, daily_counts):
+    """以計算好的完整統計取代統計表的內容（全部寫入 shard 0），回傳每日統計的資料列數
+
+    模型由呼叫端傳入，遷移中可使用歷史模型。
+    """
+    with transaction.atomic():
+        status_model.objects.all().delete()
+        daily_model.objects.all().delete()
+        status_model.objects.bulk_create([
+            status_model(status=status, count=status_counts.get(status, 0)) for status, _ in Application.STATUS_CHOICES
+        ])
+        daily_model.objects.bulk_create([
+            daily_model(date=date, milestone=milestone, bucket=bucket, count=count) for (date, milestone, bucket), count in daily_counts.items()
+        ], batch_size=1000)
+    return len(daily_counts)
+
+
+def rebuild_review_stats():
+    """依目前的申請資料重新計算所有統計（初次建立或修正偏差時使用）"""
+    rows = Application.objects.order_by().values_list('status', 'created_at', 'first_reviewed_at', 'approved_at').iterator(chunk_size=2000)
+    return write_review_stats(ReviewStatusCount, ReviewDailyStat, *count_review_stats(rows))
+
+
+def review_dashboard(days=14, turnaround_days=30):
+    """審核佇列儀表板資料
+
+    只讀取統計表中固定範圍的資料列，加上兩次以 (status, status_changed_at) 索引取得等待最久的申請，
+    查詢成本與申請總數無關。
+    """
+    today = timezone.localdate()
+    status_counts = dict(ReviewStatusCount.objects.order_by().values_list('status').annotate(count=Sum('count')))
+    statuses = [{'status': status, 'label': label, 'count': status_counts.get(status, 0)} for status, label in Application.STATUS_CHOICES]
+
+    now = timezone.now()
+    oldest = []
+    for status in QUEUE_STATUSES:
+        changed_at = Application.objects.filter(status=status).order_by('status_changed_at').values_list('status_changed_at', flat=True).first()
+        oldest.append({'label': dict(Application.STATUS_CHOICES)[status], 'changed_at': changed_at, 'age': now - changed_at if changed_at else None})
+
+    start = today - timedelta(days=max(days, turnaround_days) - 1)
+    daily = {today - timedelta(days=offset): Counter() for offset in range(days)}
+    histograms = {'REVIEWED': Counter(), 'APPROVED': Counter()}
+    turnaround_start = today - timedelta(days=turnaround_days - 1)
+    for date, milestone, bucket, count in ReviewDailyStat.objects.filter(date__gte=start).values_list('date', 'milestone', 'bucket', 'count'):
+        if date in daily:
+            daily[date][milestone] += count
+        if milestone in histograms and date >= turnaround_start:
+            histograms[milestone][bucket] += count
+
+    turnaround = []
+    for milestone, label in (('REVIEWED', '申請至首次審核'), ('APPROVED', '申請至通過')):
+        histogram = histograms[milestone]
+        median, p95 = histogram_percentile(histogram, 50), histogram_percentile(histogram, 95)
+        turnaround.append({
+            'label': label,
+            'count': sum(histogram.values()),
+            'median': bucket_label(median) if median is not None else '-',
+            'p95': bucket_label(p95) if p95 is not None else '-',
+        })
+
+    return {
+        'statuses': statuses,
+        'oldest': oldest,
+        'daily': [{'date': date, 'submitted': counts['SUBMITTED'], 'reviewed': counts['REVIEWED'], 'approved': counts['APPROVED']} for date, counts in daily.items()],
+        'turnaround': turnaround,
+        'turnaround_days': turnaround_days,
+    }
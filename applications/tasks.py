@@ -0,0 +1,140 @@
+import logging
+import os
+import random
+import socket
+import traceback
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F, Q, Subquery
+from django.utils import timezone
+
+from .models import BackgroundTask
+
+logger = logging.getLogger(__name__)
+
+# 已註冊的工作：{工作名稱: 處理函式}
+_handlers = {}
+
+
+def register(name):
+    """註冊背景工作的處理函式，函式以工作的 payload 作為關鍵字參數呼叫
+
+    工作可能因執行程序中斷或重試而執行超過一次，處理函式必須可以安全地重複執行。
+    """
+    def decorator(func):
+        _handlers[name] = func
+        return func
+    return decorator
+
+
+def enqueue_many(name, jobs, delay=None, max_attempts=None):
+    """在目前的交易提交後加入多筆工作，jobs 為 [(冪等鍵, payload)]
+
+    工作在交易提交後才寫入，回復的交易不會留下工作，執行程序也不會讀到尚未提交的資料；
+    不在交易中時立即寫入。冪等鍵已存在的工作會被略過（冪等鍵為 None 時一律加入）。
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return
+    run_after_delay = delay or timedelta(0)
+    max_attempts = max_attempts or settings.APPLICATION_TASK_MAX_ATTEMPTS
+
+    def insert():
+        run_after = timezone.now() + run_after_delay
+        BackgroundTask.objects.bulk_create([
+            BackgroundTask(name=name, payload=payload, idempotency_key=key, max_attempts=max_attempts, run_after=run_after)
+            for key, payload in jobs
+        ], ignore_conflicts=True)
+
+    transaction.on_commit(insert)
+
+
+def enqueue(name, payload=None, key=None, delay=None, max_attempts=None):
+    """在目前的交易提交後加入一筆工作，見 enqueue_many()"""
+    enqueue_many(name, [(key, payload or {})], delay=delay, max_attempts=max_attempts)
+
+
+def worker_id():
+    """執行程序的識別名稱：主機名稱、程序編號與隨機字串"""
+    return f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+
+
+def ready_tasks(now=None):
+    """可執行的工作：等待中且已到執行時間，或執行中但租約已到期（執行程序中斷），最早到期的在前"""
+    now = now or timezone.now()
+    return BackgroundTask.objects.filter(
+        Q(status='QUEUED', run_after__lte=now) | Q(status='RUNNING', locked_until__lte=now)
+    ).order_by('run_after', 'pk')
+
+
+def claim_tasks(worker, count, lease=None):
+    """為執行程序取出最多 count 筆可執行的工作並標記為執行中，回傳取出的工作
+
+    與 claims.claim_applications() 相同：支援 SKIP LOCKED 的資料庫以 SELECT ... FOR UPDATE SKIP LOCKED
+    取出，多個執行程序同時取工作時不必互相等待；SQLite 改以單一條件式 UPDATE 取出。
+    """
+    now = timezone.now()
+    locked_until = now + (lease or timedelta(seconds=settings.APPLICATION_TASK_LEASE_SECONDS))
+    ready = ready_tasks(now)
+    connection = connections[ready.db]
+    values = {'status': 'RUNNING', 'locked_by': worker, 'locked_until': locked_until, 'attempts': F('attempts') + 1}
+
+    with transaction.atomic():
+        if connection.features.has_select_for_update_skip_locked:
+            pks = list(ready.select_for_update(skip_locked=True).values_list('pk', flat=True)[:count])
+            BackgroundTask.objects.filter(pk__in=pks).update(**values)
+        else:
+            BackgroundTask.objects.filter(pk__in=Subquery(ready.values('pk')[:count])).update(**values)
+            pks = list(BackgroundTask.objects.filter(locked_by=worker, locked_until=locked_until).values_list('pk', flat=True))
+
+    return list(BackgroundTask.objects.filter(pk__in=pks).order_by('run_after', 'pk'))
+
+
+def retry_delay(attempts):
+    """第 attempts 次執行失敗後的重試等待時間：指數退避並加上最多 10% 的隨機延遲，避免同時失敗的工作同時重試"""
+    seconds = min(settings.APPLICATION_TASK_RETRY_BACKOFF_SECONDS * 2 ** (attempts - 1), settings.APPLICATION_TASK_RETRY_BACKOFF_MAX_SECONDS)
+    return timedelta(seconds=seconds * (1 + random.random() / 10))
+
+
+def run_task(task):
+    """執行一筆已取出的工作並記錄結果，回傳工作的新狀態
+
+    只更新仍由同一執行程序持有的工作；租約到期後已被其他程序重新取出的工作不會被覆寫。
+    失敗時依退避時間重新排入佇列，執行次數達到上限或工作未註冊時標記為已失敗。
+    """
+    mine = BackgroundTask.objects.filter(pk=task.pk, locked_by=task.locked_by, status='RUNNING')
+    handler = _handlers.get(task.name)
+    try:
+        if handler is None:
+            raise LookupError(f'未註冊的背景工作：{task.name}')
+        handler(**task.payload)
+    except Exception as e:
+        now = timezone.now()
+        error = traceback.format_exc()
+        if handler is None or task.attempts >= task.max_attempts:
+            logger.error('背景工作 %s #%s 執行失敗（第 %s 次），不再重試：%s', task.name, task.pk, task.attempts, e)
+            mine.update(status='FAILED', finished_at=now, locked_by='', locked_until=None, last_error=error)
+            return 'FAILED'
+        logger.warning('背景工作 %s #%s 執行失敗（第 %s 次），稍後重試：%s', task.name, task.pk, task.attempts, e)
+        mine.update(status='QUEUED', run_after=now + retry_delay(task.attempts), locked_by='', locked_until=None, last_error=error)
+        return 'QUEUED'
+    mine.update(status='SUCCEEDED', finished_at=timezone.now(), locked_by='', locked_until=None)
+    return 'SUCCEEDED'
+
+
+def run_ready_tasks(worker, count=100):
+    """在目前的執行緒中依序執行最多 count 筆可執行的工作，回傳各狀態的筆數（測試與單次執行使用）"""
+    results = {}
+    for task in claim_tasks(worker, count):
+        status = run_task(task)
+        results[status] = results.get(status, 0) + 1
+    return results
+
+
+def purge_finished_tasks(older_than):
+    """刪除完成時間早於 older_than（timedelta）的已完成工作，已失敗的工作保留供查看，回傳刪除的筆數"""
+    deleted, _ = BackgroundTask.objects.filter(status='SUCCEEDED', finished_at__lt=timezone.now() - older_than).delete()
+    return deleted
@@ -1,10 +1,42 @@
 from .test_admin import ApplicationAdminTest
+from .test_async_views import AsyncViewsTest
+from .test_cache import UserApplicationCacheTest
+from .test_claims import ClaimsTest
+from .test_commands import (
+    CleanupSessionsCommandTest,
+    ExportApplicationsCommandTest,
+    ImportApplicationsCommandTest,
+    LoadtestJourneyCommandTest,
+    SeedApplicationsCommandTest,
+)
+from .test_conditional import ConditionalGetTest
+from .test_exports import ExportsTest
 from .test_forms import (
     ApplicationFormTest,
     ApplicationUpdateFormTest,
     CustomUserCreationFormTest,
     LoginFormTest,
 )
+from .test_hashers import PasswordHasherPolicyTest
+from .test_metrics import RequestMetricsTest
+from .test_migrations import FirstReviewMigrationTest, ReviewStatsMigrationTest, TransitionIdentityMigrationTest, UniqueConstraintMigrationTest
 from .test_models import ApplicationModelTest
+from .test_pagination import KeysetPaginationTest
+from .test_polling import StatusPollingTest
+from .test_query_counts import QueryCountTest
+from .test_ratelimit import LoginRateLimitTest
+from .test_reviews import BulkReviewTest
+from .test_sessions import SessionProfileTest
+from .test_stats import ReviewStatsTest
+from .test_tasks import BackgroundTaskTest
+from .test_templates import TemplateCachingTest
+from .test_transitions import ApplicationTransitionTest
 from .test_urls import URLsTest
-from .test_views import ApplicationViewsTest, AuthenticationViewsTest, HomeViewTest
+from .test_validators import ValidatorsTest
+from .test_views import (
+    ApplicationReservationConcurrencyTest,
+    ApplicationReservationTest,
+    ApplicationViewsTest,
+    AuthenticationViewsTest,
+    HomeViewTest,
+)
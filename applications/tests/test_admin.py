@@ -1,7 +1,9 @@
 from django.contrib.admin.sites import AdminSite
 from django.contrib.auth.models import User
 from django.contrib.messages.storage.fallback import FallbackStorage
+from django.db import connection
 from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
 
 from applications.admin import ApplicationAdmin
 from applications.models import Application
@@ -61,10 +63,28 @@ class ApplicationAdminTest(TestCase):
         application.refresh_from_db()
         self.assertEqual(application.reviewed_by, self.admin_user)
 
+    def test_save_model_does_not_refetch_original(self):
+        """測試保存模型時不再查詢原始資料，且只更新變更過的欄位"""
+        Application.objects.create(user=self.user, account_name='test_account', phone_number='0912-345-678', address='台北市信義區信義路五段7號', status='PENDING')
+        application = Application.objects.get(user=self.user)
+        request = self.factory.post('/admin/')
+        request.user = self.admin_user
+
+        application.status = 'REJECTED'
+        with CaptureQueriesContext(connection) as queries:
+            self.admin.save_model(request, application, None, True)
+
+        self.assertFalse([query for query in queries if query['sql'].startswith('SELECT "applications_application"')])
+        update_sql = next(query['sql'] for query in queries if query['sql'].startswith('UPDATE "applications_application"'))
+        self.assertNotIn('"address"', update_sql)
+        self.assertEqual(application.reviewed_by, self.admin_user)
+
     def test_approve_applications_action(self):
         """測試批量通過申請動作"""
         # 創建待審核申請
-        applications = [Application.objects.create(user=self.user, account_name=f'test_account_{i}', phone_number='0912-345-678', address='台北市信義區信義路五段7號', status='PENDING') for i in range(3)]
+        # 每位使用者只能有一筆申請，因此為每筆申請建立不同的申請人
+        applicants = [User.objects.create_user(username=f'applicant_{i}', email=f'applicant_{i}@example.com', password='testpass123') for i in range(3)]
+        applications = [Application.objects.create(user=applicant, account_name=f'test_account_{i}', phone_number='0912-345-678', address='台北市信義區信義路五段7號', status='PENDING') for i, applicant in enumerate(applicants)]
 
         request = self.factory.post('/admin/')
         request.user = self.admin_user
@@ -83,7 +103,9 @@ class ApplicationAdminTest(TestCase):
     def test_reject_applications_action(self):
         """測試批量拒絕申請動作"""
         # 創建待審核申請
-        applications = [Application.objects.create(user=self.user, account_name=f'test_account_{i}', phone_number='0912-345-678', address='台北市信義區信義路五段7號', status='PENDING') for i in range(2)]
+        # 每位使用者只能有一筆申請，因此為每筆申請建立不同的申請人
+        applicants = [User.objects.create_user(username=f'applicant_{i}', email=f'applicant_{i}@example.com', password='testpass123') for i in range(2)]
+        applications = [Application.objects.create(user=applicant, account_name=f'test_account_{i}', phone_number='0912-345-678', address='台北市信義區信義路五段7號', status='PENDING') for i, applicant in enumerate(applicants)]
 
         request = self.factory.post('/admin/')
         request.user = self.admin_user
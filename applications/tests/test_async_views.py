@@ -0,0 +1,125 @@
+from io import BytesIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import resolve, reverse
+
+from applications import async_views
+from applications.models import Application
+from securities_system.asgi import application
+
+
+@override_settings(ROOT_URLCONF='securities_system.asgi_urls')
+class AsyncViewsTest(TestCase):
+    """ASGI 部署使用的非同步視圖測試"""
+
+    def setUp(self):
+        """設置測試資料"""
+        cache.clear()
+        self.async_client = AsyncClient()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123', first_name='測試用戶')
+
+    def test_asgi_urls_use_async_views(self):
+        """測試 ASGI 路由指向非同步視圖"""
+        self.assertEqual(resolve(reverse('application_status')).func, async_views.application_status)
+
+    @override_settings(ROOT_URLCONF='securities_system.urls')
+    def test_asgi_application_selects_async_urls(self):
+        """測試 ASGI 應用程式逐請求指定 asgi_urls，不需變更 ROOT_URLCONF"""
+        scope = {'type': 'http', 'method': 'GET', 'path': '/application/status/', 'query_string': b'', 'headers': []}
+        request, _ = application.create_request(scope, BytesIO())
+
+        self.assertEqual(resolve(request.path_info, urlconf=request.urlconf).func, async_views.application_status)
+
+    async def test_home_anonymous_user(self):
+        """測試未登入用戶訪問首頁"""
+        response = await self.async_client.get(reverse('home'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '歡迎使用證券帳號申請系統')
+
+    async def test_home_authenticated_user_redirects(self):
+        """測試已登入用戶訪問首頁會重定向"""
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse('home'))
+        self.assertRedirects(response, reverse('application_status'), fetch_redirect_response=False)
+
+    async def test_status_requires_login(self):
+        """測試查看狀態需要登入"""
+        response = await self.async_client.get(reverse('application_status'))
+        self.assertRedirects(response, '/accounts/login/?next=/application/status/', fetch_redirect_response=False)
+
+    async def test_status_with_application(self):
+        """測試查看狀態 - 有申請正常顯示"""
+        reviewer = await User.objects.acreate(username='reviewer', first_name='審核員')
+        await Application.objects.acreate(user=self.user, account_name='test_account_001', phone_number='0912-345-678', address='台北市信義區信義路五段7號', status='APPROVED', reviewed_by=reviewer)
+
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse('application_status'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'test_account_001')
+        self.assertContains(response, '審核員')
+        self.assertContains(response, '測試用戶')  # 導覽列的使用者名稱
+
+    async def test_create_post_valid(self):
+        """測試有效申請提交"""
+        await self.async_client.aforce_login(self.user)
+        data = {'account_name': 'test_account_001', 'phone_number': '0912-345-678', 'address': '台北市信義區信義路五段7號'}
+        response = await self.async_client.post(reverse('application_create'), data)
+        self.assertRedirects(response, reverse('application_status'), fetch_redirect_response=False)
+        self.assertTrue(await Application.objects.filter(user=self.user).aexists())
+
+    async def test_create_post_duplicate_account_name(self):
+        """測試帳號名稱重複時顯示表單錯誤"""
+        other_user = await User.objects.acreate(username='otheruser')
+        await Application.objects.acreate(user=other_user, account_name='taken_name', phone_number='0912-345-678', address='台北市信義區信義路五段7號')
+
+        await self.async_client.aforce_login(self.user)
+        data = {'account_name': 'taken_name', 'phone_number': '0912-345-678', 'address': '台北市信義區信義路五段7號'}
+        response = await self.async_client.post(reverse('application_create'), data)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '此帳號名稱已被使用')
+
+    async def test_update_post_valid(self):
+        """測試補件更新會重置為審核中"""
+        application = await Application.objects.acreate(user=self.user, account_name='test_account_001', phone_number='0912-345-678', address='台北市信義區信義路五段7號', status='ADDITIONAL_REQUIRED')
+
+        await self.async_client.aforce_login(self.user)
+        data = {'account_name': 'test_account_001', 'phone_number': '0912-999-888', 'address': '台北市大安區敦化南路二段100號'}
+        response = await self.async_client.post(reverse('application_update', args=[application.id]), data)
+        self.assertRedirects(response, reverse('application_status'), fetch_redirect_response=False)
+
+        await application.arefresh_from_db()
+        self.assertEqual(application.status, 'PENDING')
+        self.assertEqual(application.phone_number, '0912-999-888')
+
+    async def test_update_to_taken_account_name_shows_original_application(self):
+        """測試補件失敗時以申請原本的資料重新顯示頁面"""
+        other_user = await User.objects.acreate(username='otheruser')
+        await Application.objects.acreate(user=other_user, account_name='taken_name', phone_number='0912-345-678', address='台北市信義區信義路五段7號')
+        application = await Application.objects.acreate(user=self.user, account_name='test_account_001', phone_number='0912-345-678', address='台北市信義區信義路五段7號', status='ADDITIONAL_REQUIRED', additional_info_required='請補充身分證影本')
+
+        await self.async_client.aforce_login(self.user)
+        data = {'account_name': 'taken_name', 'phone_number': '0912-345-678', 'address': '台北市信義區信義路五段7號'}
+        response = await self.async_client.post(reverse('application_update', args=[application.id]), data)
+        self.assertContains(response, '此帳號名稱已被使用')
+        self.assertContains(response, '請補充身分證影本')
+        self.assertEqual(response.context['application'].status, 'ADDITIONAL_REQUIRED')
+
+    async def test_update_other_users_application_404(self):
+        """測試無法更新其他用戶的申請"""
+        other_user = await User.objects.acreate(username='otheruser')
+        other_application = await Application.objects.acreate(user=other_user, account_name='other_account', phone_number='0912-111-222', address='高雄市前金區中正四路100號')
+
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse('application_update', args=[other_application.id]))
+        self.assertEqual(response.status_code, 404)
+
+    async def test_success_approved_status(self):
+        """測試成功頁面 - 已通過狀態"""
+        application = await Application.objects.acreate(user=self.user, account_name='test_account_001', phone_number='0912-345-678', address='台北市信義區信義路五段7號', status='APPROVED')
+
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse('application_success', args=[application.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '恭喜！申請已通過')
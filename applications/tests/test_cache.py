@@ -0,0 +1,102 @@
+from django.contrib.admin.sites import AdminSite
+from django.contrib.auth.models import User
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+
+from applications.admin import ApplicationAdmin
+from applications.cache import get_user_application
+from applications.models import Application
+
+
+class UserApplicationCacheTest(TestCase):
+    """使用者申請狀態快取測試"""
+
+    def setUp(self):
+        """設置測試資料"""
+        cache.clear()
+        self.factory = RequestFactory()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        self.admin_user = User.objects.create_user(username='admin', email='admin@example.com', password='adminpass123', is_staff=True, is_superuser=True)
+
+    def _create_application(self, **kwargs):
+        return Application.objects.create(user=self.user, account_name='test_account', phone_number='0912-345-678', address='台北市信義區信義路五段7號', **kwargs)
+
+    def _admin_request(self):
+        request = self.factory.post('/admin/')
+        request.user = self.admin_user
+        setattr(request, 'session', {})
+        setattr(request, '_messages', FallbackStorage(request))
+        return request
+
+    def test_cached_lookup_skips_database(self):
+        """測試第二次查詢直接由快取取得"""
+        application = self._create_application()
+
+        with self.assertNumQueries(1):
+            self.assertEqual(get_user_application(self.user.pk), application)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_user_application(self.user.pk), application)
+
+    def test_missing_application_is_cached(self):
+        """測試沒有申請的結果也會被快取"""
+        with self.assertNumQueries(1):
+            self.assertIsNone(get_user_application(self.user.pk))
+        with self.assertNumQueries(0):
+            self.assertIsNone(get_user_application(self.user.pk))
+
+    def test_create_invalidates_cached_absence(self):
+        """測試建立申請後不再回傳快取中的「無申請」"""
+        self.assertIsNone(get_user_application(self.user.pk))
+
+        application = self._create_application()
+
+        self.assertEqual(get_user_application(self.user.pk), application)
+
+    def test_save_invalidates_cache(self):
+        """測試 Application.save() 會清除快取"""
+        application = self._create_application()
+        get_user_application(self.user.pk)
+
+        application.status = 'ADDITIONAL_REQUIRED'
+        application.save()
+
+        self.assertEqual(get_user_application(self.user.pk).status, 'ADDITIONAL_REQUIRED')
+
+    def test_delete_invalidates_cache(self):
+        """測試刪除申請會清除快取"""
+        application = self._create_application()
+        get_user_application(self.user.pk)
+
+        application.delete()
+
+        self.assertIsNone(get_user_application(self.user.pk))
+
+    def test_admin_save_model_invalidates_cache(self):
+        """測試後台編輯申請會清除快取"""
+        application = self._create_application()
+        get_user_application(self.user.pk)
+
+        application.status = 'APPROVED'
+        ApplicationAdmin(Application, AdminSite()).save_model(self._admin_request(), application, None, True)
+
+        cached = get_user_application(self.user.pk)
+        self.assertEqual(cached.status, 'APPROVED')
+        self.assertEqual(cached.reviewed_by, self.admin_user)
+
+    def test_bulk_admin_action_invalidates_cache(self):
+        """測試後台批量動作會清除快取"""
+        self._create_application()
+        get_user_application(self.user.pk)
+
+        ApplicationAdmin(Application, AdminSite()).reject_applications(self._admin_request(), Application.objects.all())
+
+        self.assertEqual(get_user_application(self.user.pk).status, 'REJECTED')
+
+    def test_cached_application_includes_reviewer(self):
+        """測試快取的申請已載入審核人員，模板顯示時不需再查詢"""
+        self._create_application(status='APPROVED', reviewed_by=self.admin_user)
+        get_user_application(self.user.pk)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_user_application(self.user.pk).reviewed_by.username, 'admin')
@@ -0,0 +1,112 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from applications.claims import active_claims, claim_applications, release_claims
+from applications.forms import ApplicationAdminForm
+from applications.models import Application
+from applications.reviews import bulk_review
+from applications.transitions import transition
+
+
+class ClaimsTest(TestCase):
+    """審核佇列認領測試"""
+
+    def setUp(self):
+        """設置測試資料"""
+        self.reviewer = User.objects.create_user(username='reviewer', email='reviewer@example.com', password='reviewerpass123', is_staff=True, is_superuser=True)
+        self.other = User.objects.create_user(username='other', email='other@example.com', password='otherpass123', is_staff=True, is_superuser=True)
+        now = timezone.now()
+        self.applications = []
+        for i in range(5):
+            user = User.objects.create_user(username=f'user_{i}', email=f'user_{i}@example.com', password='testpass123')
+            application = Application.objects.create(user=user, account_name=f'test_account_{i}', phone_number='0912-345-678', address='台北市信義區信義路五段7號')
+            # 讓等待時間由舊到新依序排列
+            Application.objects.filter(pk=application.pk).update(status_changed_at=now - timedelta(hours=5 - i))
+            self.applications.append(application)
+
+    def test_claims_do_not_overlap(self):
+        """測試多位審核人員認領的申請不重疊，且優先認領等待最久的申請"""
+        mine = claim_applications(self.reviewer, 2)
+        theirs = claim_applications(self.other, 2)
+
+        self.assertEqual([a.pk for a in mine], [a.pk for a in self.applications[:2]])
+        self.assertEqual([a.pk for a in theirs], [a.pk for a in self.applications[2:4]])
+        self.assertEqual(Application.objects.filter(claimed_by=self.reviewer).count(), 2)
+        self.assertEqual(len(claim_applications(self.other, 10)), 1)
+        self.assertEqual(claim_applications(self.reviewer, 10), [])
+
+    def test_expired_claim_can_be_reclaimed(self):
+        """測試租約到期的認領可由其他審核人員重新認領"""
+        claim_applications(self.reviewer, 5, lease=timedelta(seconds=-1))
+
+        claimed = claim_applications(self.other, 5)
+
+        self.assertEqual(len(claimed), 5)
+        self.assertFalse(active_claims(self.reviewer).exists())
+
+    def test_release_claims(self):
+        """測試釋放認領後申請可再被認領"""
+        claim_applications(self.reviewer, 3)
+
+        self.assertEqual(release_claims(self.reviewer, [self.applications[0].pk]), 1)
+        self.assertEqual(active_claims(self.reviewer).count(), 2)
+        self.assertEqual(release_claims(self.reviewer), 2)
+        self.assertEqual(len(claim_applications(self.other, 5)), 5)
+
+    def test_transition_clears_claim(self):
+        """測試狀態轉換會釋放認領"""
+        claim_applications(self.reviewer, 1)
+        application = Application.objects.get(pk=self.applications[0].pk)
+
+        transition(application, 'APPROVED', actor=self.reviewer)
+
+        application.refresh_from_db()
+        self.assertIsNone(application.claimed_by)
+        self.assertIsNone(application.claim_expires_at)
+
+    def test_bulk_review_skips_applications_claimed_by_others(self):
+        """測試批量審核會略過其他審核人員認領中的申請，但可處理自己認領的申請"""
+        claim_applications(self.other, 2)
+        claim_applications(self.reviewer, 1)
+
+        result = bulk_review(Application.objects.all(), 'APPROVED', self.reviewer)
+
+        self.assertEqual((result.updated, result.skipped), (3, 2))
+        self.assertEqual(Application.objects.filter(status='PENDING', claimed_by=self.other).count(), 2)
+        self.assertFalse(Application.objects.filter(claimed_by=self.reviewer).exists())
+
+    def test_admin_form_rejects_changes_to_application_claimed_by_other(self):
+        """測試管理後台表單不可修改其他審核人員認領中的申請"""
+        claim_applications(self.other, 1)
+        application = Application.objects.get(pk=self.applications[0].pk)
+        data = {
+            'user': application.user_id,
+            'account_name': application.account_name,
+            'phone_number': '0912-345-678',
+            'address': '台北市信義區信義路五段7號',
+            'status': 'APPROVED',
+        }
+        form_class = type('ReviewerForm', (ApplicationAdminForm,), {'reviewer': self.reviewer})
+
+        self.assertFalse(form_class(data, instance=application).is_valid())
+        self.assertTrue(type('OtherForm', (ApplicationAdminForm,), {'reviewer': self.other})(data, instance=application).is_valid())
+
+    def test_claims_view(self):
+        """測試工作佇列頁面的認領、顯示與釋放"""
+        self.client.force_login(self.reviewer)
+        url = reverse('admin:applications_application_claims')
+
+        response = self.client.post(url, {'count': '2'})
+        self.assertRedirects(response, url)
+        self.assertEqual(active_claims(self.reviewer).count(), 2)
+
+        response = self.client.get(url)
+        self.assertContains(response, 'test_account_0')
+        self.assertNotContains(response, 'test_account_4')
+
+        self.client.post(url, {'release': '1'})
+        self.assertFalse(active_claims(self.reviewer).exists())
@@ -0,0 +1,273 @@
+import csv
+import json
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import authenticate
+from django.contrib.auth.models import User
+from django.contrib.sessions.backends.cached_db import SessionStore
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.core.servers.basehttp import WSGIServer
+from django.test import LiveServerTestCase, TestCase, override_settings
+from django.db.models import Sum
+from django.test.testcases import LiveServerThread, QuietWSGIRequestHandler
+from django.utils import timezone
+
+from applications.cache import get_user_application
+from applications.models import Application, ApplicationTransition, ReviewStatusCount
+from applications.validators import validate_application_records
+
+
+class ImportApplicationsCommandTest(TestCase):
+    """import_applications 管理指令測試"""
+
+    fields = ['username', 'email', 'first_name', 'account_name', 'phone_number', 'address']
+
+    def setUp(self):
+        """設置暫存目錄"""
+        cache.clear()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def _record(self, i, **overrides):
+        record = {'username': f'paper_{i}', 'email': f'paper_{i}@example.com', 'first_name': '紙本申請', 'account_name': f'paper_account_{i}', 'phone_number': '0912-345-678', 'address': '台北市信義區信義路五段7號'}
+        record.update(overrides)
+        return record
+
+    def _write_csv(self, records):
+        path = Path(self.tmpdir.name) / 'applications.csv'
+        with path.open('w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=self.fields)
+            writer.writeheader()
+            writer.writerows(records)
+        return path
+
+    def _import(self, path, *args):
+        out = StringIO()
+        call_command('import_applications', str(path), *args, stdout=out)
+        return out.getvalue()
+
+    def _errors(self, path):
+        with Path(f'{path}.errors.csv').open(encoding='utf-8') as f:
+            return list(csv.DictReader(f))
+
+    def test_import_csv_creates_users_and_applications(self):
+        """測試匯入 CSV 會分批建立使用者與申請"""
+        path = self._write_csv([self._record(i) for i in range(5)])
+
+        output = self._import(path, '--batch-size', '2')
+
+        self.assertIn('成功 5 筆', output)
+        self.assertEqual(Application.objects.count(), 5)
+        user = User.objects.get(username='paper_0')
+        self.assertFalse(user.has_usable_password())
+        self.assertEqual(user.applications.get().status, 'PENDING')
+
+    def test_import_jsonl(self):
+        """測試匯入 JSONL，無法解析的行會被拒絕"""
+        path = Path(self.tmpdir.name) / 'applications.jsonl'
+        lines = [json.dumps(self._record(i), ensure_ascii=False) for i in range(3)] + ['not json']
+        path.write_text('\n'.join(lines), encoding='utf-8')
+
+        output = self._import(path)
+
+        self.assertIn('成功 3 筆，拒絕 1 筆', output)
+        self.assertEqual(self._errors(path)[0]['reason'], '無法解析的資料列')
+
+    def test_invalid_rows_are_written_to_error_file(self):
+        """測試未通過表單規則的資料會連同原因寫入錯誤檔"""
+        path = self._write_csv([
+            self._record(0),
+            self._record(1, phone_number='02-1234-5678'),
+            self._record(2, account_name='_bad'),
+            self._record(3, username=''),
+        ])
+
+        output = self._import(path)
+
+        self.assertIn('成功 1 筆，拒絕 3 筆', output)
+        errors = self._errors(path)
+        self.assertEqual([row['line'] for row in errors], ['3', '4', '5'])
+        self.assertIn('phone_number', errors[0]['reason'])
+        self.assertIn('account_name', errors[1]['reason'])
+        self.assertIn('username', errors[2]['reason'])
+
+    def test_duplicates_are_rejected(self):
+        """測試與既有資料或同批資料重複的帳號名稱與申請人會被拒絕"""
+        existing_user = User.objects.create_user(username='existing', email='existing@example.com', password='testpass123')
+        Application.objects.create(user=existing_user, account_name='taken_name', phone_number='0912-345-678', address='台北市信義區信義路五段7號')
+        path = self._write_csv([
+            self._record(0, account_name='taken_name'),
+            self._record(1, username='existing'),
+            self._record(2),
+            self._record(3, account_name='paper_account_2'),
+        ])
+
+        output = self._import(path)
+
+        self.assertIn('成功 1 筆，拒絕 3 筆', output)
+        reasons = {row['line']: row['reason'] for row in self._errors(path)}
+        self.assertEqual(reasons, {'2': '此帳號名稱已被使用', '3': '使用者已有申請', '5': '同一批次中帳號名稱重複'})
+
+    def test_existing_user_without_application_is_reused(self):
+        """測試已註冊但尚未申請的使用者會沿用既有帳號"""
+        user = User.objects.create_user(username='paper_0', email='paper_0@example.com', password='testpass123')
+        self.assertIsNone(get_user_application(user.pk))  # 快取「尚無申請」
+
+        self._import(self._write_csv([self._record(0)]))
+
+        self.assertEqual(User.objects.filter(username='paper_0').count(), 1)
+        self.assertEqual(get_user_application(user.pk).account_name, 'paper_account_0')
+
+
+class ExportApplicationsCommandTest(TestCase):
+    """export_applications 管理指令測試"""
+
+    def setUp(self):
+        """設置測試資料與暫存目錄"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        for i, status in enumerate(['PENDING', 'APPROVED', 'PENDING']):
+            user = User.objects.create_user(username=f'applicant_{i}', email=f'applicant_{i}@example.com', password='testpass123')
+            Application.objects.create(user=user, account_name=f'account_{i}', phone_number='0912-345-678', address='台北市信義區信義路五段7號', status=status)
+
+    def _export(self, *args):
+        path = Path(self.tmpdir.name) / 'export.csv'
+        call_command('export_applications', '--output', str(path), *args, stdout=StringIO())
+        with path.open(encoding='utf-8-sig') as f:
+            return list(csv.reader(f))
+
+    def test_export_all(self):
+        """測試匯出所有申請"""
+        rows = self._export('--chunk-size', '1')
+
+        self.assertEqual(len(rows), 4)
+        self.assertEqual([row[1] for row in rows[1:]], ['applicant_0', 'applicant_1', 'applicant_2'])
+
+    def test_export_filters(self):
+        """測試依狀態與日期篩選匯出資料"""
+        self.assertEqual(len(self._export('--status', 'PENDING')), 3)
+        self.assertEqual(len(self._export('--since', '2000-01-01', '--until', '2000-12-31')), 1)
+
+    def test_invalid_date(self):
+        """測試無效的日期格式"""
+        with self.assertRaises(CommandError):
+            self._export('--since', 'yesterday')
+
+
+class CleanupSessionsCommandTest(TestCase):
+    """cleanup_sessions 管理指令測試"""
+
+    def _session(self, expiry):
+        session = SessionStore()
+        session['key'] = 'value'
+        session.set_expiry(expiry)
+        session.create()
+        return session.session_key
+
+    def test_only_expired_sessions_are_deleted(self):
+        """測試分批刪除過期的 session 並保留有效的 session"""
+        for _ in range(3):
+            self._session(timezone.now() - timedelta(days=1))
+        active = self._session(3600)
+        out = StringIO()
+
+        call_command('cleanup_sessions', '--batch-size', '2', stdout=out)
+
+        self.assertIn('已刪除 3 筆', out.getvalue())
+        self.assertEqual(list(Session.objects.values_list('session_key', flat=True)), [active])
+
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.cache')
+    def test_cache_engine_needs_no_cleanup(self):
+        """測試不使用資料庫的 session 不需清理"""
+        out = StringIO()
+
+        call_command('cleanup_sessions', stdout=out)
+
+        self.assertIn('無需清理', out.getvalue())
+
+
+class SeedApplicationsCommandTest(TestCase):
+    """seed_applications 管理指令測試"""
+
+    def _seed(self, *args):
+        out = StringIO()
+        call_command('seed_applications', '--rows', '40', '--batch-size', '15', '--processes', '1', '--reviewers', '2', '--force', *args, stdout=out)
+        return out.getvalue()
+
+    def test_seeded_applications_pass_form_rules(self):
+        """測試產生的申請都通過申請表單的驗證規則，且保留產生的申請時間"""
+        self._seed()
+
+        applications = Application.objects.filter(user__username__startswith='seed_')
+        self.assertEqual(applications.count(), 40)
+        records = applications.values('account_name', 'phone_number', 'address')
+        self.assertTrue(all(not errors for _, errors in validate_application_records(records)))
+        self.assertGreater(applications.values('created_at').distinct().count(), 1)
+        self.assertFalse(applications.filter(status='PENDING', reviewed_at__isnull=False).exists())
+        self.assertFalse(applications.exclude(status='PENDING').filter(reviewed_at__isnull=True).exists())
+
+    def test_users_share_one_password_hash(self):
+        """測試所有使用者共用同一個密碼雜湊，且可以登入"""
+        self._seed('--password', 'Shared-passw0rd')
+
+        self.assertEqual(User.objects.filter(username__startswith='seed_').values('password').distinct().count(), 1)
+        self.assertIsNotNone(authenticate(username='seed_7', password='Shared-passw0rd'))
+
+    def test_stats_and_transitions_are_recorded(self):
+        """測試寫入建立與審核的轉換記錄，並更新審核統計"""
+        self._seed()
+
+        reviewed = Application.objects.filter(reviewed_at__isnull=False).count()
+        self.assertEqual(ApplicationTransition.objects.count(), 40 + reviewed)
+        self.assertEqual(sum(ReviewStatusCount.objects.values_list('count', flat=True)), 40)
+        counts = dict(ReviewStatusCount.objects.order_by().values_list('status').annotate(count=Sum('count')))
+        for status, _ in Application.STATUS_CHOICES:
+            self.assertEqual(counts.get(status, 0), Application.objects.filter(status=status).count())
+
+    def test_existing_prefix_is_rejected(self):
+        """測試前綴已被使用時拒絕寫入"""
+        self._seed()
+
+        with self.assertRaises(CommandError):
+            self._seed()
+        self.assertEqual(Application.objects.count(), 40)
+
+    def test_requires_force_without_debug(self):
+        """測試 DEBUG 關閉時需加上 --force"""
+        with self.assertRaises(CommandError):
+            call_command('seed_applications', '--rows', '1', stdout=StringIO())
+
+
+class SingleThreadedLiveServerThread(LiveServerThread):
+    """逐一處理請求的測試伺服器，請求都在伺服器執行緒中使用測試資料庫的連線"""
+
+    def _create_server(self, connections_override=None):
+        return WSGIServer((self.host, self.port), QuietWSGIRequestHandler, allow_reuse_address=False)
+
+
+class LoadtestJourneyCommandTest(LiveServerTestCase):
+    """loadtest_journey 管理指令測試"""
+
+    # 測試資料庫是各執行緒共用同一連線的記憶體 SQLite，併發的請求會互相干擾
+    server_thread_class = SingleThreadedLiveServerThread
+
+    @override_settings(APPLICATION_METRICS_SAMPLE_RATE=1, APPLICATION_METRICS_SERVER_TIMING=True)
+    def test_every_journey_finishes(self):
+        """測試所有申請都要求補件時，補件後重新送審的申請會通過，沒有流程逾時，並由 Server-Timing 取得每個請求的查詢數"""
+        with tempfile.TemporaryDirectory() as directory:
+            output = Path(directory) / 'journey.json'
+            call_command(
+                'loadtest_journey', '--base-url', self.live_server_url, '--applicants', '4', '--concurrency', '2',
+                '--reviewers', '2', '--additional-ratio', '1', '--poll-interval', '0.1', '--journey-timeout', '30',
+                '--output', str(output), stdout=StringIO(),
+            )
+            result = json.loads(output.read_text())
+
+        self.assertEqual(result['journeys'], {'approved': 4})
+        self.assertEqual(ApplicationTransition.objects.filter(to_status='ADDITIONAL_REQUIRED').count(), 4)
+        self.assertTrue(all(stats['queries_per_request'] is not None for stats in result['endpoints'].values()))
@@ -0,0 +1,96 @@
+from django.contrib.auth.models import User
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from applications.models import Application
+
+
+class ConditionalGetTest(TestCase):
+    """申請狀態與申請通過頁面的條件式 GET 測試"""
+
+    def setUp(self):
+        """設置測試資料"""
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        self.application = Application.objects.create(user=self.user, account_name='test_account', phone_number='0912-345-678', address='台北市信義區信義路五段7號')
+        self.client.login(username='testuser', password='testpass123')
+
+    def test_status_page_sends_validators(self):
+        """測試申請狀態頁面附上 ETag、Last-Modified 並要求每次重新驗證"""
+        response = self.client.get(reverse('application_status'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+        self.assertIn('private', response['Cache-Control'])
+        self.assertIn('no-cache', response['Cache-Control'])
+
+    def test_unchanged_status_returns_304_without_rendering(self):
+        """測試申請未變更時回應 304，不渲染模板"""
+        etag = self.client.get(reverse('application_status'))['ETag']
+
+        with self.assertTemplateNotUsed('applications/status.html'):
+            response = self.client.get(reverse('application_status'), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_if_modified_since_alone_does_not_return_304(self):
+        """測試只帶 If-Modified-Since 時重新渲染（Last-Modified 不反映使用者資料的變更）"""
+        last_modified = self.client.get(reverse('application_status'))['Last-Modified']
+
+        response = self.client.get(reverse('application_status'), HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_changed_user_returns_new_page(self):
+        """測試導覽列顯示的使用者名稱或權限變更後舊的 ETag 失效"""
+        etag = self.client.get(reverse('application_status'))['ETag']
+        self.user.first_name = '王小明'
+        self.user.save()
+
+        response = self.client.get(reverse('application_status'), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '王小明')
+
+        etag = response['ETag']
+        self.user.is_staff = True
+        self.user.save()
+        self.assertEqual(self.client.get(reverse('application_status'), HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_changed_application_returns_new_page(self):
+        """測試申請變更後舊的 ETag 失效"""
+        etag = self.client.get(reverse('application_status'))['ETag']
+        self.application.status = 'REJECTED'
+        self.application.rejection_reason = '資料不完整'
+        self.application.save()
+
+        response = self.client.get(reverse('application_status'), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '資料不完整')
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_pending_messages_skip_conditional_response(self):
+        """測試有待顯示的訊息時一律重新渲染，且不附上 ETag"""
+        etag = self.client.get(reverse('application_status'))['ETag']
+        self.client.cookies[CookieStorage.cookie_name] = 'pending'
+
+        response = self.client.get(reverse('application_status'), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response)
+
+    def test_success_page_returns_304(self):
+        """測試申請通過頁面同樣支援條件式 GET"""
+        self.application.status = 'APPROVED'
+        self.application.save()
+        url = reverse('application_success', args=[self.application.id])
+        etag = self.client.get(url)['ETag']
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
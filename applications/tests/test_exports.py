@@ -0,0 +1,97 @@
+import csv
+import io
+import zipfile
+
+from django.contrib.admin.sites import AdminSite
+from django.contrib.auth.models import User
+from django.http import StreamingHttpResponse
+from django.test import RequestFactory, TestCase
+
+from applications.admin import ApplicationAdmin
+from applications.exports import EXPORT_COLUMNS, iter_export_rows, stream_export
+from applications.models import Application
+
+
+class ExportsTest(TestCase):
+    """申請資料串流匯出測試"""
+
+    def setUp(self):
+        """設置測試資料"""
+        self.reviewer = User.objects.create_user(username='reviewer', email='reviewer@example.com', password='testpass123', is_staff=True, is_superuser=True)
+        for i in range(3):
+            user = User.objects.create_user(username=f'applicant_{i}', email=f'applicant_{i}@example.com', password='testpass123')
+            Application.objects.create(user=user, account_name=f'account_{i}', phone_number='0912-345-678', address='台北市信義區信義路五段7號')
+        Application.objects.filter(account_name='account_0').update(status='APPROVED', reviewed_by=self.reviewer)
+
+    def _read_csv(self, content):
+        return list(csv.reader(io.StringIO(content.decode('utf-8-sig'))))
+
+    def test_rows_include_related_fields_in_one_query(self):
+        """測試匯出資料列在單一查詢中包含申請人與審核人員"""
+        with self.assertNumQueries(1):
+            rows = list(iter_export_rows(Application.objects.order_by('account_name')))
+
+        self.assertEqual(rows[0], [header for header, _ in EXPORT_COLUMNS])
+        self.assertEqual(len(rows), 4)
+        first = dict(zip(rows[0], rows[1]))
+        self.assertEqual(first['申請人帳號'], 'applicant_0')
+        self.assertEqual(first['申請人電子郵件'], 'applicant_0@example.com')
+        self.assertEqual(first['申請狀態'], '已通過')
+        self.assertEqual(first['審核人員'], 'reviewer')
+        self.assertEqual(dict(zip(rows[0], rows[2]))['審核人員'], '')
+
+    def test_csv_export(self):
+        """測試 CSV 匯出帶有 BOM 與所有資料列"""
+        content = b''.join(stream_export(Application.objects.order_by('account_name'), 'csv', chunk_size=2))
+
+        self.assertTrue(content.startswith('\ufeff'.encode('utf-8')))
+        rows = self._read_csv(content)
+        self.assertEqual([row[3] for row in rows[1:]], ['account_0', 'account_1', 'account_2'])
+
+    def test_xlsx_export_is_valid_workbook(self):
+        """測試 XLSX 匯出為可讀取的壓縮檔並包含所有資料列"""
+        content = b''.join(stream_export(Application.objects.order_by('account_name'), 'xlsx'))
+
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            self.assertIsNone(archive.testzip())
+            self.assertIn('xl/workbook.xml', archive.namelist())
+            sheet = archive.read('xl/worksheets/sheet1.xml').decode('utf-8')
+        self.assertEqual(sheet.count('<row>'), 4)
+        self.assertIn('account_2', sheet)
+        self.assertIn('台北市信義區信義路五段7號', sheet)
+
+    def test_formula_like_values_are_escaped(self):
+        """測試以公式字元開頭的欄位在 CSV 與 XLSX 中都會加上單引號，不會被試算表執行"""
+        Application.objects.filter(account_name='account_1').update(
+            address='=HYPERLINK("http://example.com","台北市")', rejection_reason='@SUM(1+1)', additional_info_required='\t-1+1'
+        )
+        queryset = Application.objects.filter(account_name='account_1')
+
+        row = dict(zip(*self._read_csv(b''.join(stream_export(queryset, 'csv')))))
+        self.assertEqual(row['詳細地址'], '\'=HYPERLINK("http://example.com","台北市")')
+        self.assertEqual(row['拒絕原因'], "'@SUM(1+1)")
+        self.assertEqual(row['需補充資料說明'], "'\t-1+1")
+        self.assertEqual(row['電話號碼'], '0912-345-678')
+
+        with zipfile.ZipFile(io.BytesIO(b''.join(stream_export(queryset, 'xlsx')))) as archive:
+            sheet = archive.read('xl/worksheets/sheet1.xml').decode('utf-8')
+        self.assertIn('<t xml:space="preserve">\'=HYPERLINK(', sheet)
+        self.assertIn('<t xml:space="preserve">\'@SUM(1+1)</t>', sheet)
+        self.assertNotIn('<t xml:space="preserve">=', sheet)
+
+    def test_admin_actions_return_streaming_response(self):
+        """測試 Admin 匯出動作回傳串流回應"""
+        request = RequestFactory().post('/admin/')
+        request.user = self.reviewer
+        admin = ApplicationAdmin(Application, AdminSite())
+
+        response = admin.export_applications_csv(request, Application.objects.filter(status='PENDING'))
+
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn('attachment; filename="applications-', response['Content-Disposition'])
+        self.assertEqual(len(self._read_csv(b''.join(response.streaming_content))), 3)
+
+        response = admin.export_applications_xlsx(request, Application.objects.all())
+        self.assertTrue(response['Content-Disposition'].endswith('.xlsx"'))
+        self.assertTrue(b''.join(response.streaming_content).startswith(b'PK'))
@@ -0,0 +1,63 @@
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, identify_hasher
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+# 測試使用低成本參數以加快速度
+LOW_COST = {'pbkdf2': {'iterations': 1000}, 'scrypt': {'work_factor': 2**10, 'block_size': 8, 'parallelism': 1}}
+
+
+@override_settings(APPLICATION_PASSWORD_HASHER_COST=LOW_COST)
+class PasswordHasherPolicyTest(TestCase):
+    """可調整成本的密碼雜湊與登入時自動重新雜湊測試"""
+
+    def setUp(self):
+        """設置測試資料"""
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+
+    def _login(self, password='testpass123'):
+        return self.client.post('/accounts/login/', {'username': 'testuser', 'password': password})
+
+    def _stored(self):
+        encoded = User.objects.get(pk=self.user.pk).password
+        hasher = identify_hasher(encoded)
+        return hasher.algorithm, hasher.decode(encoded)
+
+    def test_new_passwords_use_configured_cost(self):
+        """測試新密碼以設定的成本參數雜湊"""
+        algorithm, decoded = self._stored()
+
+        self.assertEqual((algorithm, decoded['iterations']), ('pbkdf2_sha256', 1000))
+
+    def test_login_rehashes_when_cost_changes(self):
+        """測試調整成本參數後，登入成功會以新的成本重新雜湊"""
+        with self.settings(APPLICATION_PASSWORD_HASHER_COST={**LOW_COST, 'pbkdf2': {'iterations': 2000}}):
+            self.assertEqual(self._login().status_code, 302)
+
+        self.assertEqual(self._stored()[1]['iterations'], 2000)
+
+    def test_login_upgrades_to_preferred_algorithm(self):
+        """測試切換演算法後，既有的 PBKDF2 雜湊會在登入成功時改為 scrypt"""
+        hashers = ['applications.hashers.TunedScryptPasswordHasher', 'applications.hashers.TunedPBKDF2PasswordHasher']
+        with self.settings(PASSWORD_HASHERS=hashers):
+            self.assertEqual(self._login().status_code, 302)
+            algorithm, decoded = self._stored()
+
+            self.assertEqual((algorithm, decoded['work_factor'], decoded['parallelism']), ('scrypt', 2**10, 1))
+            self.assertTrue(User.objects.get(pk=self.user.pk).check_password('testpass123'))
+
+    def test_failed_login_does_not_rehash(self):
+        """測試登入失敗不會改寫儲存的雜湊"""
+        before = User.objects.get(pk=self.user.pk).password
+
+        with self.settings(APPLICATION_PASSWORD_HASHER_COST={**LOW_COST, 'pbkdf2': {'iterations': 2000}}):
+            self.assertEqual(self._login('wrongpass').status_code, 200)
+
+        self.assertEqual(User.objects.get(pk=self.user.pk).password, before)
+
+    def test_default_django_hash_is_verified_and_rehashed(self):
+        """測試 Django 預設 PBKDF2 產生的既有雜湊仍可驗證，並於登入後改用設定的成本"""
+        hasher = PBKDF2PasswordHasher()
+        User.objects.filter(pk=self.user.pk).update(password=hasher.encode('testpass123', hasher.salt()))
+
+        self.assertEqual(self._login().status_code, 302)
+        self.assertEqual(self._stored()[1]['iterations'], 1000)
@@ -0,0 +1,126 @@
+import re
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import AsyncClient, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from applications.metrics import registry
+from applications.models import Application
+
+
+@override_settings(APPLICATION_METRICS_SAMPLE_RATE=1, APPLICATION_METRICS_SERVER_TIMING=True)
+class RequestMetricsTest(TestCase):
+    """請求指標 middleware 與 Prometheus 端點測試"""
+
+    def setUp(self):
+        """設置測試資料"""
+        cache.clear()
+        registry.reset()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        self.staff = User.objects.create_user(username='admin', email='admin@example.com', password='adminpass123', is_staff=True)
+        Application.objects.create(user=self.user, account_name='test_account', phone_number='0912-345-678', address='台北市信義區信義路五段7號')
+
+    def test_server_timing_reports_query_count(self):
+        """測試 Server-Timing 標頭的查詢數與實際執行的查詢數一致"""
+        self.client.force_login(self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('application_status'))
+
+        self.assertIn(f'desc="{len(queries)} queries"', response['Server-Timing'])
+        self.assertIn('tpl;dur=', response['Server-Timing'])
+        self.assertIn('total;dur=', response['Server-Timing'])
+
+    @override_settings(ROOT_URLCONF='securities_system.asgi_urls')
+    async def test_async_views_report_queries(self):
+        """測試非同步視圖在 sync_to_async 執行緒中的查詢也計入 Server-Timing 與直方圖"""
+        client = AsyncClient()
+        await client.aforce_login(self.user)
+
+        response = await client.get(reverse('application_status'))
+
+        queries = int(re.search(r'desc="(\d+) queries"', response['Server-Timing']).group(1))
+        self.assertGreater(queries, 0)
+        self.assertNotIn('app_db_queries_per_request_sum{view="application_status"} 0', registry.render_prometheus())
+
+    @override_settings(APPLICATION_METRICS_SAMPLE_RATE=0)
+    def test_unsampled_requests_are_not_measured(self):
+        """測試未抽樣的請求不附上標頭也不累計"""
+        response = self.client.get(reverse('user_login'))
+
+        self.assertNotIn('Server-Timing', response)
+        self.assertNotIn('user_login', registry.render_prometheus())
+
+    @override_settings(APPLICATION_METRICS_SERVER_TIMING=False)
+    def test_server_timing_is_only_shown_to_staff_by_default(self):
+        """測試未開啟 APPLICATION_METRICS_SERVER_TIMING 時只有管理人員的回應附上 Server-Timing，其他請求仍會累計"""
+        response = self.client.get(reverse('user_login'))
+        self.assertNotIn('Server-Timing', response)
+
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('application_status'))
+        self.assertNotIn('Server-Timing', response)
+        self.assertIn('app_request_duration_seconds_count{view="application_status"} 1', registry.render_prometheus())
+
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('metrics'))
+        self.assertIn('total;dur=', response['Server-Timing'])
+
+    @override_settings(ROOT_URLCONF='securities_system.asgi_urls', APPLICATION_METRICS_SERVER_TIMING=False)
+    async def test_async_server_timing_is_only_shown_to_staff_by_default(self):
+        """測試非同步請求同樣只對管理人員附上 Server-Timing"""
+        client = AsyncClient()
+        await client.aforce_login(self.user)
+        self.assertNotIn('Server-Timing', await client.get(reverse('application_status')))
+
+        await client.aforce_login(self.staff)
+        self.assertIn('Server-Timing', await client.get(reverse('application_status')))
+
+    @override_settings(ROOT_URLCONF='securities_system.asgi_urls', APPLICATION_STATUS_LONGPOLL_RECHECK_SECONDS=1)
+    async def test_long_poll_wait_is_excluded_from_duration(self):
+        """測試長輪詢等待狀態變更的時間不計入處理時間直方圖，另以 wait 回報於 Server-Timing"""
+        client = AsyncClient()
+        await client.aforce_login(self.user)
+        version = (await client.get(reverse('application_status_api'))).json()['version']
+        registry.reset()
+
+        response = await client.get(reverse('application_status_api'), {'since': version, 'wait': 1})
+
+        wait = float(re.search(r'wait;dur=([\d.]+)', response['Server-Timing']).group(1))
+        total = float(re.search(r'total;dur=([\d.]+)', response['Server-Timing']).group(1))
+        self.assertGreaterEqual(wait, 1000)
+        self.assertLess(total, 500)
+        duration = float(re.search(r'app_request_duration_seconds_sum\{view="application_status_api"\} ([\d.e-]+)', registry.render_prometheus()).group(1))
+        self.assertLess(duration, 0.5)
+
+    def test_histograms_are_grouped_by_url_name(self):
+        """測試直方圖依 URL 名稱累計，並記錄模板渲染時間"""
+        self.client.force_login(self.user)
+        self.client.get(reverse('application_status'))
+        self.client.get(reverse('application_status'))
+
+        output = registry.render_prometheus()
+
+        self.assertIn('app_request_duration_seconds_count{view="application_status"} 2', output)
+        self.assertIn('app_db_queries_per_request_bucket{view="application_status",le="+Inf"} 2', output)
+        self.assertIn('app_template_render_seconds_count{view="application_status"} 2', output)
+
+    def test_metrics_endpoint_requires_staff(self):
+        """測試一般使用者無法查看指標，管理人員可以"""
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('metrics'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '# TYPE app_request_duration_seconds histogram')
+
+    @override_settings(APPLICATION_METRICS_TOKEN='scrape-secret')
+    def test_metrics_endpoint_accepts_bearer_token(self):
+        """測試 Prometheus 以 Bearer token 抓取指標"""
+        self.assertEqual(self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+        self.assertEqual(self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer scrape-secret').status_code, 200)
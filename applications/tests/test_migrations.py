@@ -0,0 +1,141 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+from applications.stats import turnaround_bucket
+
+
+class MigrationTestCase(TransactionTestCase):
+    """遷移測試的基底：回到 migrate_from 的資料表結構建立資料，測試結束後回到最新的遷移"""
+
+    migrate_from = None
+
+    def setUp(self):
+        """回到 migrate_from，記錄當時的模型供建立資料"""
+        self.old_apps = self.migrate(self.migrate_from)
+
+    def tearDown(self):
+        """刪除測試資料並回到最新的遷移"""
+        self.old_apps.get_model('applications', 'Application').objects.all().delete()
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def migrate(self, target):
+        """遷移到 target，回傳該遷移的模型"""
+        executor = MigrationExecutor(connection)
+        executor.migrate([target])
+        return executor.loader.project_state([target]).apps
+
+
+class UniqueConstraintMigrationTest(MigrationTestCase):
+    """0002 唯一約束遷移測試"""
+
+    migrate_from = ('applications', '0001_initial')
+    migrate_to = ('applications', '0002_application_indexes_and_constraints')
+
+    def _application(self, user, account_name):
+        Application = self.old_apps.get_model('applications', 'Application')
+        return Application.objects.create(user=user, account_name=account_name, phone_number='0912-345-678', address='台北市信義區信義路五段7號')
+
+    def test_duplicates_stop_migration_before_schema_changes(self):
+        """測試既有的重複申請會列在錯誤訊息中並中止遷移，刪除後可以完成遷移"""
+        User = self.old_apps.get_model('auth', 'User')
+        alice, bob = User.objects.create(username='alice'), User.objects.create(username='bob')
+        first = self._application(alice, 'shared_name')
+        second = self._application(alice, 'alice_second')
+        third = self._application(bob, 'shared_name')
+
+        with self.assertRaises(RuntimeError) as error:
+            self.migrate(self.migrate_to)
+
+        message = str(error.exception)
+        self.assertIn(f'使用者 id {alice.pk!r}：申請 {first.pk}, {second.pk}', message)
+        self.assertIn(f"帳號名稱 'shared_name'：申請 {first.pk}, {third.pk}", message)
+        self.assertNotIn(('applications', '0002_application_indexes_and_constraints'), MigrationExecutor(connection).recorder.applied_migrations())
+
+        self.old_apps.get_model('applications', 'Application').objects.filter(pk__in=[second.pk, third.pk]).delete()
+        self.migrate(self.migrate_to)
+
+
+class ReviewStatsMigrationTest(MigrationTestCase):
+    """0003 審核統計遷移的回填測試"""
+
+    migrate_from = ('applications', '0002_application_indexes_and_constraints')
+
+    def test_stats_migration_backfills_existing_applications(self):
+        """測試建立統計表的遷移會依既有的申請計算統計"""
+        User = self.old_apps.get_model('auth', 'User')
+        Application = self.old_apps.get_model('applications', 'Application')
+        for i, status in enumerate(['PENDING', 'PENDING', 'REJECTED']):
+            Application.objects.create(user=User.objects.create(username=f'applicant_{i}'), account_name=f'account_{i}', phone_number='0912-345-678',
+                                       address='台北市信義區信義路五段7號', status=status, reviewed_at=timezone.now() if status != 'PENDING' else None)
+
+        apps = self.migrate(('applications', '0003_review_stats'))
+
+        counts = dict(apps.get_model('applications', 'ReviewStatusCount').objects.values_list('status', 'count'))
+        self.assertEqual((counts['PENDING'], counts['REJECTED'], counts['APPROVED']), (2, 1, 0))
+        daily = apps.get_model('applications', 'ReviewDailyStat').objects
+        self.assertEqual(sum(daily.filter(milestone='SUBMITTED').values_list('count', flat=True)), 3)
+        self.assertEqual(sum(daily.filter(milestone='REVIEWED').values_list('count', flat=True)), 1)
+
+
+class FirstReviewMigrationTest(MigrationTestCase):
+    """0007 首次審核時間與統計分片遷移的回填測試"""
+
+    migrate_from = ('applications', '0006_background_tasks')
+
+    def test_first_review_is_backfilled_and_stats_are_rebuilt(self):
+        """測試首次審核時間由轉換記錄回填，重新送審後再次審核的申請只計入一次首次審核"""
+        User = self.old_apps.get_model('auth', 'User')
+        Application = self.old_apps.get_model('applications', 'Application')
+        ApplicationTransition = self.old_apps.get_model('applications', 'ApplicationTransition')
+        ReviewDailyStat = self.old_apps.get_model('applications', 'ReviewDailyStat')
+        now = timezone.now()
+        created_at, first_review, second_review = now - timedelta(hours=30), now - timedelta(hours=29), now - timedelta(hours=1)
+
+        resubmitted = Application.objects.create(user=User.objects.create(username='alice'), account_name='alice_account', phone_number='0912-345-678',
+                                                 address='台北市信義區信義路五段7號', status='APPROVED', reviewed_at=second_review, approved_at=second_review)
+        pending = Application.objects.create(user=User.objects.create(username='bob'), account_name='bob_account', phone_number='0912-345-678',
+                                             address='台北市信義區信義路五段7號')
+        Application.objects.update(created_at=created_at)
+        ApplicationTransition.objects.bulk_create([
+            ApplicationTransition(application=resubmitted, from_status='PENDING', to_status='ADDITIONAL_REQUIRED', created_at=first_review),
+            ApplicationTransition(application=resubmitted, from_status='ADDITIONAL_REQUIRED', to_status='PENDING', created_at=first_review + timedelta(hours=1)),
+            ApplicationTransition(application=resubmitted, from_status='PENDING', to_status='APPROVED', created_at=second_review),
+        ])
+        # 舊的統計在重新送審後的審核又計入了一次首次審核
+        ReviewDailyStat.objects.create(date=timezone.localdate(first_review), milestone='REVIEWED', bucket=0, count=1)
+        ReviewDailyStat.objects.create(date=timezone.localdate(second_review), milestone='REVIEWED', bucket=turnaround_bucket(created_at, second_review), count=1)
+
+        apps = self.migrate(('applications', '0007_review_stat_shards_and_first_review'))
+
+        Application = apps.get_model('applications', 'Application')
+        self.assertEqual(Application.objects.get(pk=resubmitted.pk).first_reviewed_at, first_review)
+        self.assertIsNone(Application.objects.get(pk=pending.pk).first_reviewed_at)
+        daily = apps.get_model('applications', 'ReviewDailyStat').objects
+        self.assertEqual(list(daily.filter(milestone='REVIEWED').values_list('bucket', 'count')), [(turnaround_bucket(created_at, first_review), 1)])
+        self.assertEqual(sum(daily.filter(milestone='SUBMITTED').values_list('count', flat=True)), 2)
+        counts = dict(apps.get_model('applications', 'ReviewStatusCount').objects.values_list('status', 'count'))
+        self.assertEqual((counts['APPROVED'], counts['PENDING']), (1, 1))
+
+
+class TransitionIdentityMigrationTest(MigrationTestCase):
+    """0008 轉換記錄識別欄位遷移的回填測試"""
+
+    migrate_from = ('applications', '0007_review_stat_shards_and_first_review')
+
+    def test_existing_logs_copy_application_identity(self):
+        """測試既有的轉換記錄補上申請編號與帳號名稱，刪除申請後仍保留"""
+        User = self.old_apps.get_model('auth', 'User')
+        Application = self.old_apps.get_model('applications', 'Application')
+        application = Application.objects.create(user=User.objects.create(username='alice'), account_name='alice_account', phone_number='0912-345-678', address='台北市信義區信義路五段7號')
+        self.old_apps.get_model('applications', 'ApplicationTransition').objects.create(application=application, from_status='', to_status='PENDING')
+
+        apps = self.migrate(('applications', '0008_transition_log_protection'))
+
+        apps.get_model('applications', 'Application').objects.filter(pk=application.pk).delete()
+        log = apps.get_model('applications', 'ApplicationTransition').objects.get()
+        self.assertEqual((log.application_id, log.application_number, log.account_name), (None, application.pk, 'alice_account'))
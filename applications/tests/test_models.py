@@ -1,5 +1,7 @@
 from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from applications.models import Application
@@ -30,7 +32,7 @@ class ApplicationModelTest(TestCase):
         """測試字串表示方法"""
         application = Application.objects.create(user=self.user, account_name='test_account_001', phone_number='0912-345-678', address='台北市信義區信義路五段7號')
 
-        expected_str = f"testuser - test_account_001 (審核中)"
+        expected_str = "testuser - test_account_001 (審核中)"
         self.assertEqual(str(application), expected_str)
 
     def test_application_status_properties(self):
@@ -110,3 +112,40 @@ class ApplicationModelTest(TestCase):
         applications = list(Application.objects.all())
         self.assertEqual(applications[0], app2)  # 最新的在前
         self.assertEqual(applications[1], app1)
+
+    def test_changed_fields_are_tracked(self):
+        """測試自資料庫載入後會追蹤被修改的欄位"""
+        Application.objects.create(user=self.user, account_name='test_account_001', phone_number='0912-345-678', address='台北市信義區信義路五段7號')
+        application = Application.objects.get(user=self.user)
+        self.assertEqual(application.get_changed_fields(), [])
+
+        application.status = 'REJECTED'
+        application.rejection_reason = '資料不完整'
+
+        self.assertEqual(application.get_changed_fields(), ['status', 'rejection_reason'])
+        self.assertTrue(application.has_field_changed('status'))
+        self.assertFalse(application.has_field_changed('address'))
+
+        application.save()
+        self.assertEqual(application.get_changed_fields(), [])
+        self.assertEqual(application.loaded_values['status'], 'REJECTED')
+
+    def test_save_updates_only_changed_columns(self):
+        """測試儲存時只 UPDATE 變更過的欄位"""
+        Application.objects.create(user=self.user, account_name='test_account_001', phone_number='0912-345-678', address='台北市信義區信義路五段7號')
+        application = Application.objects.get(user=self.user)
+        # 模擬其他人同時修改了地址
+        Application.objects.filter(pk=application.pk).update(address='新北市板橋區文化路一段100號')
+
+        application.status = 'APPROVED'
+        with CaptureQueriesContext(connection) as queries:
+            application.save()
+
+        update_sql = next(query['sql'] for query in queries if query['sql'].startswith('UPDATE "applications_application"'))
+        self.assertIn('"status"', update_sql)
+        self.assertIn('"approved_at"', update_sql)
+        self.assertNotIn('"address"', update_sql)
+        self.assertNotIn('"rejection_reason"', update_sql)
+        application.refresh_from_db()
+        self.assertEqual(application.address, '新北市板橋區文化路一段100號')
+        self.assertEqual(application.get_changed_fields(), [])
@@ -0,0 +1,102 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from applications.models import Application
+from applications.pagination import EstimatedCountPaginator, decode_cursor, encode_cursor, keyset_page
+
+
+class KeysetPaginationTest(TestCase):
+    """申請管理列表游標分頁測試"""
+
+    @classmethod
+    def setUpTestData(cls):
+        """建立 60 筆建立時間不同的申請（其中兩筆時間相同以測試 id 排序）"""
+        cls.admin_user = User.objects.create_superuser(username='admin', email='admin@example.com', password='adminpass123')
+        users = User.objects.bulk_create([User(username=f'applicant_{i}', password='!') for i in range(60)])
+        Application.objects.bulk_create([
+            Application(user=user, account_name=f'account_{i}', phone_number='0912-345-678', address='台北市信義區信義路五段7號')
+            for i, user in enumerate(users)
+        ])
+        base = timezone.now() - timedelta(days=1)
+        for i, application in enumerate(Application.objects.order_by('pk')):
+            Application.objects.filter(pk=application.pk).update(created_at=base + timedelta(minutes=min(i, 58)))
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin_user)
+        self.url = reverse('admin:applications_application_changelist')
+
+    def _ordered(self):
+        return Application.objects.order_by('-created_at', '-pk')
+
+    def test_cursor_round_trip(self):
+        """測試游標編碼與解析"""
+        created_at = timezone.now()
+        self.assertEqual(decode_cursor(encode_cursor('after', created_at, 42)), ('after', created_at, 42))
+        for invalid in ['', 'not-a-cursor', encode_cursor('sideways', created_at, 1)]:
+            self.assertIsNone(decode_cursor(invalid))
+
+    def test_keyset_pages_cover_all_rows_in_order(self):
+        """測試依游標往後翻頁會依序涵蓋所有資料，往前翻頁回到相同的資料"""
+        expected = list(self._ordered().values_list('pk', flat=True))
+        seen, cursor, pages = [], None, []
+        while True:
+            page = keyset_page(self._ordered(), decode_cursor(cursor), 25)
+            pages.append(page)
+            seen.extend(application.pk for application in page.object_list)
+            cursor = page.next_cursor
+            if not cursor:
+                break
+
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(pages), 3)
+        self.assertIsNone(pages[0].previous_cursor)
+        previous = keyset_page(self._ordered(), decode_cursor(pages[2].previous_cursor), 25)
+        self.assertEqual(previous.object_list, pages[1].object_list)
+        self.assertIsNotNone(previous.next_cursor)
+
+    def test_changelist_uses_cursor_without_offset(self):
+        """測試管理列表以游標分頁，查詢不使用 OFFSET"""
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.context['cl'].result_list), 25)
+        next_url = response.context['cl'].next_page_url
+        self.assertIsNotNone(next_url)
+        self.assertContains(response, '下一頁')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url + next_url)
+        cl = response.context['cl']
+        self.assertEqual([application.pk for application in cl.result_list], list(self._ordered().values_list('pk', flat=True)[25:50]))
+        self.assertIsNotNone(cl.first_page_url)
+        application_queries = [query['sql'] for query in queries if 'FROM "applications_application"' in query['sql']]
+        self.assertTrue(application_queries)
+        self.assertFalse(any('OFFSET' in sql for sql in application_queries))
+
+    def test_custom_ordering_falls_back_to_page_numbers(self):
+        """測試改依其他欄位排序時使用原本的頁碼分頁"""
+        response = self.client.get(self.url, {'o': '3'})
+
+        cl = response.context['cl']
+        self.assertFalse(cl.keyset_active)
+        self.assertEqual(len(cl.result_list), 25)
+
+    def test_estimated_count_is_cached(self):
+        """測試估計筆數模式會重複使用快取的計數"""
+        self.assertEqual(EstimatedCountPaginator(self._ordered(), 25).count, 60)
+        with self.assertNumQueries(0):
+            self.assertEqual(EstimatedCountPaginator(self._ordered(), 25).count, 60)
+
+    @override_settings(APPLICATION_ADMIN_ESTIMATED_COUNT=False)
+    def test_exact_count_mode(self):
+        """測試關閉估計筆數模式時每次都計數"""
+        paginator = EstimatedCountPaginator(self._ordered(), 25)
+        self.assertFalse(paginator.is_estimated)
+        with self.assertNumQueries(1):
+            self.assertEqual(paginator.count, 60)
@@ -0,0 +1,89 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+
+from applications.models import Application
+from applications.polling import _watches
+
+
+@override_settings(ROOT_URLCONF='securities_system.asgi_urls')
+class StatusPollingTest(TestCase):
+    """申請狀態 JSON API 與長輪詢測試"""
+
+    def setUp(self):
+        """設置測試資料"""
+        cache.clear()
+        self.async_client = AsyncClient()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        self.application = Application.objects.create(user=self.user, account_name='test_account', phone_number='0912-345-678', address='台北市信義區信義路五段7號')
+
+    def _request_additional_info(self):
+        """在交易提交後執行 on_commit 回呼，與正式環境相同地喚醒長輪詢"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.application.status = 'ADDITIONAL_REQUIRED'
+            self.application.additional_info_required = '請補充身分證影本'
+            self.application.save()
+
+    async def test_requires_login(self):
+        """測試未登入時回應 401 JSON"""
+        response = await self.async_client.get(reverse('application_status_api'))
+
+        self.assertEqual(response.status_code, 401)
+
+    async def test_returns_compact_status(self):
+        """測試回傳狀態欄位"""
+        await self.async_client.aforce_login(self.user)
+
+        data = (await self.async_client.get(reverse('application_status_api'))).json()
+
+        self.assertEqual(data['status'], 'PENDING')
+        self.assertIsNone(data['reviewed_at'])
+        self.assertFalse(data['can_be_updated'])
+        self.assertIn('version', data)
+
+    async def test_long_poll_wakes_on_status_change(self):
+        """測試長輪詢在狀態變更時立即回應"""
+        await self.async_client.aforce_login(self.user)
+        version = (await self.async_client.get(reverse('application_status_api'))).json()['version']
+
+        poll = asyncio.create_task(self.async_client.get(reverse('application_status_api'), {'since': version, 'wait': 30}))
+        await asyncio.sleep(0.2)
+        self.assertFalse(poll.done())
+        self.assertIn(self.user.pk, _watches)
+
+        await sync_to_async(self._request_additional_info)()
+        data = (await asyncio.wait_for(poll, 5)).json()
+
+        self.assertEqual(data['status'], 'ADDITIONAL_REQUIRED')
+        self.assertEqual(data['additional_info_required'], '請補充身分證影本')
+        self.assertNotIn(self.user.pk, _watches)
+
+    async def test_long_poll_returns_immediately_when_version_differs(self):
+        """測試 since 與目前版本不同時不等待"""
+        await self.async_client.aforce_login(self.user)
+
+        response = await asyncio.wait_for(self.async_client.get(reverse('application_status_api'), {'since': 'stale', 'wait': 30}), 5)
+
+        self.assertEqual(response.json()['status'], 'PENDING')
+
+    @override_settings(APPLICATION_STATUS_LONGPOLL_RECHECK_SECONDS=1)
+    async def test_long_poll_times_out(self):
+        """測試等待逾時後回傳原本的狀態"""
+        await self.async_client.aforce_login(self.user)
+        version = (await self.async_client.get(reverse('application_status_api'))).json()['version']
+
+        data = (await self.async_client.get(reverse('application_status_api'), {'since': version, 'wait': 1})).json()
+
+        self.assertEqual(data['version'], version)
+
+    async def test_invalid_wait(self):
+        """測試 wait 不是整數時回應 400"""
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.get(reverse('application_status_api'), {'wait': 'soon'})
+
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,36 @@
+import os
+
+from django.test import TestCase
+
+from applications.querycount import QueryCountScenario, QueryProfile, fingerprint
+
+# 量測的申請數；以 QUERY_COUNT_SIZES=1,100,10000 加入較大的資料量
+SIZES = tuple(int(size) for size in os.environ.get('QUERY_COUNT_SIZES', '1,100').split(','))
+
+
+class QueryCountTest(TestCase):
+    """各申請人頁面與管理頁面的查詢數不可隨資料量增加"""
+
+    def test_fingerprint_normalizes_literals(self):
+        """測試 SQL 指紋將常數與 IN 清單正規化"""
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE id IN (1, 2, 3) AND name = 'a''b'  AND  x = 1.5"),
+            fingerprint("SELECT * FROM t WHERE id IN (7) AND name = 'c' AND x = 2"),
+        )
+
+    def test_growing_pages(self):
+        """測試查詢數增加的頁面會被列出"""
+        profile = QueryProfile()
+        profile.counts['constant'] = {1: 3, 100: 3}
+        profile.counts['n_plus_one'] = {1: 3, 100: 102}
+
+        self.assertEqual(profile.growing_pages(), {'n_plus_one': {1: 3, 100: 102}})
+
+    def test_query_counts_do_not_grow_with_data(self):
+        """測試所有頁面在不同資料量下的查詢數相同"""
+        profile = QueryCountScenario().measure(SIZES)
+
+        for page, statuses in profile.statuses.items():
+            for size, status in statuses.items():
+                self.assertEqual(status, 200, f'{page} 在 {size} 筆申請時回應 {status}')
+        self.assertEqual(profile.growing_pages(), {}, '\n' + profile.report())
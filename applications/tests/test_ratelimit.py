@@ -0,0 +1,79 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from applications.ratelimit import RATE_LIMIT_CACHE_ALIAS, take_tokens
+
+# 測試使用小容量的 bucket：IP 5 次、帳號 3 次，每分鐘各補充 1 次
+LIMITS = {'ip': (5, 1), 'username': (3, 1)}
+
+
+@override_settings(APPLICATION_LOGIN_RATE_LIMITS=LIMITS)
+class LoginRateLimitTest(TestCase):
+    """登入限流測試"""
+
+    def setUp(self):
+        """設置測試資料"""
+        caches[RATE_LIMIT_CACHE_ALIAS].clear()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+
+    def _login(self, username='testuser', password='wrongpass', ip='10.0.0.1'):
+        return self.client.post('/accounts/login/', {'username': username, 'password': password}, REMOTE_ADDR=ip)
+
+    def test_token_bucket_refills_over_time(self):
+        """測試 token 用完後拒絕，並依經過時間補充"""
+        buckets = {'bucket': (2, 1.0)}
+
+        self.assertIsNone(take_tokens(buckets, now=100.0))
+        self.assertIsNone(take_tokens(buckets, now=100.0))
+        self.assertAlmostEqual(take_tokens(buckets, now=100.5), 0.5)
+        self.assertIsNone(take_tokens(buckets, now=101.0))
+
+    def test_rejected_bucket_does_not_consume_other_buckets(self):
+        """測試任一 bucket 不足時，其他 bucket 的 token 也不會被扣除"""
+        take_tokens({'empty': (1, 1.0)}, now=100.0)
+
+        self.assertIsNotNone(take_tokens({'empty': (1, 1.0), 'other': (1, 1.0)}, now=100.0))
+        self.assertIsNone(take_tokens({'other': (1, 1.0)}, now=100.0))
+
+    def test_username_limit_rejects_before_authenticate(self):
+        """測試同一帳號失敗次數超過限制後，直接回應 429 且不執行密碼驗證"""
+        # 固定限流使用的時鐘，請求之間補充的 token 不影響 Retry-After
+        with mock.patch('applications.ratelimit.time') as clock:
+            clock.time.return_value = 1000.0
+            for i in range(3):
+                self.assertEqual(self._login(ip=f'10.0.0.{i}').status_code, 200)
+
+            with mock.patch('applications.views.authenticate') as authenticate:
+                response = self._login(password='testpass123', ip='10.0.0.99')
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '60')
+        authenticate.assert_not_called()
+
+    def test_ip_limit_applies_across_usernames(self):
+        """測試同一 IP 嘗試不同帳號仍受 IP 限制，其他 IP 不受影響"""
+        for i in range(5):
+            self.assertEqual(self._login(username=f'user{i}').status_code, 200)
+
+        self.assertEqual(self._login(username='user5').status_code, 429)
+        self.assertEqual(self._login(ip='10.0.0.2').status_code, 200)
+
+    def test_successful_login_returns_tokens(self):
+        """測試登入成功會歸還 token，只有失敗的嘗試累計到限制"""
+        for _ in range(5):
+            self.assertEqual(self._login(password='testpass123').status_code, 302)
+            self.client.logout()
+
+        self.assertEqual(self._login().status_code, 200)
+
+    @override_settings(APPLICATION_CLIENT_IP_HEADER='HTTP_X_FORWARDED_FOR')
+    def test_client_ip_header_uses_last_proxy_address(self):
+        """測試設定代理標頭時以最後一個位址限流，偽造最左邊的位址無法繞過"""
+        for i in range(5):
+            self.client.post('/accounts/login/', {'username': f'user{i}', 'password': 'x'}, HTTP_X_FORWARDED_FOR=f'1.1.1.{i}, 10.0.0.1')
+
+        response = self.client.post('/accounts/login/', {'username': 'user5', 'password': 'x'}, HTTP_X_FORWARDED_FOR='1.1.1.9, 10.0.0.1')
+        self.assertEqual(response.status_code, 429)
@@ -0,0 +1,98 @@
+from contextlib import contextmanager
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.test import TestCase
+from django.utils import timezone
+
+from applications.models import Application
+from applications.reviews import bulk_review
+
+
+class BulkReviewTest(TestCase):
+    """bulk_review 批量審核測試"""
+
+    def setUp(self):
+        """設置測試資料"""
+        self.reviewer = User.objects.create_user(username='reviewer', email='reviewer@example.com', password='reviewerpass123', is_staff=True)
+        self.applications = []
+        for i in range(5):
+            user = User.objects.create_user(username=f'user_{i}', email=f'user_{i}@example.com', password='testpass123')
+            self.applications.append(Application.objects.create(user=user, account_name=f'test_account_{i}', phone_number='0912-345-678', address='台北市信義區信義路五段7號'))
+
+    def test_approve_sets_review_fields(self):
+        """測試批量通過會設定審核人員與時間戳記"""
+        result = bulk_review(Application.objects.all(), 'APPROVED', self.reviewer)
+
+        self.assertEqual(result.updated, 5)
+        self.assertEqual(result.skipped, 0)
+        for application in Application.objects.all():
+            self.assertEqual(application.status, 'APPROVED')
+            self.assertEqual(application.reviewed_by, self.reviewer)
+            self.assertIsNotNone(application.reviewed_at)
+            self.assertIsNotNone(application.approved_at)
+
+    def test_reject_sets_reason_without_approved_at(self):
+        """測試批量拒絕會寫入拒絕原因且不設定通過時間"""
+        bulk_review(Application.objects.all(), 'REJECTED', self.reviewer, rejection_reason='資料不符')
+
+        for application in Application.objects.all():
+            self.assertEqual(application.status, 'REJECTED')
+            self.assertEqual(application.rejection_reason, '資料不符')
+            self.assertIsNotNone(application.reviewed_at)
+            self.assertIsNone(application.approved_at)
+
+    def test_existing_timestamps_are_preserved(self):
+        """測試已有的審核時間不會被覆寫（與 save() 語意一致）"""
+        earlier = timezone.now() - timezone.timedelta(days=3)
+        Application.objects.filter(pk=self.applications[0].pk).update(reviewed_at=earlier)
+
+        bulk_review(Application.objects.all(), 'APPROVED', self.reviewer)
+
+        self.applications[0].refresh_from_db()
+        self.assertEqual(self.applications[0].reviewed_at, earlier)
+
+    def test_only_pending_applications_are_updated(self):
+        """測試只有審核中的申請會被更新"""
+        Application.objects.filter(pk=self.applications[0].pk).update(status='ADDITIONAL_REQUIRED')
+
+        result = bulk_review(Application.objects.all(), 'APPROVED', self.reviewer)
+
+        self.assertEqual(result.updated, 4)
+        self.applications[0].refresh_from_db()
+        self.assertEqual(self.applications[0].status, 'ADDITIONAL_REQUIRED')
+
+    def test_chunks_and_progress(self):
+        """測試分批處理與進度回報"""
+        reports = []
+        result = bulk_review(Application.objects.all(), 'APPROVED', self.reviewer, chunk_size=2, progress=lambda r: reports.append((r.chunks, r.updated)))
+
+        self.assertEqual(result.chunks, 3)
+        self.assertEqual(reports, [(1, 2), (2, 4), (3, 5)])
+
+    def test_concurrent_changes_are_skipped(self):
+        """測試取出主鍵後被併發變更的申請會被略過並計數"""
+        target = self.applications[0]
+        real_atomic = transaction.atomic
+
+        @contextmanager
+        def atomic_with_concurrent_change(*args, **kwargs):
+            # 模擬其他審核人員在批次取出後、UPDATE 之前變更了狀態（只攔截 bulk_review 本身開啟的交易）
+            if not args and not kwargs:
+                Application.objects.filter(pk=target.pk).update(status='REJECTED')
+            with real_atomic(*args, **kwargs):
+                yield
+
+        with mock.patch('applications.reviews.transaction.atomic', atomic_with_concurrent_change):
+            result = bulk_review(Application.objects.all(), 'APPROVED', self.reviewer)
+
+        self.assertEqual(result.updated, 4)
+        self.assertEqual(result.skipped, 1)
+        target.refresh_from_db()
+        self.assertEqual(target.status, 'REJECTED')
+
+    def test_pending_target_status_is_rejected(self):
+        """測試目標狀態不可為審核中"""
+        with self.assertRaises(ValueError):
+            bulk_review(Application.objects.all(), 'PENDING', self.reviewer)
@@ -0,0 +1,66 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from applications.models import Application
+
+
+class SessionProfileTest(TestCase):
+    """session 與訊息儲存設定測試：user_login → application_status 流程的每個請求查詢數"""
+
+    def setUp(self):
+        """設置測試資料"""
+        caches['sessions'].clear()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123', first_name='測試')
+        Application.objects.create(user=self.user, account_name='test_account', phone_number='0912-345-678', address='台北市信義區信義路五段7號')
+
+    def _flow(self):
+        """登入後查看兩次申請狀態，回傳每個請求的 (總查詢數, session 資料表查詢數)"""
+        counts = []
+        requests = [
+            lambda: self.client.post('/accounts/login/', {'username': 'testuser', 'password': 'testpass123'}),
+            lambda: self.client.get('/application/status/'),
+            lambda: self.client.get('/application/status/'),
+        ]
+        for request in requests:
+            with CaptureQueriesContext(connection) as queries:
+                response = request()
+            self.assertIn(response.status_code, (200, 302))
+            counts.append((len(queries), sum('django_session' in query['sql'] for query in queries)))
+        return counts
+
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.db')
+    def test_db_sessions_query_every_request(self):
+        """測試資料庫 session 每個請求都要查詢 session 資料表（比較基準）"""
+        counts = self._flow()
+
+        self.assertEqual([session for _, session in counts[1:]], [1, 1])
+        self.assertEqual(counts[2][0], 2)
+
+    def test_cached_db_sessions_skip_session_reads(self):
+        """測試預設的 cached_db session 登入後的請求不再查詢 session 資料表"""
+        self.assertEqual(settings.SESSION_ENGINE, 'django.contrib.sessions.backends.cached_db')
+
+        counts = self._flow()
+
+        self.assertGreater(counts[0][1], 0)  # 登入時仍寫入資料庫，快取遺失時可還原
+        self.assertEqual(counts[1:], [(2, 0), (1, 0)])
+
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.cache')
+    def test_cache_sessions_never_touch_database(self):
+        """測試 cache session（以本機快取替代 redis）整個流程都不存取 session 資料表"""
+        counts = self._flow()
+
+        self.assertEqual([session for _, session in counts], [0, 0, 0])
+        self.assertEqual(counts[0][0], 2)  # 驗證帳號密碼與更新最後登入時間
+        self.assertTrue(caches['sessions'].has_key(f'django.contrib.sessions.cache{self.client.session.session_key}'))
+
+    def test_messages_are_stored_in_cookie(self):
+        """測試訊息存在 cookie 中而不寫入 session"""
+        response = self.client.post('/accounts/login/', {'username': 'testuser', 'password': 'testpass123'}, follow=True)
+
+        self.assertContains(response, '歡迎回來')
+        self.assertNotIn('_messages', self.client.session)
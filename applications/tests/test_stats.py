@@ -0,0 +1,184 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db.models import Sum
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from applications.models import Application, ReviewDailyStat, ReviewStatusCount
+from applications.reviews import bulk_review
+from applications.stats import apply_review_stats, histogram_percentile, rebuild_review_stats, turnaround_bucket
+from applications.transitions import transition
+
+
+class ReviewStatsTest(TestCase):
+    """審核佇列統計測試"""
+
+    def setUp(self):
+        """設置測試資料"""
+        self.reviewer = User.objects.create_superuser(username='reviewer', email='reviewer@example.com', password='testpass123')
+        self.users = User.objects.bulk_create([User(username=f'applicant_{i}', password='!') for i in range(50)])
+
+    def _create(self, i, **kwargs):
+        return Application.objects.create(user=self.users[i], account_name=f'account_{i}', phone_number='0912-345-678', address='台北市信義區信義路五段7號', **kwargs)
+
+    def _status_counts(self):
+        counts = ReviewStatusCount.objects.order_by().values_list('status').annotate(total=Sum('count'))
+        return {status: count for status, count in counts if count}
+
+    def _daily(self, milestone):
+        return sum(ReviewDailyStat.objects.filter(milestone=milestone).values_list('count', flat=True))
+
+    def _snapshot(self):
+        daily = ReviewDailyStat.objects.order_by().values_list('date', 'milestone', 'bucket').annotate(total=Sum('count')).exclude(total=0)
+        return self._status_counts(), sorted(daily)
+
+    def test_create_and_transition_update_counts(self):
+        """測試建立與狀態轉換會增量更新各狀態申請數與每日統計"""
+        application = self._create(0)
+        self._create(1)
+        self.assertEqual(self._status_counts(), {'PENDING': 2})
+        self.assertEqual(self._daily('SUBMITTED'), 2)
+
+        application = Application.objects.get(pk=application.pk)
+        application.status = 'ADDITIONAL_REQUIRED'
+        application.save()
+        application.status = 'APPROVED'
+        application.save()
+
+        self.assertEqual(self._status_counts(), {'PENDING': 1, 'APPROVED': 1})
+        # 首次審核與通過各只計一次
+        self.assertEqual(self._daily('REVIEWED'), 1)
+        self.assertEqual(self._daily('APPROVED'), 1)
+
+    def test_resubmitted_application_counts_first_review_once(self):
+        """測試重新送審會清除 reviewed_at，但再次審核不會重複計入首次審核"""
+        application = self._create(0)
+        transition(application, 'ADDITIONAL_REQUIRED', actor=self.reviewer)
+        first_reviewed_at = application.first_reviewed_at
+        transition(application, 'PENDING')
+        self.assertIsNone(application.reviewed_at)
+
+        transition(application, 'APPROVED', actor=self.reviewer)
+
+        self.assertEqual(application.first_reviewed_at, first_reviewed_at)
+        self.assertEqual(self._daily('REVIEWED'), 1)
+        self.assertEqual(self._daily('APPROVED'), 1)
+
+        incremental = self._snapshot()
+        rebuild_review_stats()
+        self.assertEqual(self._snapshot(), incremental)
+
+    def test_resubmitted_application_bulk_review_counts_first_review_once(self):
+        """測試批量審核重新送審的申請不會重複計入首次審核"""
+        application = self._create(0)
+        transition(application, 'ADDITIONAL_REQUIRED', actor=self.reviewer)
+        transition(application, 'PENDING')
+
+        bulk_review(Application.objects.all(), 'APPROVED', self.reviewer)
+
+        self.assertEqual(self._daily('REVIEWED'), 1)
+        self.assertEqual(self._daily('APPROVED'), 1)
+
+    @override_settings(APPLICATION_REVIEW_STATS_SHARDS=4)
+    def test_increments_are_spread_over_shards_and_summed(self):
+        """測試增量分散寫入多個 shard，讀取時加總"""
+        today = timezone.localdate()
+        for _ in range(40):
+            apply_review_stats({'PENDING': 1}, {(today, 'SUBMITTED', 0): 1})
+
+        shards = ReviewStatusCount.objects.filter(status='PENDING').values_list('shard', flat=True)
+        self.assertGreater(len(shards), 1)
+        self.assertTrue(set(shards) <= {0, 1, 2, 3})
+        self.assertEqual(self._status_counts(), {'PENDING': 40})
+        self.assertEqual(self._daily('SUBMITTED'), 40)
+
+        self.client.force_login(self.reviewer)
+        response = self.client.get(reverse('admin:applications_application_dashboard'))
+        self.assertEqual(response.context['statuses'][0]['count'], 40)
+        self.assertEqual(response.context['daily'][0]['submitted'], 40)
+
+    def test_save_without_status_change(self):
+        """測試未變更狀態的儲存不會改變統計"""
+        application = self._create(0)
+        before = self._snapshot()
+
+        application.address = '新北市板橋區文化路一段100號'
+        application.save()
+
+        self.assertEqual(self._snapshot(), before)
+
+    def test_delete_decrements_status_count(self):
+        """測試刪除申請會扣除該狀態的申請數"""
+        self._create(0)
+        application = self._create(1, status='REJECTED')
+
+        application.delete()
+
+        self.assertEqual(self._status_counts(), {'PENDING': 1})
+
+    def test_bulk_review_updates_stats(self):
+        """測試批量審核會更新統計"""
+        for i in range(5):
+            self._create(i)
+        Application.objects.filter(account_name='account_0').update(status='REJECTED')
+        rebuild_review_stats()
+
+        result = bulk_review(Application.objects.all(), 'APPROVED', self.reviewer, chunk_size=2)
+
+        self.assertEqual(result.updated, 4)
+        self.assertEqual(self._status_counts(), {'APPROVED': 4, 'REJECTED': 1})
+        self.assertEqual(self._daily('APPROVED'), 4)
+
+    def test_rebuild_matches_incremental_stats(self):
+        """測試重新計算的統計與增量維護的結果一致"""
+        for i in range(10):
+            self._create(i)
+        for application in Application.objects.filter(account_name__in=['account_1', 'account_2']):
+            application.status = 'REJECTED'
+            application.save()
+        bulk_review(Application.objects.filter(account_name__in=['account_3', 'account_4', 'account_5']), 'APPROVED', self.reviewer)
+        incremental = self._snapshot()
+
+        rebuild_review_stats()
+
+        self.assertEqual(self._snapshot(), incremental)
+
+    def test_turnaround_percentiles(self):
+        """測試處理時間分組與百分位數"""
+        now = timezone.now()
+        self.assertEqual(turnaround_bucket(now, now + timedelta(minutes=30)), 0)
+        self.assertEqual(turnaround_bucket(now, now + timedelta(hours=3)), 2)
+        self.assertEqual(turnaround_bucket(now, now + timedelta(days=60)), 12)
+
+        self.assertIsNone(histogram_percentile({}, 50))
+        self.assertEqual(histogram_percentile({0: 50, 3: 45, 5: 5}, 50), 0)
+        self.assertEqual(histogram_percentile({0: 50, 3: 45, 5: 5}, 95), 3)
+        self.assertEqual(histogram_percentile({0: 50, 3: 45, 5: 5}, 99), 5)
+
+    def test_dashboard_query_count_is_constant(self):
+        """測試儀表板的查詢次數與申請筆數無關"""
+        self.client.force_login(self.reviewer)
+        url = reverse('admin:applications_application_dashboard')
+        self._create(0)
+
+        # 使用者、狀態統計、兩次最舊申請、每日統計（session 由快取讀取）
+        with self.assertNumQueries(5):
+            response = self.client.get(url)
+        self.assertContains(response, '審核佇列統計')
+
+        for i in range(1, 50):
+            self._create(i)
+        with self.assertNumQueries(5):
+            response = self.client.get(url)
+        self.assertEqual(response.context['statuses'][0]['count'], 50)
+        self.assertEqual(response.context['daily'][0]['submitted'], 50)
+
+    def test_dashboard_requires_staff(self):
+        """測試非管理人員無法檢視儀表板"""
+        self.client.force_login(self.users[0])
+
+        response = self.client.get(reverse('admin:applications_application_dashboard'))
+
+        self.assertEqual(response.status_code, 302)
@@ -0,0 +1,154 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from applications.models import Application, BackgroundTask
+from applications.notifications import enqueue_status_notifications
+from applications.reviews import bulk_review
+from applications.tasks import claim_tasks, enqueue, register, run_ready_tasks, run_task
+from applications.transitions import transition
+
+calls = []
+
+
+@register('test_flaky')
+def flaky(fail_times=0):
+    """前 fail_times 次執行失敗的測試工作"""
+    calls.append(fail_times)
+    if len(calls) <= fail_times:
+        raise RuntimeError('暫時失敗')
+
+
+class BackgroundTaskTest(TestCase):
+    """背景工作佇列測試"""
+
+    def setUp(self):
+        """設置測試資料"""
+        calls.clear()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        self.reviewer = User.objects.create_user(username='reviewer', email='reviewer@example.com', password='reviewerpass123', is_staff=True, is_superuser=True)
+
+    def _application(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Application.objects.create(user=self.user, account_name='test_account', phone_number='0912-345-678', address='台北市信義區信義路五段7號')
+
+    def test_tasks_are_added_after_commit(self):
+        """測試工作在交易提交後才加入，相同冪等鍵只加入一次"""
+        with self.captureOnCommitCallbacks(execute=True):
+            enqueue('test_flaky', key='only-once')
+            enqueue('test_flaky', key='only-once')
+            self.assertFalse(BackgroundTask.objects.exists())
+
+        self.assertEqual(BackgroundTask.objects.filter(idempotency_key='only-once').count(), 1)
+
+    def test_new_application_sends_notification(self):
+        """測試送出申請後加入通知工作，由執行程序寄送郵件"""
+        self.client.force_login(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('application_create'), {'account_name': 'test_account', 'phone_number': '0912-345-678', 'address': '台北市信義區信義路五段7號'})
+
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(run_ready_tasks('worker'), {'SUCCEEDED': 1})
+        self.assertEqual(mail.outbox[0].subject, '已收到您的證券帳戶申請')
+        self.assertEqual(mail.outbox[0].to, ['test@example.com'])
+
+    def test_status_transitions_send_one_notification_each(self):
+        """測試單筆與批量審核都會通知，同一次轉換重複加入的通知只會寄送一次"""
+        application = self._application()
+        run_ready_tasks('worker')
+        with self.captureOnCommitCallbacks(execute=True):
+            transition(application, 'ADDITIONAL_REQUIRED', actor=self.reviewer)
+        with self.captureOnCommitCallbacks(execute=True):
+            enqueue_status_notifications([(application.pk, application.status, application.status_changed_at)])
+        run_ready_tasks('worker')
+        with self.captureOnCommitCallbacks(execute=True):
+            transition(application, 'PENDING')
+        run_ready_tasks('worker')
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk_review(Application.objects.all(), 'APPROVED', self.reviewer)
+        run_ready_tasks('worker')
+
+        self.assertEqual([message.subject for message in mail.outbox], ['已收到您的證券帳戶申請', '您的證券帳戶申請需要補件', '已收到您的證券帳戶申請', '您的證券帳戶申請已通過'])
+        self.assertEqual(BackgroundTask.objects.count(), 4)
+
+    def test_outdated_review_notifications_are_skipped(self):
+        """測試執行前申請已再次轉換時，不寄送過時的審核結果通知"""
+        application = self._application()
+        run_ready_tasks('worker')
+        with self.captureOnCommitCallbacks(execute=True):
+            transition(application, 'ADDITIONAL_REQUIRED', actor=self.reviewer)
+        with self.captureOnCommitCallbacks(execute=True):
+            transition(application, 'REJECTED', actor=self.reviewer)
+
+        self.assertEqual(run_ready_tasks('worker'), {'SUCCEEDED': 2})
+        self.assertEqual([message.subject for message in mail.outbox], ['已收到您的證券帳戶申請', '您的證券帳戶申請未通過'])
+
+    def test_submission_notification_is_sent_after_review(self):
+        """測試送件通知執行前申請已被審核時，仍會寄出送件通知與審核結果"""
+        application = self._application()
+        with self.captureOnCommitCallbacks(execute=True):
+            transition(application, 'APPROVED', actor=self.reviewer)
+
+        self.assertEqual(run_ready_tasks('worker'), {'SUCCEEDED': 2})
+        self.assertEqual(sorted(message.subject for message in mail.outbox), ['已收到您的證券帳戶申請', '您的證券帳戶申請已通過'])
+
+    def test_failed_tasks_are_retried_with_backoff(self):
+        """測試失敗的工作延後重試，成功後標記為已完成"""
+        with self.captureOnCommitCallbacks(execute=True):
+            enqueue('test_flaky', {'fail_times': 1})
+
+        with self.assertLogs('applications.tasks', 'WARNING') as logs:
+            self.assertEqual(run_ready_tasks('worker'), {'QUEUED': 1})
+        self.assertIn('稍後重試', logs.output[0])
+        task = BackgroundTask.objects.get()
+        self.assertGreater(task.run_after, timezone.now())
+        self.assertIn('暫時失敗', task.last_error)
+        self.assertEqual(run_ready_tasks('worker'), {})
+
+        BackgroundTask.objects.update(run_after=timezone.now())
+        self.assertEqual(run_ready_tasks('worker'), {'SUCCEEDED': 1})
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.attempts), ('SUCCEEDED', 2))
+
+    def test_tasks_fail_after_max_attempts(self):
+        """測試執行次數達到上限或未註冊的工作標記為已失敗"""
+        with self.captureOnCommitCallbacks(execute=True):
+            enqueue('test_flaky', {'fail_times': 5}, max_attempts=1)
+            enqueue('not_registered')
+
+        with self.assertLogs('applications.tasks', 'ERROR') as logs:
+            self.assertEqual(run_ready_tasks('worker'), {'FAILED': 2})
+        self.assertEqual(len(logs.output), 2)
+        self.assertTrue(all('不再重試' in line for line in logs.output))
+
+    def test_expired_lease_is_taken_over(self):
+        """測試執行程序中斷後，租約到期的工作由其他執行程序接手，原程序的結果不會覆寫"""
+        with self.captureOnCommitCallbacks(execute=True):
+            enqueue('test_flaky')
+        stale = claim_tasks('crashed', 10)[0]
+        self.assertEqual(claim_tasks('other', 10), [])
+
+        BackgroundTask.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+        task = claim_tasks('other', 10)[0]
+        self.assertEqual(task.attempts, 2)
+
+        run_task(stale)
+        self.assertEqual(BackgroundTask.objects.get().status, 'RUNNING')
+        run_task(task)
+        self.assertEqual(BackgroundTask.objects.get().status, 'SUCCEEDED')
+
+    def test_run_tasks_command(self):
+        """測試 run_tasks 指令執行完目前的工作後結束"""
+        self._application()
+        out = StringIO()
+
+        call_command('run_tasks', '--once', '--threads', '1', stdout=out)
+
+        self.assertIn('完成 1 筆', out.getvalue())
+        self.assertEqual(len(mail.outbox), 1)
@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.core.cache.utils import make_template_fragment_key
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.cache import has_vary_header
+
+from applications.models import Application
+
+# 測試中以 locmem 取代開發設定的 DummyCache，才能確認片段有寫入快取
+FRAGMENT_CACHES = {
+    **settings.CACHES,
+    'template_fragments': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-template-fragments'},
+}
+
+
+class TemplateCachingTest(TestCase):
+    """首頁整頁快取與模板片段快取測試"""
+
+    def setUp(self):
+        """設置測試資料"""
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+
+    def test_anonymous_home_is_cached_and_varies_on_cookie(self):
+        """測試未登入的首頁整頁快取，且回應帶有 Vary: Cookie"""
+        response = self.client.get(reverse('home'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(has_vary_header(response, 'Cookie'))
+        self.assertIn(f'max-age={settings.APPLICATION_HOME_CACHE_TIMEOUT}', response['Cache-Control'])
+
+        with self.assertTemplateNotUsed('applications/home.html'):
+            self.assertContains(self.client.get(reverse('home')), '立即註冊')
+
+    def test_logged_in_user_is_not_served_cached_home(self):
+        """測試未登入的首頁已快取後，登入使用者仍會被導向申請狀態頁面"""
+        self.client.get(reverse('home'))
+        self.client.login(username='testuser', password='testpass123')
+
+        response = self.client.get(reverse('home'))
+
+        self.assertRedirects(response, reverse('application_status'))
+
+    @override_settings(CACHES=FRAGMENT_CACHES)
+    def test_status_help_fragment_is_keyed_on_status(self):
+        """測試狀態說明片段依申請狀態分別快取"""
+        caches['template_fragments'].clear()
+        Application.objects.create(user=self.user, account_name='test_account', phone_number='0912-345-678', address='台北市信義區信義路五段7號')
+        self.client.login(username='testuser', password='testpass123')
+
+        response = self.client.get(reverse('application_status'))
+
+        self.assertContains(response, '我們正在審核中')
+        fragments = caches['template_fragments']
+        self.assertIn('我們正在審核中', fragments.get(make_template_fragment_key('status_help', ['PENDING'])))
+        self.assertIsNone(fragments.get(make_template_fragment_key('status_help', ['APPROVED'])))
@@ -0,0 +1,149 @@
+from datetime import timedelta
+
+from django.contrib.admin.sites import AdminSite
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from applications.admin import ApplicationTransitionInline
+from applications.forms import ApplicationAdminForm
+from applications.models import Application, ApplicationTransition
+from applications.reviews import bulk_review
+from applications.transitions import InvalidTransition, can_transition, transition
+
+
+class ApplicationTransitionTest(TestCase):
+    """申請狀態轉換引擎與轉換記錄測試"""
+
+    def setUp(self):
+        """設置測試資料"""
+        self.reviewer = User.objects.create_user(username='reviewer', email='reviewer@example.com', password='testpass123', is_staff=True)
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        self.application = Application.objects.create(user=self.user, account_name='test_account', phone_number='0912-345-678', address='台北市信義區信義路五段7號')
+
+    def _history(self):
+        return list(ApplicationTransition.objects.filter(application=self.application).values_list('from_status', 'to_status'))
+
+    def test_creation_is_logged(self):
+        """測試新申請會記錄建立時的轉換"""
+        self.assertEqual(self._history(), [('', 'PENDING')])
+        self.assertEqual(self.application.status_changed_at, self.application.transitions.get().created_at)
+
+    def test_transition_logs_actor_note_and_duration(self):
+        """測試轉換會記錄操作人員、備註與原狀態停留時間，並更新進入目前狀態時間"""
+        entered_at = timezone.now() - timedelta(hours=5)
+        Application.objects.filter(pk=self.application.pk).update(status_changed_at=entered_at)
+        application = Application.objects.get(pk=self.application.pk)
+
+        transition(application, 'ADDITIONAL_REQUIRED', actor=self.reviewer, note='請補身分證明')
+
+        log = application.transitions.last()
+        self.assertEqual((log.from_status, log.to_status, log.actor, log.note), ('PENDING', 'ADDITIONAL_REQUIRED', self.reviewer, '請補身分證明'))
+        self.assertAlmostEqual(log.previous_status_duration, timedelta(hours=5), delta=timedelta(seconds=5))
+        application.refresh_from_db()
+        self.assertEqual(application.status_changed_at, log.created_at)
+        self.assertEqual(application.reviewed_by, self.reviewer)
+
+    def test_resubmission_clears_review_fields(self):
+        """測試補件後重新送審會清除審核資訊與補件說明"""
+        transition(self.application, 'ADDITIONAL_REQUIRED', actor=self.reviewer)
+        self.application.additional_info_required = '請補身分證明'
+        self.application.save()
+
+        transition(self.application, 'PENDING', actor=self.user)
+
+        self.application.refresh_from_db()
+        self.assertIsNone(self.application.reviewed_at)
+        self.assertIsNone(self.application.reviewed_by)
+        self.assertEqual(self.application.additional_info_required, '')
+        self.assertEqual(self._history(), [('', 'PENDING'), ('PENDING', 'ADDITIONAL_REQUIRED'), ('ADDITIONAL_REQUIRED', 'PENDING')])
+
+    def test_invalid_transition_is_rejected(self):
+        """測試不允許的轉換會拋出例外且不寫入任何資料"""
+        transition(self.application, 'APPROVED', actor=self.reviewer)
+        self.assertFalse(can_transition('APPROVED', 'REJECTED'))
+
+        with self.assertRaises(InvalidTransition):
+            transition(self.application, 'REJECTED', actor=self.reviewer)
+
+        self.application.refresh_from_db()
+        self.assertEqual(self.application.status, 'APPROVED')
+        self.assertEqual(len(self._history()), 2)
+
+    def test_failed_save_does_not_log(self):
+        """測試申請寫入失敗時轉換記錄一併回復"""
+        other = User.objects.create_user(username='other', email='other@example.com', password='testpass123')
+        Application.objects.create(user=other, account_name='taken_name', phone_number='0912-345-678', address='台北市信義區信義路五段7號')
+        self.application.account_name = 'taken_name'
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            transition(self.application, 'REJECTED', actor=self.reviewer)
+
+        self.assertEqual(self._history(), [('', 'PENDING')])
+
+    def test_log_is_append_only(self):
+        """測試轉換記錄不可修改"""
+        log = self.application.transitions.get()
+        log.note = '修改'
+
+        with self.assertRaises(ValueError):
+            log.save()
+        with self.assertRaises(ValueError):
+            log.delete()
+        with self.assertRaises(ValueError):
+            ApplicationTransition.objects.filter(pk=log.pk).update(note='修改')
+        with self.assertRaises(ValueError):
+            self.application.transitions.all().delete()
+        self.assertEqual(ApplicationTransition.objects.get(pk=log.pk).note, '')
+
+    def test_log_is_kept_when_application_is_deleted(self):
+        """測試刪除申請人與申請後仍保留轉換記錄與申請的識別資料"""
+        transition(self.application, 'REJECTED', actor=self.reviewer, note='資料不符')
+        application_id = self.application.pk
+
+        self.user.delete()
+
+        logs = ApplicationTransition.objects.filter(application_number=application_id)
+        self.assertEqual(list(logs.values_list('application', 'account_name', 'from_status', 'to_status')), [
+            (None, 'test_account', '', 'PENDING'),
+            (None, 'test_account', 'PENDING', 'REJECTED'),
+        ])
+
+    def test_admin_inline_is_read_only(self):
+        """測試管理後台的轉換歷程不可新增、修改或刪除"""
+        inline = ApplicationTransitionInline(Application, AdminSite())
+        request = RequestFactory().get('/admin/')
+        request.user = User.objects.create_superuser(username='admin', email='admin@example.com', password='testpass123')
+
+        self.assertFalse(inline.has_add_permission(request, self.application))
+        self.assertFalse(inline.has_change_permission(request, self.application))
+        self.assertFalse(inline.has_delete_permission(request, self.application))
+
+    def test_bulk_review_logs_transitions(self):
+        """測試批量審核會為每筆申請寫入轉換記錄"""
+        bulk_review(Application.objects.all(), 'REJECTED', self.reviewer, rejection_reason='資料不符')
+
+        log = self.application.transitions.last()
+        self.assertEqual((log.from_status, log.to_status, log.actor, log.note), ('PENDING', 'REJECTED', self.reviewer, '資料不符'))
+        self.assertEqual((log.application_number, log.account_name), (self.application.pk, 'test_account'))
+        self.application.refresh_from_db()
+        self.assertEqual(self.application.status_changed_at, log.created_at)
+
+    def test_admin_form_validates_transition(self):
+        """測試管理後台表單只允許合法的狀態轉換"""
+        transition(self.application, 'APPROVED', actor=self.reviewer)
+        application = Application.objects.get(pk=self.application.pk)
+        data = {
+            'user': self.user.pk,
+            'account_name': 'test_account',
+            'phone_number': '0912-345-678',
+            'address': '台北市信義區信義路五段7號',
+            'status': 'PENDING',
+        }
+
+        form = ApplicationAdminForm(data, instance=application)
+
+        self.assertFalse(form.is_valid())
+        self.assertIn('status', form.errors)
+        self.assertTrue(ApplicationAdminForm(dict(data, status='APPROVED'), instance=application).is_valid())
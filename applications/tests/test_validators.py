@@ -0,0 +1,64 @@
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+
+from applications.validators import (
+    validate_account_name_format,
+    validate_address,
+    validate_application_record,
+    validate_application_records,
+    validate_phone_number,
+)
+
+
+class ValidatorsTest(SimpleTestCase):
+    """申請資料驗證規則測試"""
+
+    valid_record = {'account_name': 'test_account_001', 'phone_number': '0912-345-678', 'address': '台北市信義區信義路五段7號'}
+
+    def test_account_name_format(self):
+        """測試帳號名稱格式驗證"""
+        self.assertEqual(validate_account_name_format('john_doe-01'), 'john_doe-01')
+        for invalid_name in ['_test', '-test', 'test@123', 'test 123', 'ab', 'a' * 21, 'abc\n']:
+            with self.assertRaises(ValidationError, msg=invalid_name):
+                validate_account_name_format(invalid_name)
+
+    def test_phone_number(self):
+        """測試手機號碼驗證會忽略分隔字元"""
+        for valid_phone in ['0912345678', '0912-345-678', '(0912) 345 678']:
+            self.assertEqual(validate_phone_number(valid_phone), valid_phone)
+        for invalid_phone in ['02-1234-5678', '0912-345-67', '1912345678']:
+            with self.assertRaises(ValidationError, msg=invalid_phone):
+                validate_phone_number(invalid_phone)
+
+    def test_address(self):
+        """測試地址驗證會去除空白並檢查關鍵字"""
+        self.assertEqual(validate_address('  台北市信義區信義路五段7號  '), '台北市信義區信義路五段7號')
+        for invalid_address in ['台北市', 'A' * 201, 'Some place without keywords']:
+            with self.assertRaises(ValidationError, msg=invalid_address):
+                validate_address(invalid_address)
+
+    def test_record_errors_per_field(self):
+        """測試單筆驗證回傳各欄位的錯誤訊息"""
+        cleaned, errors = validate_application_record({'account_name': '_bad', 'phone_number': '0912-345-678', 'address': ''})
+
+        self.assertEqual(cleaned, {'phone_number': '0912-345-678'})
+        self.assertEqual(set(errors), {'account_name', 'address'})
+        self.assertIn('必須以字母或數字開頭', errors['account_name'][0])
+
+    def test_record_phone_number_max_length(self):
+        """測試批次驗證與表單一樣限制電話號碼長度"""
+        _, errors = validate_application_record(dict(self.valid_record, phone_number='0 9 1 2 - 3 4 5 - 6 7 8'))
+        self.assertIn('phone_number', errors)
+
+    def test_batch_matches_single_record_validation(self):
+        """測試批次驗證與單筆驗證結果一致"""
+        records = [
+            self.valid_record,
+            dict(self.valid_record, account_name='  padded_name  '),
+            dict(self.valid_record, account_name='ab'),
+            dict(self.valid_record, phone_number='02-1234-5678'),
+            dict(self.valid_record, address='地址'),
+            {},
+        ]
+
+        self.assertEqual(list(validate_application_records(records)), [validate_application_record(record) for record in records])
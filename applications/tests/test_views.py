@@ -1,8 +1,16 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 from django.contrib.auth.models import User
 from django.contrib.messages import get_messages
-from django.test import Client, TestCase
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.core.cache import cache
+from django.db import OperationalError, connection
+from django.test import Client, RequestFactory, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+from applications import views
 from applications.models import Application
 
 
@@ -11,6 +19,7 @@ class ViewsTestCase(TestCase):
 
     def setUp(self):
         """設置測試資料"""
+        cache.clear()  # 避免前一個測試留下的申請狀態快取
         self.client = Client()
         self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123', first_name='測試用戶')
         self.admin_user = User.objects.create_user(username='admin', email='admin@example.com', password='adminpass123', is_staff=True, is_superuser=True)
@@ -244,3 +253,107 @@ class ApplicationViewsTest(ViewsTestCase):
         self.client.login(username='testuser', password='testpass123')
         response = self.client.get(reverse('application_update', args=[other_application.id]))
         self.assertEqual(response.status_code, 404)
+
+
+class ApplicationReservationTest(ViewsTestCase):
+    """送出申請時以資料庫唯一限制保留帳號名稱的測試"""
+
+    def test_duplicate_account_name_shows_form_error(self):
+        """測試帳號名稱已被使用時顯示原本的表單錯誤訊息"""
+
+        other_user = User.objects.create_user(username='otheruser', email='other@example.com', password='otherpass123')
+        Application.objects.create(user=other_user, account_name='taken_name', phone_number='0912-111-222', address='高雄市前金區中正四路100號')
+
+        self.client.login(username='testuser', password='testpass123')
+        data = {'account_name': 'taken_name', 'phone_number': '0912-345-678', 'address': '台北市信義區信義路五段7號'}
+        response = self.client.post(reverse('application_create'), data)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '此帳號名稱已被使用，請選擇其他名稱')
+        self.assertFalse(Application.objects.filter(user=self.user).exists())
+
+    def test_post_with_existing_application_redirects(self):
+        """測試已有申請的用戶再次送出會被導向申請狀態頁面"""
+
+        Application.objects.create(user=self.user, account_name='existing_account', phone_number='0912-345-678', address='台北市信義區信義路五段7號')
+
+        self.client.login(username='testuser', password='testpass123')
+        data = {'account_name': 'another_account', 'phone_number': '0912-345-678', 'address': '台北市信義區信義路五段7號'}
+        response = self.client.post(reverse('application_create'), data)
+        self.assertRedirects(response, reverse('application_status'))
+        self.assertEqual(Application.objects.filter(user=self.user).count(), 1)
+
+    def test_submission_does_not_query_before_insert(self):
+        """測試送出申請時不再先查詢帳號名稱與既有申請"""
+
+        self.client.login(username='testuser', password='testpass123')
+        data = {'account_name': 'test_account_001', 'phone_number': '0912-345-678', 'address': '台北市信義區信義路五段7號'}
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(reverse('application_create'), data)
+
+        selects = [q['sql'] for q in queries if q['sql'].startswith('SELECT') and 'applications_application' in q['sql']]
+        self.assertEqual(selects, [])
+        self.assertTrue(Application.objects.filter(user=self.user, account_name='test_account_001').exists())
+
+    def test_update_to_taken_account_name_shows_form_error(self):
+        """測試補件時改用已被使用的帳號名稱會顯示表單錯誤"""
+
+        other_user = User.objects.create_user(username='otheruser', email='other@example.com', password='otherpass123')
+        Application.objects.create(user=other_user, account_name='taken_name', phone_number='0912-111-222', address='高雄市前金區中正四路100號')
+        application = Application.objects.create(user=self.user, account_name='test_account_001', phone_number='0912-345-678', address='台北市信義區信義路五段7號', status='ADDITIONAL_REQUIRED', additional_info_required='請補充身分證影本')
+
+        self.client.login(username='testuser', password='testpass123')
+        data = {'account_name': 'taken_name', 'phone_number': '0912-345-678', 'address': '台北市信義區信義路五段7號'}
+        response = self.client.post(reverse('application_update', args=[application.id]), data)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '此帳號名稱已被使用，請選擇其他名稱')
+        # 重新顯示的頁面使用申請原本的資料，補件說明仍然顯示
+        self.assertContains(response, '請補充身分證影本')
+        self.assertEqual((response.context['application'].status, response.context['application'].account_name), ('ADDITIONAL_REQUIRED', 'test_account_001'))
+
+        application.refresh_from_db()
+        self.assertEqual(application.account_name, 'test_account_001')
+        self.assertEqual(application.status, 'ADDITIONAL_REQUIRED')
+
+
+class ApplicationReservationConcurrencyTest(TransactionTestCase):
+    """同時送出相同帳號名稱的併發測試"""
+
+    # 執行緒數足以讓多個請求同時通過表單驗證、在寫入時互相競爭
+    submissions = 16
+    threads = 8
+    # SQLite 測試資料庫被鎖住時的重送次數上限與退避秒數（每次重送遞增），持續被鎖住時測試失敗而不會卡住
+    max_attempts = 20
+    retry_delay = 0.01
+
+    def setUp(self):
+        """設置測試資料（共用不可登入的密碼，避免逐一雜湊）"""
+        self.users = User.objects.bulk_create([User(username=f'racer_{i}', email=f'racer_{i}@example.com', password='!') for i in range(self.submissions)])
+
+    def _submit(self, user):
+        """以獨立的資料庫連線送出申請，回傳回應狀態碼"""
+        factory = RequestFactory()
+        data = {'account_name': 'hot_name', 'phone_number': '0912-345-678', 'address': '台北市信義區信義路五段7號'}
+        try:
+            for attempt in range(self.max_attempts):
+                request = factory.post(reverse('application_create'), data)
+                request.user = user
+                setattr(request, 'session', {})
+                setattr(request, '_messages', FallbackStorage(request))
+                try:
+                    return views.application_create(request).status_code
+                except OperationalError:
+                    # SQLite 測試資料庫以資料表鎖序列化寫入，被鎖住時稍後重送
+                    time.sleep(self.retry_delay * (attempt + 1))
+            raise AssertionError(f'資料庫持續被鎖住，重送 {self.max_attempts} 次仍無法送出申請')
+        finally:
+            connection.close()
+
+    def test_parallel_submissions_reserve_name_once(self):
+        """測試同時送出相同帳號名稱時只有一位使用者成功"""
+
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            status_codes = list(executor.map(self._submit, self.users))
+
+        self.assertEqual(Application.objects.filter(account_name='hot_name').count(), 1)
+        self.assertEqual(status_codes.count(302), 1)  # 成功者被導向申請狀態頁面
+        self.assertEqual(status_codes.count(200), self.submissions - 1)  # 其餘重新顯示含錯誤訊息的表單
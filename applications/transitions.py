@@ -0,0 +1,73 @@
+from .models import ApplicationTransition
+
+# 允許的狀態轉換：審核中可進入任一審核結果；待補件由申請人補件後重新送審或直接拒絕；
+# 已拒絕的申請可由審核人員重新開啟審核；已通過為最終狀態
+ALLOWED_TRANSITIONS = {
+    'PENDING': {'APPROVED', 'REJECTED', 'ADDITIONAL_REQUIRED'},
+    'ADDITIONAL_REQUIRED': {'PENDING', 'REJECTED'},
+    'REJECTED': {'PENDING'},
+    'APPROVED': set(),
+}
+
+
+class InvalidTransition(ValueError):
+    """不允許的狀態轉換"""
+
+
+def can_transition(from_status, to_status):
+    """判斷是否允許由 from_status 轉換為 to_status"""
+    return to_status in ALLOWED_TRANSITIONS.get(from_status, ())
+
+
+def current_status(application):
+    """申請在資料庫中的狀態（以載入時記錄的值為準，新申請為 None）"""
+    if application._state.adding:
+        return None
+    return application.loaded_values.get('status', application.status)
+
+
+def transition(application, status, actor=None, note='', save=True):
+    """驗證並套用狀態轉換
+
+    由資料庫中的狀態轉換為 status，並設定各狀態對應的欄位：重新送審時清除審核資訊與補件說明，
+    進入審核結果時若尚未指定審核人員則設為 actor。轉換記錄由 Application.save()
+    與申請在同一個交易中寫入；save 為 False 時由呼叫端負責儲存。
+    """
+    from_status = current_status(application)
+    if from_status is not None and not can_transition(from_status, status):
+        labels = dict(application.STATUS_CHOICES)
+        raise InvalidTransition(f'申請狀態不可由「{labels[from_status]}」變更為「{labels[status]}」')
+
+    application.status = status
+    # 狀態轉換即完成此次審核，釋放認領
+    application.claimed_by = None
+    application.claim_expires_at = None
+    if status == 'PENDING':
+        application.reviewed_at = None
+        application.reviewed_by = None
+        application.additional_info_required = ''
+    elif actor is not None and not application.reviewed_by_id:
+        application.reviewed_by = actor
+
+    application._transition_actor = actor
+    application._transition_note = note
+    if save:
+        application.save()
+    return application
+
+
+def log_created(applications, note=''):
+    """為 bulk_create 建立的申請補上建立時的轉換記錄"""
+    return ApplicationTransition.objects.bulk_create([
+        ApplicationTransition(application_id=application.pk, application_number=application.pk, account_name=application.account_name,
+                              from_status='', to_status=application.status, note=note, created_at=application.status_changed_at)
+        for application in applications
+    ])
+
+
+def log_bulk_transitions(rows, status, actor, changed_at, note=''):
+    """為以 update() 批次轉換的申請寫入轉換記錄，rows 為 [(主鍵, 帳號名稱, 原狀態, 原狀態進入時間)]"""
+    return ApplicationTransition.objects.bulk_create([
+        ApplicationTransition(application_id=pk, application_number=pk, account_name=account_name, from_status=from_status, to_status=status, actor=actor, note=note, created_at=changed_at, previous_status_duration=changed_at - previous_changed_at if previous_changed_at else None)
+        for pk, account_name, from_status, previous_changed_at in rows
+    ])
@@ -16,4 +16,10 @@ urlpatterns = [
     path('application/status/', views.application_status, name='application_status'),
     path('application/update/<int:application_id>/', views.application_update, name='application_update'),
     path('application/success/<int:application_id>/', views.application_success, name='application_success'),
+
+    # 行動 App 使用的狀態 API
+    path('api/application/status/', views.application_status_api, name='application_status_api'),
+
+    # Prometheus 指標
+    path('metrics/', views.metrics, name='metrics'),
 ]
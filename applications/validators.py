@@ -0,0 +1,122 @@
+import re
+
+from django.core.exceptions import ValidationError
+from django.forms import Field
+
+# 帳號名稱：英文字母或數字開頭，其後為英文字母、數字、底線、短橫線
+ACCOUNT_NAME_PATTERN = re.compile(r'[a-zA-Z0-9][a-zA-Z0-9_-]*')
+ACCOUNT_NAME_MIN_LENGTH = 3
+ACCOUNT_NAME_MAX_LENGTH = 20
+
+# 電話號碼中允許的分隔字元（空白、短橫線、括號）
+PHONE_SEPARATOR_PATTERN = re.compile(r'[\s\-()]')
+# 台灣手機號碼格式：09XXXXXXXX
+MOBILE_PATTERN = re.compile(r'09\d{8}')
+
+ADDRESS_MIN_LENGTH = 10
+ADDRESS_MAX_LENGTH = 200
+# 完整地址應包含的基本元素
+ADDRESS_KEYWORDS = ('市', '縣', '區', '鄉', '鎮', '路', '街', '巷', '號')
+# 將所有關鍵字編譯為單一交替式，一次掃描地址即可判斷是否包含任一關鍵字
+ADDRESS_KEYWORD_PATTERN = re.compile('|'.join(map(re.escape, ADDRESS_KEYWORDS)))
+
+
+def validate_account_name_format(account_name):
+    """驗證帳號名稱格式與長度"""
+    if not ACCOUNT_NAME_PATTERN.fullmatch(account_name):
+        raise ValidationError('帳號名稱只能包含英文字母、數字、底線、短橫線，且必須以字母或數字開頭')
+
+    if len(account_name) < ACCOUNT_NAME_MIN_LENGTH:
+        raise ValidationError('帳號名稱至少需要3個字符')
+
+    if len(account_name) > ACCOUNT_NAME_MAX_LENGTH:
+        raise ValidationError('帳號名稱不能超過20個字符')
+
+    return account_name
+
+
+def validate_phone_number(phone_number):
+    """驗證手機號碼格式（忽略空白、短橫線與括號）"""
+    if not MOBILE_PATTERN.fullmatch(PHONE_SEPARATOR_PATTERN.sub('', phone_number)):
+        raise ValidationError('請輸入有效的台灣手機號碼格式，例如：0912-345-678')
+
+    return phone_number
+
+
+def validate_address(address):
+    """驗證地址內容，回傳去除前後空白的地址"""
+    address = address.strip()
+
+    if len(address) < ADDRESS_MIN_LENGTH:
+        raise ValidationError('地址太短，請提供完整的聯絡地址')
+
+    if len(address) > ADDRESS_MAX_LENGTH:
+        raise ValidationError('地址過長，請簡化至200個字符以內')
+
+    if not ADDRESS_KEYWORD_PATTERN.search(address):
+        raise ValidationError('請提供完整的地址資訊，包含縣市、區域、街道門牌')
+
+    return address
+
+
+# 申請資料各欄位對應的驗證函式
+FIELD_VALIDATORS = {
+    'account_name': validate_account_name_format,
+    'phone_number': validate_phone_number,
+    'address': validate_address,
+}
+
+
+# 與模型欄位一致的長度上限（表單由欄位本身檢查，批次驗證需自行檢查）
+FIELD_MAX_LENGTHS = {
+    'account_name': 100,
+    'phone_number': 20,
+}
+
+
+def validate_application_record(record):
+    """驗證一筆申請資料（dict），回傳 (清理後的資料, 錯誤)
+
+    與 ApplicationForm 使用相同的規則，錯誤為 {欄位名稱: [錯誤訊息]}，
+    全部通過時為空 dict。不檢查帳號名稱唯一性。
+    """
+    cleaned, errors = {}, {}
+    for field, validator in FIELD_VALIDATORS.items():
+        value = str(record.get(field) or '').strip()
+        if not value:
+            errors[field] = [str(Field.default_error_messages['required'])]
+            continue
+        max_length = FIELD_MAX_LENGTHS.get(field)
+        if max_length is not None and len(value) > max_length:
+            errors[field] = [f'長度不能超過{max_length}個字符']
+            continue
+        try:
+            cleaned[field] = validator(value)
+        except ValidationError as e:
+            errors[field] = e.messages
+    return cleaned, errors
+
+
+def validate_application_records(records):
+    """批次驗證多筆申請資料，依序產生每筆的 (清理後的資料, 錯誤)
+
+    先以預先綁定的編譯樣式做快速檢查，全部通過的資料不必建立例外物件；
+    只有未通過的資料才改走 validate_application_record() 取得完整的錯誤訊息。
+    """
+    account_name_match = ACCOUNT_NAME_PATTERN.fullmatch
+    mobile_match = MOBILE_PATTERN.fullmatch
+    strip_separators = PHONE_SEPARATOR_PATTERN.sub
+    has_address_keyword = ADDRESS_KEYWORD_PATTERN.search
+    phone_max_length = FIELD_MAX_LENGTHS['phone_number']
+
+    for record in records:
+        account_name = str(record.get('account_name') or '').strip()
+        phone_number = str(record.get('phone_number') or '').strip()
+        address = str(record.get('address') or '').strip()
+
+        if (ACCOUNT_NAME_MIN_LENGTH <= len(account_name) <= ACCOUNT_NAME_MAX_LENGTH and account_name_match(account_name)
+                and 0 < len(phone_number) <= phone_max_length and mobile_match(strip_separators('', phone_number))
+                and ADDRESS_MIN_LENGTH <= len(address) <= ADDRESS_MAX_LENGTH and has_address_keyword(address)):
+            yield {'account_name': account_name, 'phone_number': phone_number, 'address': address}, {}
+        else:
+            yield validate_application_record(record)
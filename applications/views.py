@@ -1,19 +1,34 @@
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
-from django.http import Http404
+from django.http import Http404, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.cache import cache_page
+from django.views.decorators.vary import vary_on_cookie
 
+from .cache import get_user_application
+from .conditional import render_conditionally
 from .forms import (
+    ApplicationAlreadyExists,
     ApplicationForm,
     ApplicationUpdateForm,
     CustomUserCreationForm,
     LoginForm,
 )
+from .metrics import registry
 from .models import Application
+from .polling import application_status_payload
+from .ratelimit import rate_limited_response, return_login_attempt, take_login_attempt
+from .transitions import transition
 
 
+# 未登入使用者的首頁是靜態內容，整頁快取；request.user 會讀取 session，必須依 Cookie 區分快取，
+# 且 vary_on_cookie 要在 cache_page 之內，儲存快取前就加上 Vary 標頭
+@cache_page(settings.APPLICATION_HOME_CACHE_TIMEOUT)
+@vary_on_cookie
 def home(request):
     """首頁 - 根據登入狀態導向不同頁面"""
 
@@ -51,6 +66,11 @@ def user_login(request):
         return redirect('application_status')
 
     if request.method == 'POST':
+        # 在驗證表單與雜湊密碼之前限流，超過限制的嘗試只花費一次快取讀取
+        retry_after = take_login_attempt(request, request.POST.get('username', ''))
+        if retry_after is not None:
+            return rate_limited_response(retry_after)
+
         form = LoginForm(request.POST)
         if form.is_valid():
             username = form.cleaned_data['username']
@@ -58,6 +78,7 @@ def user_login(request):
             user = authenticate(request, username=username, password=password)
 
             if user is not None:
+                return_login_attempt(request, request.POST.get('username', ''))
                 login(request, user)
                 messages.success(request, f'歡迎回來，{user.first_name or user.username}！')
                 return redirect('application_status')
@@ -81,23 +102,25 @@ def user_logout(request):
 def application_create(request):
     """創建證券帳戶申請"""
 
-    # 檢查用戶是否已有申請
-    try:
-        existing_application = Application.objects.get(user=request.user)
+    # 檢查用戶是否已有申請（送出時改由資料庫唯一限制檢查，省去一次查詢）
+    if request.method != 'POST' and get_user_application(request.user.pk) is not None:
         messages.info(request, '您已有一個申請記錄，請查看申請狀態。')
         return redirect('application_status')
-    except Application.DoesNotExist:
-        pass  # 沒有現有申請，可以繼續創建
 
     if request.method == 'POST':
-        form = ApplicationForm(request.POST)
+        form = ApplicationForm(request.POST, check_account_name_unique=False)
         if form.is_valid():
             application = form.save(commit=False)
             application.user = request.user
-            application.save()
+            try:
+                saved = form.save_reserving_account_name(application)
+            except ApplicationAlreadyExists:
+                messages.info(request, '您已有一個申請記錄，請查看申請狀態。')
+                return redirect('application_status')
 
-            messages.success(request, '證券帳戶申請已成功提交！我們會盡快處理您的申請。')
-            return redirect('application_status')
+            if saved:
+                messages.success(request, '證券帳戶申請已成功提交！我們會盡快處理您的申請。')
+                return redirect('application_status')
     else:
         form = ApplicationForm()
 
@@ -108,16 +131,25 @@ def application_create(request):
 def application_status(request):
     """查看申請狀態"""
 
-    try:
-        application = Application.objects.get(user=request.user)
-    except Application.DoesNotExist:
-        application = None
+    application = get_user_application(request.user.pk)
 
     context = {
         'application': application,
     }
 
-    return render(request, 'applications/status.html', context)
+    return render_conditionally(request, application, 'applications/status.html', context)
+
+
+def application_status_api(request):
+    """申請狀態 JSON，供行動 App 輪詢
+
+    同步部署不支援長輪詢，wait 參數會被忽略並立即回應；長輪詢需透過 ASGI 部署（async_views）。
+    """
+
+    if not request.user.is_authenticated:
+        return JsonResponse({'error': '請先登入'}, status=401)
+
+    return JsonResponse(application_status_payload(get_user_application(request.user.pk)))
 
 
 @login_required
@@ -133,18 +165,17 @@ def application_update(request, application_id):
         return redirect('application_status')
 
     if request.method == 'POST':
-        form = ApplicationUpdateForm(request.POST, instance=application)
+        form = ApplicationUpdateForm(request.POST, instance=application, check_account_name_unique=False)
         if form.is_valid():
             # 更新申請並重置狀態為 PENDING
             application = form.save(commit=False)
-            application.status = 'PENDING'
-            application.reviewed_at = None
-            application.reviewed_by = None
-            application.additional_info_required = ''  # 清除補件說明
-            application.save()
-
-            messages.success(request, '申請資料已更新並重新提交審核。感謝您提供補充資料！')
-            return redirect('application_status')
+            transition(application, 'PENDING', actor=request.user, note='申請人補件後重新送審', save=False)
+
+            if form.save_reserving_account_name(application):
+                messages.success(request, '申請資料已更新並重新提交審核。感謝您提供補充資料！')
+                return redirect('application_status')
+        # 表單驗證與 transition() 已修改記憶體中的申請（帳號名稱、狀態、補件說明），以資料庫中的原始資料重新顯示頁面
+        application.refresh_from_db()
     else:
         form = ApplicationUpdateForm(instance=application)
 
@@ -160,8 +191,10 @@ def application_update(request, application_id):
 def application_success(request, application_id):
     """申請通過的恭喜頁面"""
 
-    # 確保只能查看自己的申請
-    application = get_object_or_404(Application, id=application_id, user=request.user)
+    # 確保只能查看自己的申請（每位使用者只有一筆申請，可直接使用快取的申請）
+    application = get_user_application(request.user.pk)
+    if application is None or application.pk != application_id:
+        raise Http404('找不到此申請')
 
     # 只有已通過的申請才能查看此頁面
     if not application.is_approved:
@@ -172,4 +205,18 @@ def application_success(request, application_id):
         'application': application,
     }
 
-    return render(request, 'applications/success.html', context)
+    return render_conditionally(request, application, 'applications/success.html', context)
+
+
+def metrics(request):
+    """以 Prometheus 文字格式輸出本程序的請求指標
+
+    設定 APPLICATION_METRICS_TOKEN 時以 Authorization: Bearer 驗證，否則只允許管理人員查看。
+    """
+
+    token = settings.APPLICATION_METRICS_TOKEN
+    has_token = token is not None and constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}')
+    if not has_token and not (request.user.is_authenticated and request.user.is_staff):
+        return HttpResponse(status=403)
+
+    return HttpResponse(registry.render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -9,8 +9,26 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+from django.core.handlers.asgi import ASGIHandler
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'securities_system.settings')
 
-application = get_asgi_application()
+# URL configuration for requests served by this application. Only the ASGI
+# handler uses it; ROOT_URLCONF (WSGI, tests, shells) is left unchanged.
+ASGI_URLCONF = 'securities_system.asgi_urls'
+
+
+class AsyncViewsASGIHandler(ASGIHandler):
+    """ASGI handler that serves the applicant pages with the async views."""
+
+    def create_request(self, scope, body_file):
+        request, error_response = super().create_request(scope, body_file)
+        if request is not None:
+            request.urlconf = ASGI_URLCONF
+        return request, error_response
+
+
+# Same as django.core.asgi.get_asgi_application(), with the handler above.
+django.setup(set_prefix=False)
+application = AsyncViewsASGIHandler()
@@ -0,0 +1,13 @@
+"""
+URL configuration used by the ASGI deployment (asgi.AsyncViewsASGIHandler).
+
+Same routes as securities_system.urls, but the applicant pages are served by
+the async views in applications.async_views.
+"""
+from django.contrib import admin
+from django.urls import include, path
+
+urlpatterns = [
+    path('admin/', admin.site.urls),
+    path('', include('applications.async_urls')),
+]
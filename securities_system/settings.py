@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -39,6 +42,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # 放在最前面，量測範圍涵蓋其餘 middleware（session、驗證的查詢）
+    'applications.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -48,11 +53,17 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# ASGI 部署的請求改以 securities_system.asgi_urls 解析（見 asgi.py），申請人頁面使用非同步視圖
 ROOT_URLCONF = 'securities_system.urls'
 
+# 以 DJANGO_TEMPLATE_PROFILE 選擇模板設定：development（預設）修改模板後立即生效；
+# production 明確使用 cached loader，每個模板只從檔案系統讀取與編譯一次，並啟用 {% cache %} 片段快取（見 CACHES）
+TEMPLATE_PROFILE = os.environ.get('DJANGO_TEMPLATE_PROFILE', 'development')
+
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # 與 DjangoTemplates 相同，另在抽樣的請求中記錄模板渲染時間（見 applications.metrics）
+        'BACKEND': 'applications.metrics.InstrumentedDjangoTemplates',
         'DIRS': [],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -65,17 +76,193 @@ TEMPLATES = [
     },
 ]
 
+if TEMPLATE_PROFILE == 'production':
+    # 指定 loaders 時不可同時設定 APP_DIRS
+    TEMPLATES[0]['APP_DIRS'] = False
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
+elif TEMPLATE_PROFILE != 'development':
+    raise ImproperlyConfigured(f'不支援的 DJANGO_TEMPLATE_PROFILE：{TEMPLATE_PROFILE!r}，請使用 development 或 production')
+
 WSGI_APPLICATION = 'securities_system.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# 以 DJANGO_DB_PROFILE 選擇資料庫設定：sqlite（本機開發，預設）或 postgres（正式環境）
+DB_PROFILE = os.environ.get('DJANGO_DB_PROFILE', 'sqlite')
+
+if DB_PROFILE == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DJANGO_DB_NAME', BASE_DIR / 'db.sqlite3'),
+            'OPTIONS': {
+                # WAL 讓讀取不會被寫入阻擋；synchronous=NORMAL 在 WAL 下只於檢查點時 fsync；
+                # busy_timeout 讓併發寫入等待檔案鎖而非立即回報 database is locked
+                'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL; PRAGMA busy_timeout=5000',
+                # 交易一開始就取得寫入鎖，避免讀取後升級為寫入鎖時無法等待而直接失敗
+                'transaction_mode': 'IMMEDIATE',
+            },
+        }
+    }
+elif DB_PROFILE == 'postgres':
+    # 需要安裝 psycopg（啟用連線池時另需 psycopg_pool）：uv add "psycopg[binary,pool]"
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DJANGO_DB_NAME', 'securities_system'),
+            'USER': os.environ.get('DJANGO_DB_USER', ''),
+            'PASSWORD': os.environ.get('DJANGO_DB_PASSWORD', ''),
+            'HOST': os.environ.get('DJANGO_DB_HOST', ''),
+            'PORT': os.environ.get('DJANGO_DB_PORT', ''),
+            # 持久連線在每個請求開始時先確認連線仍可用，資料庫重啟後不會回傳錯誤
+            'CONN_HEALTH_CHECKS': True,
+            'CONN_MAX_AGE': int(os.environ.get('DJANGO_DB_CONN_MAX_AGE', 60)),
+            'OPTIONS': {},
+        }
+    }
+    if os.environ.get('DJANGO_DB_POOL', '').lower() in ('1', 'true', 'yes'):
+        # Django 原生的 psycopg 連線池，由連線池管理連線壽命，因此 CONN_MAX_AGE 必須為 0
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': int(os.environ.get('DJANGO_DB_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.environ.get('DJANGO_DB_POOL_MAX_SIZE', 10)),
+            'timeout': int(os.environ.get('DJANGO_DB_POOL_TIMEOUT', 10)),
+        }
+else:
+    raise ImproperlyConfigured(f'不支援的 DJANGO_DB_PROFILE：{DB_PROFILE!r}，請使用 sqlite 或 postgres')
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# 以 DJANGO_CACHE_PROFILE 選擇快取：locmem（預設，單一程序內有效）或 redis（多程序／多主機共用，需要 redis 套件）
+# session 使用獨立的 sessions 快取，清除一般快取時不會登出使用者，測試中也可單獨替換；登入限流的 token bucket 同樣使用獨立的 ratelimit 快取
+CACHE_PROFILE = os.environ.get('DJANGO_CACHE_PROFILE', 'locmem')
+
+if CACHE_PROFILE == 'locmem':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'securities-system',
+        },
+        'sessions': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'securities-system-sessions',
+            # session 筆數與登入人數相當，避免預設的 300 筆上限頻繁淘汰後回頭查資料庫
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        },
+        'ratelimit': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'securities-system-ratelimit',
+            # 每個來源 IP 與帳號各一筆，攻擊期間的來源數量可能很多
+            'OPTIONS': {'MAX_ENTRIES': 100000},
+        },
+    }
+elif CACHE_PROFILE == 'redis':
+    REDIS_URL = os.environ.get('DJANGO_REDIS_URL', 'redis://127.0.0.1:6379/0')
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'securities-system',
+        },
+        'sessions': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'securities-system-sessions',
+        },
+        'ratelimit': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'securities-system-ratelimit',
+        },
+    }
+else:
+    raise ImproperlyConfigured(f'不支援的 DJANGO_CACHE_PROFILE：{CACHE_PROFILE!r}，請使用 locmem 或 redis')
+
+# {% cache %} 片段快取使用 template_fragments 快取：production 模板設定與一般快取使用相同的後端，
+# development 使用 DummyCache，修改模板後不必等待片段過期
+if TEMPLATE_PROFILE == 'production':
+    CACHES['template_fragments'] = {
+        **CACHES['default'],
+        **({'LOCATION': 'securities-system-fragments'} if CACHE_PROFILE == 'locmem' else {'KEY_PREFIX': 'securities-system-fragments'}),
     }
+else:
+    CACHES['template_fragments'] = {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}
+
+# Sessions
+# https://docs.djangoproject.com/en/5.2/topics/http/sessions/
+
+# 以 DJANGO_SESSION_ENGINE 選擇 session 儲存方式：
+# cached_db（預設）讀取走快取、寫入同時寫入資料庫，快取遺失時仍可由資料庫還原；
+# cache 完全不存取資料庫，需搭配多程序共用的 redis 快取，否則重新啟動或換到其他程序時會被登出；db 為 Django 預設
+SESSION_ENGINE_PROFILE = os.environ.get('DJANGO_SESSION_ENGINE', 'cached_db')
+
+if SESSION_ENGINE_PROFILE not in ('cached_db', 'cache', 'db'):
+    raise ImproperlyConfigured(f'不支援的 DJANGO_SESSION_ENGINE：{SESSION_ENGINE_PROFILE!r}，請使用 cached_db、cache 或 db')
+
+SESSION_ENGINE = f'django.contrib.sessions.backends.{SESSION_ENGINE_PROFILE}'
+SESSION_CACHE_ALIAS = 'sessions'
+
+# 訊息只存在 cookie 中，不會因訊息過長而改寫入 session
+MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
+
+# 未登入使用者首頁的整頁快取秒數（依 Cookie 區分快取，登入後不會拿到未登入的頁面）
+APPLICATION_HOME_CACHE_TIMEOUT = 60
+
+# 使用者申請狀態快取的存活秒數（申請變更時會主動清除）
+APPLICATION_STATUS_CACHE_TIMEOUT = 300
+
+# 狀態 API 長輪詢的最長等待秒數，以及檢查其他程序中變更標記的間隔秒數（同一程序中的變更會立即喚醒）
+APPLICATION_STATUS_LONGPOLL_MAX_WAIT = 60
+APPLICATION_STATUS_LONGPOLL_RECHECK_SECONDS = 10
+
+# 申請管理列表使用估計筆數（資料庫統計資訊或快取的計數）取代每次的 COUNT(*)
+APPLICATION_ADMIN_ESTIMATED_COUNT = True
+# 管理列表快取計數的存活秒數
+APPLICATION_ADMIN_COUNT_CACHE_TIMEOUT = 60
+# 審核統計每個計數分散的資料列數，併發審核時隨機寫入其中一列以減少鎖等待（讀取時加總，可隨時調整）
+APPLICATION_REVIEW_STATS_SHARDS = 8
+
+# 登入限流：{'ip' 或 'username': (容量, 每分鐘補充的 token 數)}，每次登入嘗試先從來源 IP 與帳號的 bucket 各取一個 token，
+# 登入成功時歸還，任一 bucket 用完時不執行密碼雜湊，直接回應 429。設為空的 dict 可停用
+APPLICATION_LOGIN_RATE_LIMITS = {
+    'ip': (30, 10),
+    'username': (10, 2),
 }
+# 部署在反向代理之後時，設為代理附加來源位址的標頭（例如 HTTP_X_FORWARDED_FOR），否則所有請求都會共用代理的 IP
+APPLICATION_CLIENT_IP_HEADER = os.environ.get('DJANGO_CLIENT_IP_HEADER') or None
+
+# 測試期間停用登入限流，避免各測試的登入嘗試互相耗盡 token（見 securities_system.test_runner）
+TEST_RUNNER = 'securities_system.test_runner.TestRunner'
+
+# 請求指標的抽樣比例（0 到 1）：抽樣的請求會量測查詢與模板渲染時間並累計到 /metrics/ 的直方圖
+APPLICATION_METRICS_SAMPLE_RATE = float(os.environ.get('DJANGO_METRICS_SAMPLE_RATE', 0.05))
+# 抽樣的請求是否對所有使用者附上 Server-Timing 標頭（查詢數與耗時）；關閉時只有管理人員的回應會附上（loadtest_journey 需開啟）
+APPLICATION_METRICS_SERVER_TIMING = os.environ.get('DJANGO_METRICS_SERVER_TIMING', '').lower() in ('1', 'true', 'yes')
+# Prometheus 抓取 /metrics/ 時使用的 Bearer token，未設定時只有管理人員可以查看
+APPLICATION_METRICS_TOKEN = os.environ.get('DJANGO_METRICS_TOKEN') or None
+
+# 審核人員認領申請的租約秒數，到期未完成審核的申請會回到待認領佇列
+APPLICATION_CLAIM_LEASE_SECONDS = 15 * 60
+
+# 背景工作（通知等申請送出或審核後的後續處理）：每筆工作最多執行的次數、失敗後重試的退避秒數（每次加倍）與上限，
+# 以及執行程序取出工作的租約秒數（執行程序中斷時，租約到期後由其他執行程序重新執行）
+APPLICATION_TASK_MAX_ATTEMPTS = 5
+APPLICATION_TASK_RETRY_BACKOFF_SECONDS = 10
+APPLICATION_TASK_RETRY_BACKOFF_MAX_SECONDS = 60 * 60
+APPLICATION_TASK_LEASE_SECONDS = 5 * 60
+# 發送申請狀態通知簡訊的函式路徑，函式以 (電話號碼, 內容) 呼叫；未設定時只寄送電子郵件
+APPLICATION_SMS_SENDER = os.environ.get('DJANGO_SMS_SENDER') or None
+
+# 通知郵件預設輸出到主控台，正式環境以 DJANGO_EMAIL_BACKEND 與 Django 的 EMAIL_* 設定改為實際寄送
+EMAIL_BACKEND = os.environ.get('DJANGO_EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+DEFAULT_FROM_EMAIL = os.environ.get('DJANGO_DEFAULT_FROM_EMAIL', 'no-reply@example.com')
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -95,6 +282,28 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# 新密碼使用的雜湊演算法，以 DJANGO_PASSWORD_HASHER 選擇 pbkdf2（預設）、scrypt 或 argon2（需要 argon2-cffi 套件）。
+# 其餘演算法仍保留在清單中以驗證既有密碼；登入成功時若儲存的雜湊使用其他演算法或成本參數，會自動以目前設定重新雜湊
+PASSWORD_HASHER_POLICY = os.environ.get('DJANGO_PASSWORD_HASHER', 'pbkdf2')
+
+_PASSWORD_HASHERS = {
+    'pbkdf2': 'applications.hashers.TunedPBKDF2PasswordHasher',
+    'scrypt': 'applications.hashers.TunedScryptPasswordHasher',
+    'argon2': 'applications.hashers.TunedArgon2PasswordHasher',
+}
+
+if PASSWORD_HASHER_POLICY not in _PASSWORD_HASHERS:
+    raise ImproperlyConfigured(f'不支援的 DJANGO_PASSWORD_HASHER：{PASSWORD_HASHER_POLICY!r}，請使用 pbkdf2、scrypt 或 argon2')
+
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER_POLICY], *(path for policy, path in _PASSWORD_HASHERS.items() if policy != PASSWORD_HASHER_POLICY)]
+
+# 各演算法的成本參數（預設與 Django 5.2 相同），請以 benchmark_password_hashers 量測每核心每秒可處理的登入數後再調整
+APPLICATION_PASSWORD_HASHER_COST = {
+    'pbkdf2': {'iterations': int(os.environ.get('DJANGO_PBKDF2_ITERATIONS', 1_000_000))},
+    'scrypt': {'work_factor': int(os.environ.get('DJANGO_SCRYPT_WORK_FACTOR', 2**14)), 'block_size': 8, 'parallelism': int(os.environ.get('DJANGO_SCRYPT_PARALLELISM', 5))},
+    'argon2': {'time_cost': int(os.environ.get('DJANGO_ARGON2_TIME_COST', 2)), 'memory_cost': int(os.environ.get('DJANGO_ARGON2_MEMORY_COST', 102400)), 'parallelism': int(os.environ.get('DJANGO_ARGON2_PARALLELISM', 8))},
+}
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
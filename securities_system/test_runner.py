@@ -0,0 +1,19 @@
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """測試期間停用登入限流
+
+    各測試以相同的 IP（127.0.0.1）與帳號登入，啟用限流時會共用同一組 token bucket，
+    前面測試的失敗登入會讓後面的測試收到 429。限流本身的測試以 override_settings 指定限制。
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.rate_limits_disabled = override_settings(APPLICATION_LOGIN_RATE_LIMITS={})
+        self.rate_limits_disabled.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.rate_limits_disabled.disable()
+        super().teardown_test_environment(**kwargs)